@@ -12,11 +12,8 @@ logging.basicConfig(level=logging.DEBUG)
 
 # Import our modules
 from bonds import (
-    calculate_ytm, 
-    real_yield, 
-    calculate_duration, 
-    calculate_modified_duration,
-    calculate_convexity,
+    analyze_bonds,
+    get_exact_price_impact,
     get_price_impact
 )
 from plots import (
@@ -28,7 +25,15 @@ from plots import (
     plot_yield_vs_inflation,
     plot_bond_risk_return
 )
-from market_data import fetch_market_data, update_predefined_bonds_with_market_data
+from bond_book import BondBook
+from curves import ZeroCurve, bootstrap_book, bootstrap_country_curves
+from lattice import price_callable_bonds
+from linkers import invoice_prices, update_book_breakevens
+from risk import book_key_rate_durations
+from scenarios import HullWhiteModel, VasicekModel, simulate_book_pnl
+from portfolio import Portfolio
+from spreads import book_spreads
+from market_data import COUNTRY_CODES, get_snapshot_status, history_store, iter_market_data, save_predefined_bonds
 
 # Set page config
 st.set_page_config(
@@ -53,6 +58,18 @@ def format_currency(value, currency="€", decimals=2):
     """Format a number as currency with specified decimals."""
     return f"{currency} {value:.{decimals}f}"
 
+def format_age(seconds):
+    """Format a snapshot age in seconds as a short German text."""
+    if seconds is None:
+        return "kein Datenstand"
+    if seconds < 60:
+        return "gerade eben"
+    if seconds < 3600:
+        return f"vor {seconds / 60:.0f} min"
+    if seconds < 86400:
+        return f"vor {seconds / 3600:.0f} h"
+    return f"vor {seconds / 86400:.0f} Tagen"
+
 def main():
     # Add custom CSS
     st.markdown("""
@@ -117,13 +134,21 @@ def main():
             if st.button("🔄 Sync", help="Lädt aktuelle Marktdaten für die ausgewählten Anleihen"):
                 with st.spinner("Lade Marktdaten..."):
                     try:
-                        # Fetch live market data
-                        market_data = fetch_market_data(selected_country)
+                        # Fetch all countries concurrently; results arrive as each source finishes.
+                        # Expired snapshots are served at once and refreshed in the background.
+                        progress = st.progress(0.0)
+                        updated_data = {}
+                        fallback_countries = []
+                        for done, (country, market_data, on_time) in enumerate(iter_market_data(stale_while_revalidate=True), start=1):
+                            if market_data:
+                                updated_data[country] = market_data
+                            if not on_time:
+                                fallback_countries.append(countries.get(country, country))
+                            progress.progress(done / len(COUNTRY_CODES))
+                        progress.empty()
+                        updated_data = {country: updated_data[country] for country in COUNTRY_CODES if country in updated_data}
                         
-                        if market_data and "bonds" in market_data:
-                            # Update predefined bonds with fetched data
-                            update_predefined_bonds_with_market_data()
-                            
+                        if "bonds" in updated_data.get(selected_country, {}) and save_predefined_bonds(updated_data):
                             # Clear cache to load new data
                             st.cache_data.clear()
                             
@@ -132,11 +157,20 @@ def main():
                             
                             # Show success message
                             st.success(f"Marktdaten für {countries[selected_country]} aktualisiert! ({datetime.datetime.now().strftime('%H:%M:%S')})")
+                            if fallback_countries:
+                                st.warning(f"Abruf fehlgeschlagen oder Zeitlimit überschritten, Ersatzdaten für: {', '.join(fallback_countries)}")
                         else:
                             st.error("Keine Daten verfügbar.")
                     except Exception as e:
                         st.error(f"Fehler beim Abrufen der Daten: {str(e)}")
         
+        # Age of each source's snapshot; stale ones are refreshed in the background
+        snapshot_status = get_snapshot_status()
+        for country in COUNTRY_CODES:
+            status = snapshot_status[country]
+            note = " · wird aktualisiert" if status["refreshing"] else (" · veraltet" if status["stale"] else "")
+            st.caption(f"{countries.get(country, country)}: {format_age(status['age'])}{note}")
+        
         st.divider()
         
         # Load mode
@@ -153,6 +187,7 @@ def main():
         # Display options
         st.subheader("Anzeigeoptionen")
         show_real_yield = st.checkbox("Realzins anzeigen", value=True)
+        show_zero_curve = st.checkbox("Spot- und Forward-Kurve anzeigen", value=False)
         show_additional_metrics = st.checkbox("Erweiterte Metriken", value=False)
         
         # Add visualization options
@@ -167,7 +202,7 @@ def main():
     
     # Initialize session state for bonds if not exists
     if "bonds" not in st.session_state:
-        st.session_state.bonds = []
+        st.session_state.bonds = BondBook()
     
     # Main area - Tabs
     tab1, tab2, tab3 = st.tabs(["📊 Yield Curve", "🧮 Bond-Rechner", "📋 Analyse"])
@@ -183,49 +218,11 @@ def main():
                 if st.button("Vordefinierte Anleihen laden", use_container_width=True):
                     # Load predefined bonds for the selected country
                     country_data = predefined_bonds.get(selected_country, {})
-                    st.session_state.bonds = []
                     
-                    for bond in country_data.get("bonds", []):
-                        # Calculate metrics
-                        ytm = calculate_ytm(
-                            bond["price"], 
-                            bond["face_value"], 
-                            bond["coupon_rate"] / 100, 
-                            bond["years_to_maturity"]
-                        )
-                        
-                        real = real_yield(ytm, bond["inflation"] / 100)
-                        
-                        duration = calculate_duration(
-                            bond["price"],
-                            bond["face_value"],
-                            bond["coupon_rate"] / 100,
-                            ytm,
-                            bond["years_to_maturity"]
-                        )
-                        
-                        mod_duration = calculate_modified_duration(duration, ytm)
-                        
-                        convexity = calculate_convexity(
-                            bond["price"],
-                            bond["face_value"],
-                            bond["coupon_rate"] / 100,
-                            ytm,
-                            bond["years_to_maturity"]
-                        )
-                        
-                        st.session_state.bonds.append({
-                            "Name": bond["name"],
-                            "Laufzeit": bond["years_to_maturity"],
-                            "Kupon": bond["coupon_rate"],
-                            "Preis": bond["price"],
-                            "Inflation": bond["inflation"],
-                            "YTM": ytm * 100,
-                            "Realzins": real * 100,
-                            "Duration": duration,
-                            "Mod. Duration": mod_duration,
-                            "Convexity": convexity
-                        })
+                    # Calculate all metrics in one vectorized pass;
+                    # linker breakevens are solved against the book's nominal zero curve
+                    book = BondBook.from_market_data(country_data.get("bonds", [])).analyze()
+                    st.session_state.bonds = update_book_breakevens(book)
             
             num_custom_bonds = st.number_input(
                 "Anzahl eigener Anleihen", 
@@ -240,7 +237,7 @@ def main():
         if len(st.session_state.bonds) > 0 or num_custom_bonds > 0:
             # Create a DataFrame from existing bonds
             if st.session_state.bonds:
-                df = pd.DataFrame(st.session_state.bonds)
+                df = st.session_state.bonds.to_dataframe().drop(columns=["Nennwert", "Frequenz"])
             else:
                 # Create default bonds if none exist
                 df = pd.DataFrame([
@@ -249,6 +246,8 @@ def main():
                     {"Name": "10-Jahr", "Laufzeit": 10, "Kupon": 3.5, "Preis": 980, "Inflation": 2.0},
                     {"Name": "30-Jahr", "Laufzeit": 30, "Kupon": 4.0, "Preis": 950, "Inflation": 2.0},
                 ][:num_custom_bonds])
+                # Empty index ratio = nominal bond; fill it in for inflation-linked bonds
+                df["Indexfaktor"] = np.nan
             
             # Create a form for editing bonds
             with st.form("bond_form"):
@@ -261,6 +260,7 @@ def main():
                         "Kupon": st.column_config.NumberColumn("Kupon (%)", min_value=0.0, max_value=20.0, step=0.1, format="%.2f %%", width="small"),
                         "Preis": st.column_config.NumberColumn("Preis", min_value=500, max_value=1500, step=0.1, format="%.2f", width="small"),
                         "Inflation": st.column_config.NumberColumn("Inflation (%)", min_value=-5.0, max_value=20.0, step=0.1, format="%.2f %%", width="small"),
+                        "Indexfaktor": st.column_config.NumberColumn("Indexfaktor", min_value=0.5, max_value=5.0, step=0.0001, format="%.4f", width="small", help="Nur für inflationsindexierte Anleihen (Preis, Kupon und YTM real); leer = nominale Anleihe"),
                     },
                     hide_index=True,
                 )
@@ -268,76 +268,31 @@ def main():
                 calculate_button = st.form_submit_button("Berechnen", use_container_width=True)
                 
                 if calculate_button:
-                    # Calculate all metrics for each bond
-                    updated_bonds = []
-                    for _, row in edited_df.iterrows():
-                        # Calculate YTM
-                        ytm = calculate_ytm(
-                            row["Preis"], 
-                            1000, 
-                            row["Kupon"] / 100, 
-                            row["Laufzeit"]
-                        )
-                        
-                        # Calculate real yield
-                        real = real_yield(ytm, row["Inflation"] / 100)
-                        
-                        # Calculate duration
-                        duration = calculate_duration(
-                            row["Preis"],
-                            1000,
-                            row["Kupon"] / 100,
-                            ytm,
-                            row["Laufzeit"]
-                        )
-                        
-                        # Calculate modified duration
-                        mod_duration = calculate_modified_duration(duration, ytm)
-                        
-                        # Calculate convexity
-                        convexity = calculate_convexity(
-                            row["Preis"],
-                            1000,
-                            row["Kupon"] / 100,
-                            ytm,
-                            row["Laufzeit"]
-                        )
-                        
-                        # Append to updated bonds
-                        updated_bonds.append({
-                            "Name": row["Name"],
-                            "Laufzeit": row["Laufzeit"],
-                            "Kupon": row["Kupon"],
-                            "Preis": row["Preis"],
-                            "Inflation": row["Inflation"],
-                            "YTM": ytm * 100,
-                            "Realzins": real * 100,
-                            "Duration": duration,
-                            "Mod. Duration": mod_duration,
-                            "Convexity": convexity
-                        })
+                    # Calculate all metrics for all bonds in one vectorized pass
+                    book = BondBook.from_dataframe(edited_df).analyze()
                     
                     # Update session state
-                    st.session_state.bonds = updated_bonds
+                    st.session_state.bonds = update_book_breakevens(book)
                     st.rerun()
             
             # After form submission, show results
             if st.session_state.bonds:
-                # Sort bonds by maturity
-                sorted_bonds = sorted(st.session_state.bonds, key=lambda x: x["Laufzeit"])
+                # The bond book is kept sorted by maturity
+                book = st.session_state.bonds
                 
                 # Create a metrics table
-                metrics_df = pd.DataFrame([
-                    {
-                        "Name": bond["Name"],
-                        "Laufzeit (Jahre)": bond["Laufzeit"],
-                        "YTM (%)": f"{bond['YTM']:.2f}",
-                        "Realzins (%)": f"{bond['Realzins']:.2f}",
-                        "Duration": f"{bond['Duration']:.2f}",
-                        "Mod. Duration": f"{bond['Mod. Duration']:.2f}"
-                    }
-                    for bond in sorted_bonds
-                ])
+                metrics_df = pd.DataFrame({
+                    "Name": book["Name"],
+                    "Laufzeit (Jahre)": book["Laufzeit"],
+                    "YTM (%)": np.char.mod("%.2f", book["YTM"]),
+                    "Realzins (%)": np.char.mod("%.2f", book["Realzins"]),
+                    "Breakeven (%)": np.char.mod("%.2f", book["Breakeven"]),
+                    "Duration": np.char.mod("%.2f", book["Duration"]),
+                    "Mod. Duration": np.char.mod("%.2f", book["Mod. Duration"])
+                })
+                if book.is_linker.any():
+                    # Nominal amount paid for linkers (quoted price times index ratio)
+                    metrics_df["Invoice-Preis"] = np.char.mod("%.2f", invoice_prices(book["Preis"], book["Indexfaktor"]))
                 
                 with st.expander("Bond-Metriken", expanded=True):
                     st.dataframe(
@@ -346,12 +301,21 @@ def main():
                         use_container_width=True
                     )
                 
+                # Bootstrap spot and forward curves from the current bonds
+                zero_curve = None
+                if show_zero_curve:
+                    try:
+                        zero_curve = bootstrap_book(book, name=selected_country)
+                    except ValueError as e:
+                        st.warning(f"Spot-Kurve konnte nicht berechnet werden: {str(e)}")
+                
                 # Plot yield curve
                 st.header("Zinsstrukturkurve")
                 fig = plot_yield_curve(
-                    sorted_bonds, 
+                    book, 
                     title=f"Yield Curve - {countries.get(selected_country, 'Custom')}",
-                    show_real_yield=show_real_yield
+                    show_real_yield=show_real_yield,
+                    zero_curve=zero_curve
                 )
                 st.plotly_chart(fig, use_container_width=True)
                 
@@ -362,7 +326,7 @@ def main():
                     with col1:
                         # YTM comparison chart
                         fig_ytm = plot_comparison_chart(
-                            sorted_bonds, 
+                            book, 
                             metric="YTM", 
                             title="Vergleich der Renditen (YTM)"
                         )
@@ -371,7 +335,7 @@ def main():
                     with col2:
                         # Duration comparison chart
                         fig_duration = plot_comparison_chart(
-                            sorted_bonds, 
+                            book, 
                             metric="Duration", 
                             title="Vergleich der Duration"
                         )
@@ -382,7 +346,7 @@ def main():
                     st.subheader("Erweiterte Visualisierungen")
                     
                     # Create tabs for different advanced visualizations
-                    adv_tab1, adv_tab2, adv_tab3 = st.tabs(["Inflation vs Yield", "Risk/Return", "Marktanalyse"])
+                    adv_tab1, adv_tab2, adv_tab3, adv_tab4 = st.tabs(["Inflation vs Yield", "Risk/Return", "Marktanalyse", "Historie"])
                     
                     with adv_tab1:
                         # Get country name for the title
@@ -390,7 +354,7 @@ def main():
                         
                         # Plot yield vs inflation
                         fig_inflation = plot_yield_vs_inflation(
-                            sorted_bonds,
+                            book,
                             country_name=country_name.split(" ", 1)[1] if " " in country_name else country_name,
                             title=f"Yield vs Inflation: {country_name}"
                         )
@@ -400,8 +364,8 @@ def main():
                         st.markdown("""
                         ### Interpretation:
                         - **Nominal Yield**: Die erwartete Rendite ohne Berücksichtigung der Inflation
-                        - **Inflation**: Die erwartete Inflationsrate
-                        - **Real Yield**: Inflationsbereinigte Rendite (Nominal Yield - Inflation)
+                        - **Inflation**: Breakeven-Inflation aus inflationsindexierten Anleihen (sonst die erwartete Inflationsrate)
+                        - **Real Yield**: Inflationsbereinigte Rendite (Fisher-Gleichung mit der Breakeven-Inflation)
                         
                         Ein positiver Realzins bedeutet, dass die Anleihe die Kaufkraft über die Zeit erhält.
                         """)
@@ -409,7 +373,7 @@ def main():
                     with adv_tab2:
                         # Plot risk/return bubble chart
                         fig_risk = plot_bond_risk_return(
-                            sorted_bonds,
+                            book,
                             title=f"Bond Risk-Return Profile - {country_name}"
                         )
                         
@@ -429,15 +393,13 @@ def main():
                         # Price sensitivity for a selected bond
                         selected_bond_name = st.selectbox(
                             "Anleihe für Preissensitivitätsanalyse:",
-                            options=[bond["Name"] for bond in sorted_bonds],
+                            options=list(book["Name"]),
                             index=0
                         )
                         
                         # Find the selected bond
-                        selected_bond = next(
-                            (bond for bond in sorted_bonds if bond["Name"] == selected_bond_name),
-                            sorted_bonds[0]
-                        )
+                        bond_names = list(book["Name"])
+                        selected_bond = book[bond_names.index(selected_bond_name) if selected_bond_name in bond_names else 0]
                         
                         # Plot price sensitivity with enhanced visuals
                         fig_sensitivity = plot_price_sensitivity(selected_bond)
@@ -451,8 +413,40 @@ def main():
                         - **Convexity**: {selected_bond.get("Convexity", 0):.2f}
                         
                         Die Grafik zeigt, wie der Preis auf Zinsänderungen reagiert. Die rote Kurve (mit Convexity) 
-                        ist präziser für größere Zinsänderungen als die blaue Kurve (nur Duration).
+                        ist präziser für größere Zinsänderungen als die blaue Kurve (nur Duration). Die schwarze 
+                        gestrichelte Kurve zeigt die exakte Neubewertung der Anleihe.
                         """)
+                    
+                    with adv_tab4:
+                        # Yield history recorded by every live market data fetch; the DE, JP
+                        # and UK fetchers still serve fallback data, which is not recorded
+                        st.caption("Historie wird nur aus Live-Marktdaten aufgezeichnet, derzeit nur für die USA (DE, JP und UK nutzen Beispieldaten).")
+                        history_tenors = history_store.tenors(selected_country)
+                        if history_tenors.size == 0:
+                            st.info("Noch keine historischen Daten. Jeder Abruf von Marktdaten (🔄 Sync) wird gespeichert.")
+                        else:
+                            history_tenor = st.selectbox(
+                                "Laufzeit (Jahre):",
+                                options=list(history_tenors),
+                                index=int(np.abs(history_tenors - 10).argmin()),
+                                format_func=lambda x: f"{x:g}"
+                            )
+                            
+                            # Same tenor for all countries with history
+                            fig_history = plot_historical_yields(
+                                history_store.historical_yields(history_store.countries(), tenor=history_tenor),
+                                bond_type=f"{history_tenor:g}-Year",
+                                title=f"Historische Renditen: {history_tenor:g} Jahre"
+                            )
+                            st.plotly_chart(fig_history, use_container_width=True)
+                            
+                            # Evolution of the selected country's curve
+                            fig_curve_3d = plot_yield_curve_3d(
+                                history_store.curves_over_time(selected_country),
+                                metric="Realzins" if show_real_yield else "YTM",
+                                title=f"Entwicklung der Zinsstrukturkurve: {country_name}"
+                            )
+                            st.plotly_chart(fig_curve_3d, use_container_width=True)
         else:
             st.info("Bitte wähle vordefinierte Anleihen oder füge eigene hinzu.")
     
@@ -511,48 +505,29 @@ def main():
             )
             
             if st.button("Berechnen", use_container_width=True):
-                # Calculate YTM
-                ytm = calculate_ytm(
+                # Calculate all metrics in one pass
+                analytics = analyze_bonds(
                     price, 
                     face_value, 
                     coupon_rate / 100, 
                     years,
-                    frequency
-                )
-                
-                # Calculate other metrics
-                real_rate = real_yield(ytm, inflation_rate / 100)
-                duration = calculate_duration(
-                    price, 
-                    face_value, 
-                    coupon_rate / 100, 
-                    ytm, 
-                    years, 
-                    frequency
-                )
-                mod_duration = calculate_modified_duration(
-                    duration, 
-                    ytm, 
-                    frequency
-                )
-                convexity = calculate_convexity(
-                    price, 
-                    face_value, 
-                    coupon_rate / 100, 
-                    ytm, 
-                    years, 
-                    frequency
+                    frequency,
+                    inflation_rate / 100,
+                    use_cache=True
                 )
                 
                 # Store in session state
                 st.session_state.single_bond_result = {
-                    "YTM": ytm * 100,
-                    "Realzins": real_rate * 100,
-                    "Duration": duration,
-                    "Mod. Duration": mod_duration,
-                    "Convexity": convexity,
+                    "YTM": float(analytics.ytm) * 100,
+                    "Realzins": float(analytics.real_yield) * 100,
+                    "Duration": float(analytics.duration),
+                    "Mod. Duration": float(analytics.modified_duration),
+                    "Convexity": float(analytics.convexity),
+                    "DV01": float(analytics.dv01),
                     "Laufzeit": years,
-                    "Kupon": coupon_rate
+                    "Kupon": coupon_rate,
+                    "Frequenz": frequency,
+                    "Nennwert": face_value
                 }
         
         with col2:
@@ -612,7 +587,15 @@ def main():
                 )
                 
                 yield_change = yield_change_bps / 10000
-                price_impact = get_price_impact(
+                price_impact = get_exact_price_impact(
+                    result["YTM"] / 100,
+                    result["Nennwert"],
+                    result["Kupon"] / 100,
+                    result["Laufzeit"],
+                    yield_change,
+                    result["Frequenz"]
+                )
+                estimated_impact = get_price_impact(
                     result["Mod. Duration"], 
                     result["Convexity"], 
                     yield_change
@@ -635,6 +618,52 @@ def main():
                         format_currency(new_price, "€"),
                         delta=f"{new_price - price:.2f}"
                     )
+                
+                st.caption(
+                    f"Exakte Neubewertung. Schätzung mit Duration + Convexity: {estimated_impact:.2f}% "
+                    f"(Abweichung {estimated_impact - price_impact:+.2f} Prozentpunkte)"
+                )
+                
+                # Embedded call or put option, priced on a lattice fitted to a flat curve at the YTM
+                st.subheader("Kündigungsrechte (Callable / Putable)")
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    option_type = st.radio("Option", ["Keine", "Callable", "Putable"], horizontal=True)
+                with col2:
+                    strike = st.number_input("Ausübungspreis", min_value=0.0, value=float(result["Nennwert"]), step=10.0)
+                    first_exercise = st.number_input(
+                        "Erste Ausübung (Jahre)", min_value=0.0, max_value=float(result["Laufzeit"]), value=min(2.0, float(result["Laufzeit"])), step=0.5
+                    )
+                with col3:
+                    option_volatility_bp = st.slider("Zinsvolatilität (bp p.a.)", min_value=10, max_value=300, value=100, step=10, key="lattice_volatility")
+                
+                if option_type != "Keine":
+                    frequency_result = result["Frequenz"]
+                    flat_curve = ZeroCurve([1.0], [frequency_result * np.log1p(result["YTM"] / 100 / frequency_result)])
+                    
+                    # Price the bond without and with the option on the same lattice
+                    strikes = np.array([np.nan, strike])
+                    option_kwargs = (
+                        {"call_price": strikes, "call_start": first_exercise} if option_type == "Callable"
+                        else {"put_price": strikes, "put_start": first_exercise}
+                    )
+                    lattice_result = price_callable_bonds(
+                        flat_curve,
+                        result["Nennwert"],
+                        result["Kupon"] / 100,
+                        np.full(2, float(result["Laufzeit"])),
+                        frequency_result,
+                        sigma=option_volatility_bp / 10000,
+                        **option_kwargs
+                    )
+                    bullet_price, option_price = lattice_result.price
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("Optionsbereinigter Preis", format_currency(option_price, "€"))
+                    col2.metric("Optionswert", f"{option_price - bullet_price:+.2f}")
+                    col3.metric("Effektive Duration", f"{lattice_result.effective_duration[1]:.2f}")
+                    col4.metric("Effektive Convexity", f"{lattice_result.effective_convexity[1]:.2f}")
             else:
                 st.info("Gib die Parameter ein und klicke auf 'Berechnen'.")
     
@@ -644,50 +673,189 @@ def main():
         if not st.session_state.bonds:
             st.warning("Bitte füge zuerst Anleihen im 'Yield Curve' Tab hinzu.")
         else:
-            # Sort bonds by maturity
-            sorted_bonds = sorted(st.session_state.bonds, key=lambda x: x["Laufzeit"])
+            # The bond book is kept sorted by maturity
+            book = st.session_state.bonds
             
             st.subheader("Übersicht")
             
             # Create a detailed table of all bonds and all metrics
-            detailed_df = pd.DataFrame([
-                {
-                    "Name": bond["Name"],
-                    "Laufzeit (Jahre)": bond["Laufzeit"],
-                    "Kupon (%)": bond["Kupon"],
-                    "Preis": bond["Preis"],
-                    "Inflation (%)": bond["Inflation"],
-                    "YTM (%)": bond["YTM"],
-                    "Realzins (%)": bond["Realzins"],
-                    "Duration": bond["Duration"],
-                    "Mod. Duration": bond["Mod. Duration"],
-                    "Convexity": bond["Convexity"]
-                }
-                for bond in sorted_bonds
-            ])
+            detailed_df = book.to_dataframe()[[
+                "Name", "Laufzeit", "Kupon", "Preis", "Inflation", "YTM", "Realzins",
+                "Duration", "Mod. Duration", "Convexity", "DV01"
+            ]].rename(columns={
+                "Laufzeit": "Laufzeit (Jahre)",
+                "Kupon": "Kupon (%)",
+                "Inflation": "Inflation (%)",
+                "YTM": "YTM (%)",
+                "Realzins": "Realzins (%)"
+            })
             
             st.dataframe(detailed_df, hide_index=True, use_container_width=True)
             
+            # Spot curve bootstrapped from the bonds, shared by the risk sections below
+            try:
+                analysis_curve = bootstrap_book(book, name=selected_country)
+            except ValueError as e:
+                analysis_curve = None
+                st.warning(f"Spot-Kurve konnte nicht berechnet werden: {str(e)}")
+            
+            # Key-rate durations against the curve bootstrapped from the bonds
+            st.subheader("Key-Rate Durations")
+            
+            if analysis_curve is not None:
+                key_rates = book_key_rate_durations(book, analysis_curve)
+                
+                krd_df = pd.DataFrame(
+                    key_rates.durations,
+                    columns=[f"KRD {tenor:g}J" for tenor in key_rates.tenors]
+                )
+                krd_df.insert(0, "Name", book["Name"])
+                krd_df["Summe"] = key_rates.durations.sum(axis=1)
+                st.dataframe(krd_df.round(4), hide_index=True, use_container_width=True)
+            
+            # Portfolio with a nominal per bond; kept across reruns so that edits only
+            # update the changed positions
+            st.subheader("Portfolio")
+            
+            portfolio = st.session_state.get("portfolio")
+            if portfolio is None or st.session_state.get("portfolio_book") is not book:
+                portfolio = Portfolio(book, np.full(len(book), 1_000_000.0), curve=analysis_curve)
+                st.session_state.portfolio = portfolio
+                st.session_state.portfolio_book = book
+            
+            nominal_df = st.data_editor(
+                pd.DataFrame({"Name": book["Name"], "Nominal": portfolio.notional}),
+                column_config={
+                    "Nominal": st.column_config.NumberColumn("Nominal", min_value=0.0, step=100000.0, format="%.0f")
+                },
+                disabled=["Name"],
+                hide_index=True
+            )
+            
+            nominals = nominal_df["Nominal"].to_numpy(dtype=float)
+            for index in np.flatnonzero(nominals != portfolio.notional):
+                portfolio.set_notional(int(index), nominals[index])
+            portfolio_risk = portfolio.risk()
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Marktwert", f"{portfolio_risk.market_value:,.0f}")
+            col2.metric("DV01", f"{portfolio_risk.dv01:,.2f}")
+            col3.metric("Mod. Duration", f"{portfolio_risk.modified_duration:.2f}")
+            col4.metric("Convexity", f"{portfolio_risk.convexity:.2f}")
+            
+            # Bucketed DV01 of the portfolio
+            if portfolio_risk.key_rate_tenors.size:
+                st.caption(
+                    "DV01 je Laufzeitband: " +
+                    ", ".join(
+                        f"{tenor:g}J: {dv01:,.2f}"
+                        for tenor, dv01 in zip(portfolio_risk.key_rate_tenors, portfolio_risk.key_rate_dv01)
+                    )
+                )
+            
+            # Monte Carlo P&L of the portfolio
+            st.subheader("Szenario-Analyse (Monte Carlo)")
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                rate_model = st.selectbox("Zinsmodell", ["Hull-White", "Vasicek"])
+                n_paths = st.select_slider("Anzahl Pfade", options=[1000, 5000, 10000, 50000], value=10000)
+            with col2:
+                horizon_days = st.slider("Haltedauer (Handelstage)", min_value=1, max_value=250, value=10)
+                volatility_bp = st.slider("Zinsvolatilität (bp p.a.)", min_value=10, max_value=300, value=100, step=10)
+            with col3:
+                confidence = st.select_slider("Konfidenzniveau", options=[0.9, 0.95, 0.975, 0.99, 0.995], value=0.99)
+                mean_reversion = st.slider("Mean Reversion", min_value=0.01, max_value=1.0, value=0.1, step=0.01)
+            
+            if analysis_curve is not None:
+                if rate_model == "Hull-White":
+                    model = HullWhiteModel(mean_reversion, volatility_bp / 10000, analysis_curve)
+                else:
+                    # Start at the short end of the curve and revert to its long end
+                    model = VasicekModel(
+                        mean_reversion,
+                        float(analysis_curve.zero_rates[-1]),
+                        volatility_bp / 10000,
+                        float(analysis_curve.zero_rates[0])
+                    )
+                
+                scenario = simulate_book_pnl(
+                    book,
+                    model,
+                    quantities=portfolio.units,
+                    horizon=horizon_days / 252,
+                    n_paths=n_paths,
+                    confidence=confidence,
+                    seed=42
+                )
+                
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Portfoliowert", f"{scenario.base_value:,.0f}")
+                col2.metric(f"VaR ({confidence:.1%})", f"{scenario.var:,.0f}")
+                col3.metric(f"Expected Shortfall ({confidence:.1%})", f"{scenario.expected_shortfall:,.0f}")
+                
+                fig_pnl = go.Figure()
+                fig_pnl.add_trace(go.Histogram(x=scenario.pnl, nbinsx=80, name="P&L", marker_color="steelblue"))
+                fig_pnl.add_vline(x=-scenario.var, line_dash="dash", line_color="red", annotation_text="VaR")
+                fig_pnl.update_layout(
+                    title=f"P&L-Verteilung über {horizon_days} Handelstage ({rate_model})",
+                    xaxis_title="P&L",
+                    yaxis_title="Anzahl Pfade",
+                    template="plotly_white",
+                    height=400
+                )
+                st.plotly_chart(fig_pnl, use_container_width=True)
+            
             # Yield spreads
             st.subheader("Yield Spreads")
             
-            if len(sorted_bonds) > 1:
-                spreads = []
-                for i in range(len(sorted_bonds) - 1):
-                    for j in range(i + 1, len(sorted_bonds)):
-                        bond_i = sorted_bonds[i]
-                        bond_j = sorted_bonds[j]
-                        spread = bond_j["YTM"] - bond_i["YTM"]
-                        spreads.append({
-                            "Von": bond_i["Name"],
-                            "Zu": bond_j["Name"],
-                            "Spread (bps)": spread * 100,
-                            "Laufzeitdifferenz (Jahre)": bond_j["Laufzeit"] - bond_i["Laufzeit"]
-                        })
-                
-                spreads_df = pd.DataFrame(spreads)
+            if len(book) > 1:
+                # All pairs (i, j) with i < j, in the same order as a nested loop
+                i, j = np.triu_indices(len(book), k=1)
+                names = book["Name"]
+                ytm = book["YTM"]
+                maturity = book["Laufzeit"]
+                
+                spreads_df = pd.DataFrame({
+                    "Von": names[i],
+                    "Zu": names[j],
+                    "Spread (bps)": (ytm[j] - ytm[i]) * 100,
+                    "Laufzeitdifferenz (Jahre)": maturity[j] - maturity[i]
+                })
                 st.dataframe(spreads_df, hide_index=True, use_container_width=True)
             
+            # Z- and I-spreads of every bond over a reference curve
+            reference_curves = bootstrap_country_curves(predefined_bonds)
+            if analysis_curve is not None:
+                reference_curves["Eigene"] = analysis_curve
+            
+            if reference_curves:
+                reference_options = list(reference_curves.keys())
+                default_reference = next((code for code in reference_options if code != selected_country), reference_options[0])
+                reference_code = st.selectbox(
+                    "Referenzkurve für Z-/I-Spread",
+                    reference_options,
+                    index=reference_options.index(default_reference),
+                    format_func=lambda x: "Eigene Anleihen (Bootstrap)" if x == "Eigene" else countries.get(x, x)
+                )
+                
+                curve_spreads = book_spreads(book, reference_curves[reference_code])
+                curve_spreads_df = pd.DataFrame({
+                    "Name": book["Name"],
+                    "Laufzeit (Jahre)": book["Laufzeit"],
+                    "YTM (%)": book["YTM"],
+                    "Z-Spread (bps)": curve_spreads.z_spread,
+                    "I-Spread (bps)": curve_spreads.i_spread
+                })
+                st.dataframe(curve_spreads_df.round(2), hide_index=True, use_container_width=True)
+                
+                st.download_button(
+                    "Spreads als CSV exportieren",
+                    curve_spreads_df.to_csv(index=False).encode("utf-8"),
+                    file_name=f"spreads_{selected_country}_vs_{reference_code}.csv",
+                    mime="text/csv"
+                )
+            
             # Analysis plots
             st.subheader("Visualisierungen")
             
@@ -698,11 +866,11 @@ def main():
                 fig_ytm = go.Figure()
                 
                 fig_ytm.add_trace(go.Scatter(
-                    x=[b["Laufzeit"] for b in sorted_bonds],
-                    y=[b["YTM"] for b in sorted_bonds],
+                    x=book["Laufzeit"],
+                    y=book["YTM"],
                     mode="lines+markers+text",
                     name="YTM",
-                    text=[b["Name"] for b in sorted_bonds],
+                    text=book["Name"],
                     textposition="top center",
                     line=dict(color='blue', width=3),
                     marker=dict(size=12)
@@ -723,15 +891,15 @@ def main():
                 fig_dur = go.Figure()
                 
                 fig_dur.add_trace(go.Scatter(
-                    x=[b["YTM"] for b in sorted_bonds],
-                    y=[b["Duration"] for b in sorted_bonds],
+                    x=book["YTM"],
+                    y=book["Duration"],
                     mode="markers+text",
                     name="Duration",
-                    text=[b["Name"] for b in sorted_bonds],
+                    text=book["Name"],
                     textposition="top center",
                     marker=dict(
-                        size=[b["Laufzeit"] * 2 for b in sorted_bonds],
-                        color=[b["Laufzeit"] for b in sorted_bonds],
+                        size=book["Laufzeit"] * 2,
+                        color=book["Laufzeit"],
                         colorscale="Viridis",
                         showscale=True,
                         colorbar=dict(title="Laufzeit (Jahre)")
@@ -749,19 +917,20 @@ def main():
                 st.plotly_chart(fig_dur, use_container_width=True)
             
             with tab_convexity:
-                # Plot Convexity vs Duration
+                # Plot Convexity vs Duration; marker sizes need a positive floor, since
+                # yields can be negative (or NaN for bonds that could not be solved)
                 fig_conv = go.Figure()
                 
                 fig_conv.add_trace(go.Scatter(
-                    x=[b["Duration"] for b in sorted_bonds],
-                    y=[b["Convexity"] for b in sorted_bonds],
+                    x=book["Duration"],
+                    y=book["Convexity"],
                     mode="markers+text",
                     name="Convexity",
-                    text=[b["Name"] for b in sorted_bonds],
+                    text=book["Name"],
                     textposition="top center",
                     marker=dict(
-                        size=[b["YTM"] * 3 for b in sorted_bonds],
-                        color=[b["YTM"] for b in sorted_bonds],
+                        size=np.maximum(np.nan_to_num(book["YTM"]) * 3, 6),
+                        color=book["YTM"],
                         colorscale="Plasma",
                         showscale=True,
                         colorbar=dict(title="YTM (%)")
@@ -0,0 +1,300 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from bonds import analyze_bonds, market_real_yields
+
+# Column layout of a bond book: field name -> (label used by the app, dtype, default).
+# Names are Python strings (object dtype) so they are never truncated.
+BOOK_COLUMNS = {
+    "name": ("Name", "O", ""),
+    "maturity": ("Laufzeit", "f8", np.nan),
+    "coupon": ("Kupon", "f8", np.nan),
+    "price": ("Preis", "f8", np.nan),
+    "inflation": ("Inflation", "f8", 0.0),
+    "face_value": ("Nennwert", "f8", 1000.0),
+    "frequency": ("Frequenz", "i4", 1),
+    "index_ratio": ("Indexfaktor", "f8", np.nan),
+    "ytm": ("YTM", "f8", np.nan),
+    "real_yield": ("Realzins", "f8", np.nan),
+    "breakeven": ("Breakeven", "f8", np.nan),
+    "duration": ("Duration", "f8", np.nan),
+    "mod_duration": ("Mod. Duration", "f8", np.nan),
+    "convexity": ("Convexity", "f8", np.nan),
+    "dv01": ("DV01", "f8", np.nan),
+}
+
+BOOK_DTYPE = np.dtype([(field, dtype) for field, (_, dtype, _) in BOOK_COLUMNS.items()])
+
+# App labels ("Laufzeit", "Mod. Duration", ...) -> field names
+_LABEL_TO_FIELD = {label: field for field, (label, _, _) in BOOK_COLUMNS.items()}
+
+# Keys used in predefined_bonds.json / market data -> field names
+_MARKET_DATA_FIELDS = {
+    "name": "name",
+    "years_to_maturity": "maturity",
+    "coupon_rate": "coupon",
+    "price": "price",
+    "inflation": "inflation",
+    "face_value": "face_value",
+    "frequency": "frequency",
+    "index_ratio": "index_ratio",
+}
+
+class BondBook:
+    """
+    Columnar container for a set of bonds, kept sorted by maturity
+
+    The bonds live in one NumPy structured array (BOOK_DTYPE). Columns can be
+    accessed by field name ("maturity") or by the app's label ("Laufzeit") and are
+    returned as views into that array, so no per-bond Python objects are created.
+    Rates follow the app's conventions: coupon, inflation, YTM, real yield and
+    breakeven in percent. Inflation-linked bonds carry their index ratio (reference
+    CPI / base CPI) and are quoted in real terms: price, coupon and YTM are real,
+    invoice amounts are the real amounts times the index ratio. Nominal bonds have
+    no index ratio (NaN).
+    """
+
+    def __init__(self, data: Optional[np.ndarray] = None):
+        """
+        Args:
+            data: Structured array with dtype BOOK_DTYPE (default: empty book)
+        """
+        if data is None:
+            data = np.zeros(0, dtype=BOOK_DTYPE)
+        if data.dtype != BOOK_DTYPE:
+            raise ValueError("BondBook data must have dtype BOOK_DTYPE")
+
+        # Stable sort so bonds with equal maturity keep their input order
+        order = np.argsort(data["maturity"], kind="stable")
+        self._data = data[order]
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "BondBook":
+        """
+        Build a book from bond dictionaries keyed by app labels ("Laufzeit", "YTM", ...)
+
+        Args:
+            records: List of bond dictionaries; missing columns get their defaults
+
+        Returns:
+            New BondBook
+        """
+        data = np.zeros(len(records), dtype=BOOK_DTYPE)
+        for field, (label, _, default) in BOOK_COLUMNS.items():
+            data[field] = [record.get(label, default) for record in records]
+        return cls(data)
+
+    @classmethod
+    def from_market_data(cls, bonds: List[Dict[str, Any]]) -> "BondBook":
+        """
+        Build a book from bond dictionaries as stored in predefined_bonds.json
+
+        Args:
+            bonds: List of dictionaries with keys like "years_to_maturity" and "coupon_rate"
+
+        Returns:
+            New BondBook (analytics columns are NaN until analyze() is called)
+        """
+        data = np.zeros(len(bonds), dtype=BOOK_DTYPE)
+        for field, (_, _, default) in BOOK_COLUMNS.items():
+            data[field] = default
+        for key, field in _MARKET_DATA_FIELDS.items():
+            data[field] = [bond.get(key, BOOK_COLUMNS[field][2]) for bond in bonds]
+        return cls(data)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "BondBook":
+        """
+        Build a book from a DataFrame whose columns are app labels or field names
+
+        Args:
+            df: DataFrame with one row per bond
+
+        Returns:
+            New BondBook
+        """
+        data = np.zeros(len(df), dtype=BOOK_DTYPE)
+        for field, (label, _, default) in BOOK_COLUMNS.items():
+            if label in df.columns:
+                data[field] = df[label].to_numpy()
+            elif field in df.columns:
+                data[field] = df[field].to_numpy()
+            else:
+                data[field] = default
+        return cls(data)
+
+    def to_dataframe(self, labels: bool = True) -> pd.DataFrame:
+        """
+        Convert the book to a DataFrame
+
+        Args:
+            labels: Use the app's labels ("Laufzeit", ...) as column names instead of field names
+
+        Returns:
+            DataFrame with one row per bond, sorted by maturity
+        """
+        df = pd.DataFrame(self._data)
+        if labels:
+            df = df.rename(columns={field: label for field, (label, _, _) in BOOK_COLUMNS.items()})
+        return df
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert the book to bond dictionaries keyed by app labels
+
+        Returns:
+            List of bond dictionaries, sorted by maturity
+        """
+        return [self.record(i) for i in range(len(self))]
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Get a single bond as a dictionary keyed by app labels
+
+        Args:
+            index: Position of the bond in maturity order
+
+        Returns:
+            Bond dictionary
+        """
+        row = self._data[index]
+        return {
+            label: value.item() if isinstance(value, np.generic) else value
+            for label, value in ((label, row[field]) for field, (label, _, _) in BOOK_COLUMNS.items())
+        }
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a column as a read-only view into the book
+
+        Args:
+            name: Field name ("maturity") or app label ("Laufzeit")
+
+        Returns:
+            NumPy view of the column
+        """
+        view = self._data[_LABEL_TO_FIELD.get(name, name)].view()
+        view.flags.writeable = False
+        return view
+
+    def has_values(self, name: str) -> bool:
+        """
+        Check whether a numeric column is filled for every bond
+
+        Args:
+            name: Field name or app label
+        """
+        return len(self) > 0 and not np.isnan(self.column(name)).any()
+
+    def analyze(self) -> "BondBook":
+        """
+        Fill the analytics columns for all bonds with one vectorized call
+
+        Bonds seen before with the same quantized inputs are served from the
+        process-wide analytics cache (see bonds.get_analytics_cache_stats). Bonds
+        whose yield cannot be solved get NaN analytics.
+
+        Returns:
+            The book itself, for chaining
+        """
+        data = self._data
+        analytics = analyze_bonds(
+            data["price"],
+            data["face_value"],
+            data["coupon"] / 100,
+            data["maturity"],
+            data["frequency"],
+            data["inflation"] / 100,
+            use_cache=True
+        )
+        data["ytm"] = analytics.ytm * 100
+        data["duration"] = analytics.duration
+        data["mod_duration"] = analytics.modified_duration
+        data["convexity"] = analytics.convexity
+        data["dv01"] = analytics.dv01
+        return self.update_real_yields()
+
+    @property
+    def is_linker(self) -> np.ndarray:
+        """
+        Mask of the inflation-linked bonds (those with an index ratio)
+        """
+        return ~np.isnan(self._data["index_ratio"])
+
+    def update_real_yields(self, linker_breakeven: Optional[np.ndarray] = None) -> "BondBook":
+        """
+        Fill the real yield and breakeven columns from the YTMs of the whole book
+
+        Breakevens come from the nominal and inflation-linked bonds of the book (see
+        bonds.market_real_yields); the inflation column is only the fallback for books
+        without linkers or without nominal bonds.
+
+        Args:
+            linker_breakeven: Breakevens of the linkers in percent, rows in maturity
+                order (e.g. linkers.book_breakevens); default: Fisher spreads to the
+                interpolated nominal yields
+
+        Returns:
+            The book itself, for chaining
+        """
+        data = self._data
+        real, breakeven = market_real_yields(
+            data["maturity"], data["ytm"] / 100, data["inflation"] / 100, self.is_linker,
+            None if linker_breakeven is None else np.asarray(linker_breakeven, dtype=float) / 100
+        )
+        data["real_yield"] = real * 100
+        data["breakeven"] = breakeven * 100
+        return self
+
+    def insert(self, other: "BondBook") -> "BondBook":
+        """
+        Merge another book into this one, keeping maturity order
+
+        Args:
+            other: Book with the bonds to add
+
+        Returns:
+            The book itself, for chaining
+        """
+        positions = np.searchsorted(self._data["maturity"], other._data["maturity"], side="right")
+        self._data = np.insert(self._data, positions, other._data)
+        return self
+
+    @property
+    def data(self) -> np.ndarray:
+        """
+        Underlying structured array (read-only view)
+        """
+        view = self._data.view()
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, key: Union[str, int]) -> Union[np.ndarray, Dict[str, Any]]:
+        if isinstance(key, str):
+            return self.column(key)
+        return self.record(key)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def __repr__(self) -> str:
+        return f"BondBook({len(self)} bonds)"
+
+def as_book(bonds: Union[BondBook, List[Dict[str, Any]]]) -> BondBook:
+    """
+    Accept either a BondBook or a list of bond dictionaries keyed by app labels
+
+    Args:
+        bonds: BondBook or list of bond dictionaries
+
+    Returns:
+        BondBook (the same object if one was passed)
+    """
+    if isinstance(bonds, BondBook):
+        return bonds
+    return BondBook.from_records(bonds)
@@ -1,11 +1,366 @@
 import numpy as np
+import math
+import logging
+import threading
+from collections import Counter
 from scipy import optimize
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
-def calculate_ytm(price: float, face_value: float, coupon_rate: float, years_to_maturity: float, 
-                 frequency: int = 1) -> float:
+from lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Closed-form kernels
+#
+# Every cash-flow sum in this module has the shape sum_{i=1..m} i^k * v^i with
+# v = 1 / (1 + y/f), i.e. a (weighted) geometric series. The helpers below evaluate
+# those sums in O(1) so pricing cost no longer grows with the number of coupons.
+
+# Below this value of m * log(1 + y/f) the recurrences lose precision to
+# cancellation, so a Taylor expansion around zero yield is used instead
+_SERIES_THRESHOLD = 0.05
+_SERIES_ORDER = 6
+
+# float32 loses the same digits to cancellation much earlier, so single precision
+# switches to a longer expansion over a wider range
+_SERIES_THRESHOLD_SINGLE = 0.3
+_SERIES_ORDER_SINGLE = 7
+
+# Bernoulli numbers B_0..B_10 (with B_1 = +1/2) for Faulhaber's formula
+_BERNOULLI = (1.0, 0.5, 1 / 6, 0.0, -1 / 30, 0.0, 1 / 42, 0.0, -1 / 30, 0.0, 5 / 66)
+
+# Floating-point types the batch functions can compute in (see _batch_dtype)
+_BATCH_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+def _batch_dtype(dtype: Union[str, type, np.dtype]) -> np.dtype:
+    """
+    Validate the dtype argument of the batch functions
+
+    Raises:
+        ValueError: If dtype is not float32 or float64
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _BATCH_DTYPES:
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}")
+    return dtype
+
+def _as_float(x: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Array view of x that keeps float32/float64 inputs and converts anything else to float64
+    """
+    x = np.asarray(x)
+    return x if x.dtype in _BATCH_DTYPES else x.astype(float)
+
+def _power_sums(m: np.ndarray, k_max: int) -> List[np.ndarray]:
+    """
+    Faulhaber power sums P_k = sum_{i=1..m} i^k for k = 0..k_max
+    """
+    return [
+        sum(math.comb(k + 1, j) * _BERNOULLI[j] * m ** (k + 1 - j) for j in range(k + 1)) / (k + 1)
+        for k in range(k_max + 1)
+    ]
+
+def _scalar_annuity_moments(rate: float, m: float) -> Tuple[float, float, float]:
+    """
+    Plain-float version of _annuity_moments, avoiding NumPy overhead for single bonds
     """
-    Calculate Yield to Maturity using Newton's method
+    if rate <= -1:
+        return math.nan, math.nan, math.nan
+
+    log_growth = math.log1p(rate)
+
+    # Near zero yield expand v^i = exp(-i*L) in powers of L = log(1 + rate)
+    if abs(m * log_growth) < _SERIES_THRESHOLD:
+        p = _power_sums(m, _SERIES_ORDER + 2)
+        coeffs = [(-log_growth) ** j / math.factorial(j) for j in range(_SERIES_ORDER + 1)]
+        t0, t1, t2 = (sum(c * p[j + k] for j, c in enumerate(coeffs)) for k in range(3))
+        return t0, t1, t1 + t2
+
+    # Summation by parts: (1 - v) * S_k reduces to S_{k-1} and a boundary term
+    v_m = math.exp(-m * log_growth)
+    s0 = -math.expm1(-m * log_growth) / rate
+    s1 = (s0 * (1 + rate) - m * v_m) / rate
+    s2 = (2 * s1 * (1 + rate) - m * (m + 1) * v_m) / rate
+    return s0, s1, s2
+
+def _annuity_moments(rate: np.ndarray, n_coupons: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Closed-form geometric-series sums over m coupon periods
+
+    Args:
+        rate: Yield per period (y / f), must be greater than -1
+        n_coupons: Number of full coupon periods m
+
+    Returns:
+        Tuple (S0, S1, S2) with S0 = sum v^i, S1 = sum i*v^i and
+        S2 = sum i*(i+1)*v^i for i = 1..m and v = 1 / (1 + rate)
+    """
+    if np.ndim(rate) == 0 and np.ndim(n_coupons) == 0:
+        return _scalar_annuity_moments(float(rate), float(n_coupons))
+
+    rate = _as_float(rate)
+    m = _as_float(n_coupons)
+    log_growth = np.log1p(rate)
+    v_m = np.exp(-m * log_growth)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Summation by parts: (1 - v) * S_k reduces to S_{k-1} and a boundary term
+        s0 = -np.expm1(-m * log_growth) / rate
+        s1 = (s0 * (1 + rate) - m * v_m) / rate
+        s2 = (2 * s1 * (1 + rate) - m * (m + 1) * v_m) / rate
+
+    # Near zero yield expand v^i = exp(-i*L) in powers of L = log(1 + rate)
+    if rate.dtype == np.float32:
+        threshold, order = _SERIES_THRESHOLD_SINGLE, _SERIES_ORDER_SINGLE
+    else:
+        threshold, order = _SERIES_THRESHOLD, _SERIES_ORDER
+    small = np.abs(m * log_growth) < threshold
+    if np.any(small):
+        # Only evaluate the expansion for the bonds that need it
+        m_small = np.broadcast_to(m, small.shape)[small]
+        log_small = np.broadcast_to(log_growth, small.shape)[small]
+        p = _power_sums(m_small, order + 2)
+        coeffs = [(-log_small) ** j / math.factorial(j) for j in range(order + 1)]
+        t0, t1, t2 = (sum(c * p[j + k] for j, c in enumerate(coeffs)) for k in range(3))
+        s0, s1, s2 = (np.array(np.broadcast_to(s, small.shape)) for s in (s0, s1, s2))
+        s0[small] = t0
+        s1[small] = t1
+        s2[small] = t1 + t2
+
+    return s0, s1, s2
+
+# Period counts are rounded to this many decimals before taking the ceiling, so
+# maturities that are whole periods (up to rounding) get no extra coupon
+_PERIOD_DECIMALS = 10
+
+def _coupon_periods(n_payments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Number of coupons and stub offset of the schedule convention of cashflows.CashFlowSchedule
+
+    Coupons fall at n, n-1, ..., n-m+1 periods, dated backwards from maturity, with
+    m = ceil(n) (at least one). The first coupon is paid in full after a short stub.
+
+    Returns:
+        Tuple (m, delta) with delta = n - m in (-1, 0], so coupon i = 1..m is due at delta + i periods
+    """
+    n_coupons = np.maximum(np.ceil(np.round(n_payments, _PERIOD_DECIMALS)), 1)
+    return n_coupons, n_payments - n_coupons
+
+def _discounted_moments(face_value: np.ndarray, coupon_rate: np.ndarray, ytm: np.ndarray,
+                        years_to_maturity: np.ndarray, frequency: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Present value of a bond and its time-weighted moments in closed form
+
+    Uses the cash-flow convention of cashflows.CashFlowSchedule: for a fractional
+    number of periods n, ceil(n) full coupons dated backwards from maturity, the first
+    after a short stub. With delta = n - ceil(n) every sum is v^delta times a shifted
+    geometric series, so stub bonds stay O(1) too.
+
+    Args:
+        face_value: Face value (par value) of the bond
+        coupon_rate: Annual coupon rate as a decimal
+        ytm: Yield to Maturity as a decimal
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequency per year
+
+    Returns:
+        Tuple (PV, sum t*PV, sum t*(t + 1/f)*PV) with t in years
+    """
+    n_payments = _as_float(years_to_maturity) * frequency
+    coupon_payment = face_value * coupon_rate / frequency
+    rate = _as_float(ytm) / frequency
+
+    n_coupons, delta = _coupon_periods(n_payments)
+    s0, s1, s2 = _annuity_moments(rate, n_coupons)
+    log_growth = np.log1p(rate)
+    pv_face = face_value * np.exp(-n_payments * log_growth)
+
+    # Coupon i is due at delta + i periods: shift the moments of i = 1..m by delta
+    coupon_pv = coupon_payment * np.exp(-delta * log_growth)
+    total_pv = coupon_pv * s0 + pv_face
+    weighted_pv = (coupon_pv * (s1 + delta * s0) + n_payments * pv_face) / frequency
+    convexity_pv = (
+        coupon_pv * (s2 + 2 * delta * s1 + delta * (delta + 1) * s0) + n_payments * (n_payments + 1) * pv_face
+    ) / frequency ** 2
+
+    return total_pv, weighted_pv, convexity_pv
+
+def _present_value(face_value: np.ndarray, coupon_rate: np.ndarray, ytm: np.ndarray,
+                   years_to_maturity: np.ndarray, frequency: np.ndarray) -> np.ndarray:
+    """
+    Closed-form bond price only, with the same cash-flow convention as _discounted_moments
+
+    Cheaper than _discounted_moments when no duration or convexity is needed: the
+    annuity factor (1 - v^m) / r has no cancellation problem near zero yield, so no
+    series branch is required. Yields at or below -f (no valid discount factor) give NaN.
+
+    Args:
+        face_value: Face value (par value) of the bond
+        coupon_rate: Annual coupon rate as a decimal
+        ytm: Yield to Maturity as a decimal
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequency per year
+
+    Returns:
+        Bond price
+    """
+    n_payments = _as_float(years_to_maturity) * frequency
+    rate = _as_float(ytm) / frequency
+    n_coupons, delta = _coupon_periods(n_payments)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_growth = np.log1p(rate)
+        zero = rate == 0
+        annuity = np.where(zero, n_coupons, -np.expm1(-n_coupons * log_growth) / np.where(zero, 1.0, rate))
+        annuity = annuity * np.exp(-delta * log_growth)
+        return face_value * coupon_rate / frequency * annuity + face_value * np.exp(-n_payments * log_growth)
+
+def _reference_moments(face_value: float, coupon_rate: float, ytm: float,
+                       years_to_maturity: float, frequency: int = 1) -> Tuple[float, float, float]:
+    """
+    Coupon-by-coupon loop version of _discounted_moments, kept as a reference
+    implementation to validate the closed-form kernels against
+    """
+    n_payments = years_to_maturity * frequency
+    coupon_payment = face_value * coupon_rate / frequency
+    
+    total_pv = 0
+    weighted_pv = 0
+    convexity_pv = 0
+    
+    n_coupons, delta = _coupon_periods(n_payments)
+    for i in range(1, int(n_coupons) + 1):
+        t = (delta + i) / frequency  # Time in years, the first coupon after the stub
+        pv = coupon_payment / (1 + ytm / frequency) ** (delta + i)
+        total_pv += pv
+        weighted_pv += t * pv
+        convexity_pv += t * (t + 1/frequency) * pv
+    
+    # Add face value at maturity
+    t_maturity = n_payments / frequency
+    pv_face = face_value / (1 + ytm / frequency) ** n_payments
+    total_pv += pv_face
+    weighted_pv += t_maturity * pv_face
+    convexity_pv += t_maturity * (t_maturity + 1/frequency) * pv_face
+    
+    return total_pv, weighted_pv, convexity_pv
+
+# Yield convention
+#
+# Every solver in this module (solve_ytm, calculate_ytm, calculate_ytm_batch) returns
+# the exact root of the price equation, including negative yields; none floors at zero.
+# A bond that cannot be solved gets its coupon rate from calculate_ytm and
+# calculate_ytm_batch (with converged=False from the latter), and NaN analytics from
+# analyze_bond and analyze_bonds.
+
+class YTMResult(NamedTuple):
+    """
+    Outcome of a single YTM solve
+    
+    Attributes:
+        ytm: Yield to Maturity as a decimal (the coupon rate if the solve failed)
+        converged: Whether a root was found within tolerance
+        iterations: Halley iterations plus Brent iterations, if the fallback ran
+        method: "halley", "brentq" or "none"
+        reason: Why the solve failed or needed the fallback, empty on a clean Halley solve
+    """
+    ytm: float
+    converged: bool
+    iterations: int
+    method: str
+    reason: str
+
+# Process-wide solver counters, see get_solver_stats()
+_solver_stats_lock = threading.Lock()
+_solver_stats = {"solves": 0, "iterations": 0, "fallbacks": 0, "failures": 0, "reasons": Counter()}
+
+def _record_solves(solves: int, iterations: int, fallbacks: int, failures: int,
+                   reasons: Optional[Counter] = None) -> None:
+    """
+    Add the cost and outcome of one or more YTM solves to the process-wide counters
+    """
+    with _solver_stats_lock:
+        _solver_stats["solves"] += solves
+        _solver_stats["iterations"] += iterations
+        _solver_stats["fallbacks"] += fallbacks
+        _solver_stats["failures"] += failures
+        if reasons:
+            _solver_stats["reasons"].update(reasons)
+
+def get_solver_stats() -> Dict[str, Union[int, float, Dict[str, int]]]:
+    """
+    Get the accumulated cost and accuracy counters of all YTM solves in this process
+    
+    Returns:
+        Dictionary with the number of solves, total and average iterations,
+        Brent/bisection fallbacks, failures and a count per failure/fallback reason
+    """
+    with _solver_stats_lock:
+        stats = {key: value for key, value in _solver_stats.items() if key != "reasons"}
+        stats["reasons"] = dict(_solver_stats["reasons"])
+    stats["avg_iterations"] = stats["iterations"] / stats["solves"] if stats["solves"] else 0.0
+    return stats
+
+def reset_solver_stats() -> None:
+    """
+    Reset the process-wide YTM solver counters
+    """
+    with _solver_stats_lock:
+        for key in ("solves", "iterations", "fallbacks", "failures"):
+            _solver_stats[key] = 0
+        _solver_stats["reasons"].clear()
+
+def _price_derivatives(ytm: float, face_value: float, coupon_rate: float,
+                       years_to_maturity: float, frequency: int) -> Tuple[float, float, float]:
+    """
+    Bond price and its analytic first and second derivatives with respect to yield
+    
+    Returns:
+        Tuple (P, dP/dy, d2P/dy2)
+    """
+    total_pv, weighted_pv, convexity_pv = _discounted_moments(
+        face_value, coupon_rate, ytm, years_to_maturity, frequency
+    )
+    growth = 1 + ytm / frequency
+    return float(total_pv), float(-weighted_pv / growth), float(convexity_pv / growth ** 2)
+
+_MAX_BRACKET_EXPANSIONS = 60
+
+def _bracket_ytm(price: float, face_value: float, coupon_rate: float,
+                 years_to_maturity: float, frequency: int) -> Tuple[float, float, int]:
+    """
+    Find yields bracketing the root of the price equation
+    
+    The price of a bond with non-negative cash flows falls monotonically from +inf
+    at y = -f to 0 as y grows, so for any positive price the bracket [-0.5, 1.0] can
+    be widened until it contains the root.
+    
+    Returns:
+        Tuple (lower, upper, expansions)
+    """
+    def excess(ytm):
+        return _price_derivatives(ytm, face_value, coupon_rate, years_to_maturity, frequency)[0] - price
+    
+    lower, upper = -0.5, 1.0
+    expansions = 0
+    # Move the lower bound halfway towards the -100% per period pole each time
+    while excess(lower) < 0 and expansions < _MAX_BRACKET_EXPANSIONS:
+        lower = (lower - frequency) / 2
+        expansions += 1
+    while excess(upper) > 0 and expansions < _MAX_BRACKET_EXPANSIONS:
+        upper *= 2
+        expansions += 1
+    return lower, upper, expansions
+
+def solve_ytm(price: float, face_value: float, coupon_rate: float, years_to_maturity: float,
+              frequency: int = 1, tol: float = 1e-10, maxiter: int = 50) -> YTMResult:
+    """
+    Solve for Yield to Maturity with Halley's method and a bracketed Brent fallback
+    
+    Halley's method uses the analytic first and second derivatives of the price and
+    typically converges in 2-4 iterations from the coupon rate. If it stalls or leaves
+    the valid domain, brentq is run on a bracket that is widened until it contains
+    the root.
     
     Args:
         price: Current market price of the bond
@@ -13,43 +368,228 @@ def calculate_ytm(price: float, face_value: float, coupon_rate: float, years_to_
         coupon_rate: Annual coupon rate as a decimal (e.g., 0.05 for 5%)
         years_to_maturity: Years until bond maturity
         frequency: Coupon payment frequency per year (default: 1 for annual)
+        tol: Absolute tolerance on the yield
+        maxiter: Maximum number of Halley iterations
         
     Returns:
-        Yield to Maturity as a decimal
+        YTMResult with the yield, convergence flag, iteration count and failure reason
     """
-    # Function to find the zero of (to solve for YTM)
-    def bond_price_equation(ytm):
-        # Total number of coupon payments
-        n_payments = years_to_maturity * frequency
-        
-        # Coupon payment per period
-        coupon_payment = face_value * coupon_rate / frequency
+    if not price > 0 or not face_value > 0 or not years_to_maturity > 0:
+        result = YTMResult(coupon_rate, False, 0, "none", "invalid inputs")
+        _record_solves(1, 0, 0, 1, Counter([result.reason]))
+        return result
+    
+    # Start with an initial guess (coupon rate is usually close to YTM)
+    ytm = coupon_rate
+    reason = "max iterations reached"
+    iterations = 0
+    
+    for iterations in range(1, maxiter + 1):
+        value, slope, curvature = _price_derivatives(ytm, face_value, coupon_rate, years_to_maturity, frequency)
+        value -= price
         
-        # Calculate present value of all coupon payments and face value
-        pv_coupon = 0
-        for i in range(1, int(n_payments) + 1):
-            pv_coupon += coupon_payment / (1 + ytm / frequency) ** i
+        if not (math.isfinite(value) and math.isfinite(slope) and math.isfinite(curvature)):
+            reason = "non-finite price"
+            break
+        if slope == 0:
+            reason = "zero derivative"
+            break
         
-        pv_face = face_value / (1 + ytm / frequency) ** n_payments
+        # Halley step, falling back to the plain Newton step when the correction is unstable
+        newton_step = value / slope
+        denominator = 1 - 0.5 * newton_step * curvature / slope
+        step = newton_step / denominator if denominator > 0.5 else newton_step
+        ytm -= step
         
-        # Return difference between calculated PV and market price
-        return pv_coupon + pv_face - price
-    
-    # Start with an initial guess (coupon rate is usually close to YTM)
-    initial_guess = coupon_rate
+        if 1 + ytm / frequency <= 0:
+            reason = "left domain (yield <= -100% per period)"
+            break
+        if abs(step) < tol:
+            _record_solves(1, iterations, 0, 0)
+            return YTMResult(ytm, True, iterations, "halley", "")
     
+    # Guaranteed fallback: Brent's method on a bracket containing the root
+    lower, upper, _ = _bracket_ytm(price, face_value, coupon_rate, years_to_maturity, frequency)
     try:
-        # Use scipy's root finding to solve for YTM
-        result = optimize.newton(bond_price_equation, initial_guess, tol=1e-6, maxiter=100)
-        return max(result, 0)  # YTM shouldn't be negative (though theoretically it can be)
-    except:
-        # If Newton's method fails, try bisection which is more robust but slower
-        try:
-            result = optimize.bisect(bond_price_equation, -0.5, 1.0, xtol=1e-6)
-            return max(result, 0)
-        except:
-            # If all fails, return an estimate
-            return coupon_rate  # A rough approximation
+        root, info = optimize.brentq(
+            lambda y: _price_derivatives(y, face_value, coupon_rate, years_to_maturity, frequency)[0] - price,
+            lower, upper, xtol=tol, full_output=True
+        )
+    except (ValueError, RuntimeError) as e:
+        logger.warning(f"YTM solve failed (price={price}, coupon={coupon_rate}, years={years_to_maturity}): {e}")
+        _record_solves(1, iterations, 1, 1, Counter([reason, "no bracket"]))
+        return YTMResult(coupon_rate, False, iterations, "none", f"{reason}; no bracket: {e}")
+    
+    converged = bool(info.converged)
+    _record_solves(1, iterations + info.iterations, 1, int(not converged), Counter([reason]))
+    return YTMResult(root, converged, iterations + info.iterations, "brentq", reason)
+
+def calculate_ytm(price: float, face_value: float, coupon_rate: float, years_to_maturity: float, 
+                 frequency: int = 1) -> float:
+    """
+    Calculate Yield to Maturity using Halley's method with a Brent fallback
+    
+    Args:
+        price: Current market price of the bond
+        face_value: Face value (par value) of the bond
+        coupon_rate: Annual coupon rate as a decimal (e.g., 0.05 for 5%)
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequency per year (default: 1 for annual)
+        
+    Returns:
+        Yield to Maturity as a decimal; the coupon rate if the solve fails
+        (see solve_ytm for iteration counts and failure reasons)
+    """
+    result = solve_ytm(price, face_value, coupon_rate, years_to_maturity, frequency)
+    if not result.converged:
+        # If all fails, return an estimate
+        logger.warning(f"YTM solve did not converge ({result.reason}), using coupon rate as estimate")
+        return coupon_rate  # A rough approximation
+    return result.ytm
+
+def _batch_price_and_slope(ytm: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                           years_to_maturity: np.ndarray, frequency: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized bond price and its first derivative with respect to yield
+
+    Args:
+        ytm: Yields to maturity as decimals, one per bond
+        face_value: Face values, one per bond
+        coupon_rate: Annual coupon rates as decimals, one per bond
+        years_to_maturity: Years until maturity, one per bond
+        frequency: Coupon payment frequencies per year, one per bond
+
+    Returns:
+        Tuple of (prices, dP/dy) arrays
+    """
+    total_pv, weighted_pv, _ = _discounted_moments(face_value, coupon_rate, ytm, years_to_maturity, frequency)
+
+    # dP/dy = -sum(t * PV) / (1 + y/f)
+    slope = -weighted_pv / (1 + ytm / frequency)
+
+    return total_pv, slope
+
+def calculate_ytm_batch(price: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                        years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1,
+                        tol: float = 1e-6, maxiter: int = 100,
+                        dtype: Union[str, type, np.dtype] = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate Yield to Maturity for many bonds at once
+
+    Runs Newton iterations over all bonds simultaneously, dropping each bond from the
+    active set as soon as it converges. Bonds where Newton fails are retried with a
+    vectorized bisection on a bracket widened from [-0.5, 1.0] until it contains the
+    root. Iterations and failures are added to get_solver_stats().
+
+    Args:
+        price: Current market prices of the bonds
+        face_value: Face values (par values) of the bonds
+        coupon_rate: Annual coupon rates as decimals (e.g., 0.05 for 5%)
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequencies per year (default: 1 for annual)
+        tol: Absolute tolerance on the yield
+        maxiter: Maximum number of Newton iterations
+        dtype: Floating-point type of the computation and the result, float64 or
+            float32 (see analyze_bonds for the float32 error bounds)
+
+    Returns:
+        Tuple of (yields, converged) arrays in the broadcast shape of the inputs.
+        Bonds that could not be solved get their coupon rate as an estimate and
+        converged=False.
+    """
+    dtype = _batch_dtype(dtype)
+    arrays = np.broadcast_arrays(
+        np.asarray(price, dtype=dtype),
+        np.asarray(face_value, dtype=dtype),
+        np.asarray(coupon_rate, dtype=dtype),
+        np.asarray(years_to_maturity, dtype=dtype),
+        np.asarray(frequency, dtype=dtype)
+    )
+    shape = arrays[0].shape
+    price, face_value, coupon_rate, years_to_maturity, frequency = (a.ravel() for a in arrays)
+
+    # Start with the coupon rate as initial guess, as in the scalar solver
+    ytm = coupon_rate.copy()
+    converged = np.zeros(ytm.shape, dtype=bool)
+    failed = np.zeros(ytm.shape, dtype=bool)
+    iterations = np.zeros(ytm.shape, dtype=int)
+    reasons = Counter()
+
+    # Invalid or non-finite inputs keep the coupon rate and converged=False, as in solve_ytm
+    valid = (
+        (price > 0) & (face_value > 0) & (years_to_maturity > 0) & (frequency > 0)
+        & np.isfinite(price) & np.isfinite(face_value) & np.isfinite(coupon_rate)
+        & np.isfinite(years_to_maturity) & np.isfinite(frequency)
+    )
+    active = np.flatnonzero(valid)
+    reasons["invalid inputs"] += int((~valid).sum())
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(maxiter):
+            if active.size == 0:
+                break
+            iterations[active] += 1
+
+            model_price, slope = _batch_price_and_slope(
+                ytm[active], face_value[active], coupon_rate[active],
+                years_to_maturity[active], frequency[active]
+            )
+            step = (model_price - price[active]) / slope
+            new_ytm = ytm[active] - step
+
+            # A zero slope or a step below -100% per period means Newton has diverged
+            diverged = ~np.isfinite(new_ytm) | (1 + new_ytm / frequency[active] <= 0)
+            done = ~diverged & (np.abs(step) < tol)
+
+            ytm[active] = np.where(diverged, ytm[active], new_ytm)
+            converged[active[done]] = True
+            failed[active[diverged]] = True
+            reasons["newton diverged"] += int(diverged.sum())
+            active = active[~(done | diverged)]
+
+        # Anything still active ran out of iterations
+        failed[active] = True
+        reasons["max iterations reached"] += active.size
+
+        # Vectorized bisection fallback for the bonds Newton could not solve
+        retry = np.flatnonzero(failed)
+        if retry.size:
+            args = (face_value[retry], coupon_rate[retry], years_to_maturity[retry], frequency[retry])
+            lower = np.full(retry.size, -0.5, dtype=dtype)
+            upper = np.full(retry.size, 1.0, dtype=dtype)
+            f_lower = _batch_price_and_slope(lower, *args)[0] - price[retry]
+            f_upper = _batch_price_and_slope(upper, *args)[0] - price[retry]
+
+            # Widen the brackets as in _bracket_ytm until they contain the root
+            for _ in range(_MAX_BRACKET_EXPANSIONS):
+                widen_lower = f_lower < 0
+                widen_upper = f_upper > 0
+                if not (widen_lower.any() or widen_upper.any()):
+                    break
+                lower = np.where(widen_lower, (lower - frequency[retry]) / 2, lower)
+                upper = np.where(widen_upper, upper * 2, upper)
+                f_lower = _batch_price_and_slope(lower, *args)[0] - price[retry]
+                f_upper = _batch_price_and_slope(upper, *args)[0] - price[retry]
+            # A NaN price difference has no sign change, so it must not count as bracketed
+            bracketed = np.isfinite(f_lower) & np.isfinite(f_upper) & (np.sign(f_lower) != np.sign(f_upper))
+
+            n_steps = int(np.ceil(np.log2(np.max(upper - lower) / tol)))
+            iterations[retry] += n_steps
+            for _ in range(n_steps):
+                mid = 0.5 * (lower + upper)
+                f_mid = _batch_price_and_slope(mid, *args)[0] - price[retry]
+                root_above = np.sign(f_mid) == np.sign(f_lower)
+                lower = np.where(root_above, mid, lower)
+                f_lower = np.where(root_above, f_mid, f_lower)
+                upper = np.where(root_above, upper, mid)
+
+            # If all fails, return the coupon rate as a rough approximation
+            ytm[retry] = np.where(bracketed, 0.5 * (lower + upper), coupon_rate[retry])
+            converged[retry] = bracketed
+            reasons["no bracket"] += int((~bracketed).sum())
+
+    _record_solves(ytm.size, int(iterations.sum()), retry.size, int((~converged).sum()), +reasons)
+    return ytm.reshape(shape), converged.reshape(shape)
 
 def real_yield(nominal_yield: float, inflation_rate: float) -> float:
     """
@@ -66,6 +606,63 @@ def real_yield(nominal_yield: float, inflation_rate: float) -> float:
     real = (1 + nominal_yield) / (1 + inflation_rate) - 1
     return real
 
+def market_real_yields(years_to_maturity: np.ndarray, ytm: np.ndarray, inflation_rate: np.ndarray,
+                       is_linker: np.ndarray,
+                       linker_breakeven: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Market-consistent real yields and breakeven inflation rates of a whole book
+
+    Inflation-linked bonds are quoted in real terms, so their YTM already is a real
+    yield. Their breakeven inflation is the Fisher spread to the nominal yield at the
+    same maturity, interpolated linearly over the book's nominal bonds. Nominal bonds
+    get the breakeven interpolated over the linkers and their real yield from the
+    Fisher equation. Without bonds of the other kind to interpolate over, the
+    given inflation rate is used as the breakeven. Breakevens of the linkers that
+    were solved elsewhere (e.g. linkers.breakeven_inflation against a zero curve)
+    can be passed in instead of the Fisher spreads.
+
+    Args:
+        years_to_maturity: Years until maturity
+        ytm: Yields to maturity as decimals (real yields for linkers)
+        inflation_rate: Fallback inflation rates as decimals
+        is_linker: Whether each bond is inflation-linked
+        linker_breakeven: Breakevens of the linkers as decimals, one per bond (ignored
+            for nominal bonds; NaN keeps the Fisher spread)
+
+    Returns:
+        Tuple (real yields, breakeven inflation rates) as decimals
+    """
+    years_to_maturity, ytm, inflation_rate, is_linker = np.broadcast_arrays(
+        np.asarray(years_to_maturity, dtype=float),
+        np.asarray(ytm, dtype=float),
+        np.asarray(inflation_rate, dtype=float),
+        np.asarray(is_linker, dtype=bool)
+    )
+    known = ~(np.isnan(years_to_maturity) | np.isnan(ytm))
+
+    def interpolate(mask: np.ndarray, values: np.ndarray) -> np.ndarray:
+        # Flat extrapolation beyond the shortest and longest bond of the subset
+        order = np.argsort(years_to_maturity[mask], kind="stable")
+        return np.interp(years_to_maturity, years_to_maturity[mask][order], values[mask][order])
+
+    nominal = known & ~is_linker
+    linker = known & is_linker
+
+    # Breakevens of the linkers against the nominal bonds
+    breakeven = inflation_rate.copy()
+    if nominal.any():
+        breakeven = np.where(is_linker, real_yield(interpolate(nominal, ytm), ytm), breakeven)
+    if linker_breakeven is not None:
+        linker_breakeven = np.broadcast_to(np.asarray(linker_breakeven, dtype=float), breakeven.shape)
+        breakeven = np.where(is_linker & ~np.isnan(linker_breakeven), linker_breakeven, breakeven)
+
+    # Breakevens of the nominal bonds from the linkers
+    if linker.any():
+        breakeven = np.where(is_linker, breakeven, interpolate(linker, breakeven))
+
+    real = np.where(is_linker, ytm, real_yield(ytm, breakeven))
+    return real, breakeven
+
 def calculate_duration(price: float, face_value: float, coupon_rate: float, 
                       ytm: float, years_to_maturity: float, frequency: int = 1) -> float:
     """
@@ -82,29 +679,12 @@ def calculate_duration(price: float, face_value: float, coupon_rate: float,
     Returns:
         Macaulay Duration in years
     """
-    n_payments = years_to_maturity * frequency
-    coupon_payment = face_value * coupon_rate / frequency
-    
-    # Calculate weighted present values
-    total_weighted_pv = 0
-    total_pv = 0
-    
-    for i in range(1, int(n_payments) + 1):
-        t = i / frequency  # Time in years
-        pv = coupon_payment / (1 + ytm / frequency) ** i
-        total_weighted_pv += t * pv
-        total_pv += pv
-    
-    # Add face value at maturity
-    t_maturity = n_payments / frequency
-    pv_face = face_value / (1 + ytm / frequency) ** n_payments
-    total_weighted_pv += t_maturity * pv_face
-    total_pv += pv_face
+    total_pv, weighted_pv, _ = _discounted_moments(face_value, coupon_rate, ytm, years_to_maturity, frequency)
     
     # Macaulay Duration
-    duration = total_weighted_pv / total_pv
+    duration = weighted_pv / total_pv
     
-    return duration
+    return float(duration)
 
 def calculate_modified_duration(macaulay_duration: float, ytm: float, frequency: int = 1) -> float:
     """
@@ -136,29 +716,210 @@ def calculate_convexity(price: float, face_value: float, coupon_rate: float,
     Returns:
         Convexity of the bond
     """
-    n_payments = years_to_maturity * frequency
-    coupon_payment = face_value * coupon_rate / frequency
+    total_pv, _, convexity_pv = _discounted_moments(face_value, coupon_rate, ytm, years_to_maturity, frequency)
     
-    total_weighted_pv = 0
-    total_pv = 0
+    # Convexity formula
+    convexity = convexity_pv / (total_pv * (1 + ytm / frequency) ** 2)
     
-    for i in range(1, int(n_payments) + 1):
-        t = i / frequency  # Time in years
-        pv = coupon_payment / (1 + ytm / frequency) ** i
-        # For convexity, we use t * (t + 1) weighting
-        total_weighted_pv += t * (t + 1/frequency) * pv
-        total_pv += pv
+    return float(convexity)
+
+class BondAnalytics(NamedTuple):
+    """
+    All analytics of a bond (or, from analyze_bonds, arrays of bonds) in one record
     
-    # Add face value at maturity
-    t_maturity = n_payments / frequency
-    pv_face = face_value / (1 + ytm / frequency) ** n_payments
-    total_weighted_pv += t_maturity * (t_maturity + 1/frequency) * pv_face
-    total_pv += pv_face
+    Attributes:
+        ytm: Yield to Maturity as a decimal
+        real_yield: Real yield (Fisher) as a decimal
+        duration: Macaulay Duration in years
+        modified_duration: Modified Duration
+        convexity: Convexity
+        dv01: Price change for a 1 basis point drop in yield, in currency units
+    """
+    ytm: Union[float, np.ndarray]
+    real_yield: Union[float, np.ndarray]
+    duration: Union[float, np.ndarray]
+    modified_duration: Union[float, np.ndarray]
+    convexity: Union[float, np.ndarray]
+    dv01: Union[float, np.ndarray]
+
+def _analytics_from_yield(ytm: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                          years_to_maturity: np.ndarray, frequency: np.ndarray,
+                          inflation_rate: np.ndarray) -> BondAnalytics:
+    """
+    Derive all metrics from one shared set of discounted cash-flow moments
+    """
+    total_pv, weighted_pv, convexity_pv = _discounted_moments(
+        face_value, coupon_rate, ytm, years_to_maturity, frequency
+    )
+    growth = 1 + ytm / frequency
     
-    # Convexity formula
-    convexity = total_weighted_pv / (total_pv * (1 + ytm / frequency) ** 2)
+    duration = weighted_pv / total_pv
+    modified_duration = duration / growth
+    convexity = convexity_pv / (total_pv * growth ** 2)
+    dv01 = weighted_pv / growth * 1e-4
+    
+    return BondAnalytics(
+        ytm=ytm,
+        real_yield=real_yield(ytm, inflation_rate),
+        duration=duration,
+        modified_duration=modified_duration,
+        convexity=convexity,
+        dv01=dv01
+    )
+
+# Inputs are rounded to these decimals before they are used as cache keys, so
+# floating-point noise from the data editor does not defeat the cache
+_CACHE_PRICE_DECIMALS = 6
+_CACHE_RATE_DECIMALS = 10
+
+# Process-wide cache in front of analyze_bond and analyze_bonds(use_cache=True)
+_analytics_cache = LRUCache(maxsize=10000)
+
+def configure_analytics_cache(maxsize: int) -> None:
+    """
+    Set the maximum number of entries of the process-wide analytics cache
+    
+    Args:
+        maxsize: Maximum number of cached bonds; 0 disables caching
+    """
+    _analytics_cache.resize(maxsize)
+
+def clear_analytics_cache() -> None:
+    """
+    Drop all entries of the process-wide analytics cache
+    """
+    _analytics_cache.invalidate()
+
+def get_analytics_cache_stats() -> Dict[str, Union[int, float]]:
+    """
+    Get size, hit, miss and eviction counters of the process-wide analytics cache
+    """
+    return _analytics_cache.stats()
+
+def _analytics_cache_key(price: float, face_value: float, coupon_rate: float, years_to_maturity: float,
+                         frequency: int, inflation_rate: float) -> Tuple:
+    """
+    Quantized cache key for analyze_bond inputs
+    """
+    return (
+        round(float(price), _CACHE_PRICE_DECIMALS),
+        round(float(face_value), _CACHE_PRICE_DECIMALS),
+        round(float(coupon_rate), _CACHE_RATE_DECIMALS),
+        round(float(years_to_maturity), _CACHE_RATE_DECIMALS),
+        int(frequency),
+        round(float(inflation_rate), _CACHE_RATE_DECIMALS)
+    )
+
+def analyze_bond(price: float, face_value: float, coupon_rate: float, years_to_maturity: float,
+                 frequency: int = 1, inflation_rate: float = 0.0, use_cache: bool = True) -> BondAnalytics:
+    """
+    Calculate YTM, real yield, duration, modified duration, convexity and DV01 in one call
+    
+    Equivalent to calling calculate_ytm, real_yield, calculate_duration,
+    calculate_modified_duration and calculate_convexity in turn, but the discounted
+    cash flows are evaluated only once. Results are memoized on quantized inputs in a
+    bounded LRU cache (see configure_analytics_cache and get_analytics_cache_stats).
+    
+    Args:
+        price: Current market price of the bond
+        face_value: Face value (par value) of the bond
+        coupon_rate: Annual coupon rate as a decimal (e.g., 0.05 for 5%)
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequency per year (default: 1 for annual)
+        inflation_rate: Inflation rate as a decimal (e.g., 0.02 for 2%)
+        use_cache: Look up and store the result in the process-wide analytics cache
+        
+    Returns:
+        BondAnalytics record with float fields, all NaN if the yield cannot be solved
+    """
+    if use_cache:
+        key = _analytics_cache_key(price, face_value, coupon_rate, years_to_maturity, frequency, inflation_rate)
+        cached = _analytics_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    result = solve_ytm(price, face_value, coupon_rate, years_to_maturity, frequency)
+    ytm = result.ytm if result.converged else math.nan
+    analytics = _analytics_from_yield(ytm, face_value, coupon_rate, years_to_maturity, frequency, inflation_rate)
+    analytics = BondAnalytics(*(float(value) for value in analytics))
+    
+    if use_cache:
+        _analytics_cache.put(key, analytics)
+    return analytics
+
+def analyze_bonds(price: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                  years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1,
+                  inflation_rate: Union[float, np.ndarray] = 0.0,
+                  dtype: Union[str, type, np.dtype] = np.float64, use_cache: bool = False) -> BondAnalytics:
+    """
+    Vectorized analyze_bond for whole arrays of bonds
+    
+    Bonds that calculate_ytm_batch cannot solve get NaN in every field.
     
-    return convexity
+    With dtype=np.float32 all inputs, temporaries and results are single precision,
+    which halves memory and memory traffic for large books. Measured against float64
+    on random bonds (coupons 0-10%, yields -1% to 15%, maturities 0.25-50 years,
+    frequencies 1/2/4/12; see tests/test_float32.py), the float32 results stayed
+    within:
+    
+    - YTM: 7e-7 absolute (< 0.01 bp)
+    - Duration, modified duration and DV01: 1.8e-6 relative
+    - Convexity: 1.1e-5 relative
+    
+    Maturities within float32 rounding (about 4e-6 years at 50 years) of a coupon
+    date can round to a different number of coupons and are not covered by these bounds.
+    
+    Args:
+        price: Current market prices of the bonds
+        face_value: Face values (par values) of the bonds
+        coupon_rate: Annual coupon rates as decimals
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequencies per year (default: 1 for annual)
+        inflation_rate: Inflation rates as decimals
+        dtype: Floating-point type of the computation and the results, float64 or float32
+        use_cache: Serve bonds from the process-wide analytics cache and solve only the
+            misses (float64 only; meant for books of up to a few thousand bonds)
+        
+    Returns:
+        BondAnalytics record whose fields are arrays in the broadcast shape of the inputs
+    """
+    dtype = _batch_dtype(dtype)
+    inputs = np.broadcast_arrays(
+        *(np.asarray(a, dtype=dtype) for a in (price, face_value, coupon_rate, years_to_maturity, frequency, inflation_rate))
+    )
+    if use_cache and dtype == np.float64:
+        return _cached_analyze_bonds(*inputs)
+    return _analyze_bonds(*inputs, dtype=dtype)
+
+def _analyze_bonds(price: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                   years_to_maturity: np.ndarray, frequency: np.ndarray, inflation_rate: np.ndarray,
+                   dtype: np.dtype = np.dtype(np.float64)) -> BondAnalytics:
+    """
+    Uncached analyze_bonds on arrays that are already broadcast to one shape
+    """
+    ytm, converged = calculate_ytm_batch(price, face_value, coupon_rate, years_to_maturity, frequency, dtype=dtype)
+    ytm[~converged] = np.nan
+    return _analytics_from_yield(ytm, face_value, coupon_rate, years_to_maturity, frequency, inflation_rate)
+
+def _cached_analyze_bonds(*inputs: np.ndarray) -> BondAnalytics:
+    """
+    analyze_bonds through the process-wide analytics cache, solving all misses in one batch
+    """
+    shape = inputs[0].shape
+    rows = list(zip(*(a.ravel().tolist() for a in inputs)))
+    # Batch results are keyed apart from analyze_bond, whose solver has a tighter tolerance
+    keys = [("batch",) + _analytics_cache_key(*row) for row in rows]
+    results = [_analytics_cache.get(key) for key in keys]
+    
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        computed = _analyze_bonds(*(np.asarray(column) for column in zip(*(rows[i] for i in missing))))
+        for j, i in enumerate(missing):
+            results[i] = BondAnalytics(*(float(field[j]) for field in computed))
+            _analytics_cache.put(keys[i], results[i])
+    
+    fields = np.array(results, dtype=float).reshape(shape + (len(BondAnalytics._fields),))
+    return BondAnalytics(*np.moveaxis(fields, -1, 0))
 
 def get_price_impact(duration: float, convexity: float, yield_change: float) -> float:
     """
@@ -179,4 +940,130 @@ def get_price_impact(duration: float, convexity: float, yield_change: float) ->
     second_order = 0.5 * convexity * (yield_change ** 2)
     
     # Total price change as a percentage
-    return (first_order + second_order) * 100 
\ No newline at end of file
+    return (first_order + second_order) * 100
+
+def price_from_yield(ytm: Union[float, np.ndarray], face_value: Union[float, np.ndarray],
+                     coupon_rate: Union[float, np.ndarray], years_to_maturity: Union[float, np.ndarray],
+                     frequency: Union[int, np.ndarray] = 1,
+                     dtype: Union[str, type, np.dtype] = np.float64) -> Union[float, np.ndarray]:
+    """
+    Calculate bond prices from yields to maturity (inverse of calculate_ytm)
+    
+    Inputs broadcast against each other, so whole books can be priced in one call.
+    Any coupon frequency and negative yields are supported; zero yields need no
+    special case. Yields at or below -frequency (no valid discount factor) give NaN.
+    
+    Args:
+        ytm: Yield to Maturity as a decimal, compounded with the coupon frequency
+        face_value: Face value (par value) of the bond
+        coupon_rate: Annual coupon rate as a decimal
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequency per year
+        dtype: Floating-point type of the computation, float64 or float32
+        
+    Returns:
+        Bond price (float if all inputs are scalars, otherwise an array)
+    """
+    dtype = _batch_dtype(dtype)
+    price = _present_value(
+        np.asarray(face_value, dtype=dtype),
+        np.asarray(coupon_rate, dtype=dtype),
+        np.asarray(ytm, dtype=dtype),
+        np.asarray(years_to_maturity, dtype=dtype),
+        np.asarray(frequency, dtype=dtype)
+    )
+    return float(price) if np.ndim(price) == 0 else price
+
+# Number of prices evaluated per block in reprice_yield_shifts (keeps temporaries in cache)
+_GRID_BLOCK_ELEMENTS = 65536
+
+def reprice_yield_shifts(ytm: np.ndarray, yield_shifts: np.ndarray, face_value: np.ndarray,
+                         coupon_rate: np.ndarray, years_to_maturity: np.ndarray,
+                         frequency: Union[int, np.ndarray] = 1,
+                         dtype: Union[str, type, np.dtype] = np.float64) -> np.ndarray:
+    """
+    Full revaluation of many bonds across a grid of parallel yield shifts
+
+    Every bond is repriced exactly at ytm + shift for every shift, giving the same
+    prices as price_from_yield with no duration/convexity approximation.
+
+    Args:
+        ytm: Yields to maturity as decimals, one per bond
+        yield_shifts: Yield changes as decimals (e.g., np.linspace(-0.02, 0.02, 200))
+        face_value: Face values, one per bond or scalar
+        coupon_rate: Annual coupon rates as decimals
+        years_to_maturity: Years until maturity
+        frequency: Coupon payment frequencies per year
+        dtype: Floating-point type of the computation and the price grid, float64 or
+            float32 (half the memory for large grids)
+
+    Returns:
+        Prices of shape (shifts, bonds)
+    """
+    dtype = _batch_dtype(dtype)
+    ytm, face_value, coupon_rate, years_to_maturity, frequency = (
+        np.atleast_1d(a) for a in np.broadcast_arrays(
+            *(np.asarray(x, dtype=dtype) for x in (ytm, face_value, coupon_rate, years_to_maturity, frequency))
+        )
+    )
+    yield_shifts = np.asarray(yield_shifts, dtype=dtype).ravel()
+
+    # Per-bond constants of P = c * v^delta * (1 - v^m) / r + F * v^n with v = 1 / (1 + r)
+    n_payments = years_to_maturity * frequency
+    n_coupons, delta = _coupon_periods(n_payments)
+    coupon_payment = face_value * coupon_rate / frequency
+
+    # Evaluate in row blocks that fit in cache, reusing the temporaries in place
+    prices = np.empty((yield_shifts.size, ytm.size), dtype=dtype)
+    block = max(1, _GRID_BLOCK_ELEMENTS // max(ytm.size, 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, yield_shifts.size, block):
+            rate = np.add(ytm, yield_shifts[start:start + block, None])
+            rate /= frequency
+            log_growth = np.log1p(rate)
+
+            annuity = np.multiply(log_growth, -n_coupons)
+            np.expm1(annuity, out=annuity)
+            annuity /= rate
+            annuity *= -1
+            zero = rate == 0
+            if zero.any():
+                annuity[zero] = np.broadcast_to(n_coupons, annuity.shape)[zero]
+
+            # Stub: the coupons fall delta periods earlier than whole periods
+            stub = np.multiply(log_growth, -delta)
+            np.exp(stub, out=stub)
+            annuity *= stub
+
+            face = np.multiply(log_growth, -n_payments)
+            np.exp(face, out=face)
+            face *= face_value
+
+            annuity *= coupon_payment
+            np.add(annuity, face, out=prices[start:start + block])
+    return prices
+
+def get_exact_price_impact(ytm: float, face_value: float, coupon_rate: float, years_to_maturity: float,
+                           yield_change: Union[float, np.ndarray], frequency: int = 1) -> Union[float, np.ndarray]:
+    """
+    Calculate the price impact of a yield change by full revaluation
+
+    Exact counterpart of get_price_impact, which uses the duration/convexity
+    approximation.
+
+    Args:
+        ytm: Current Yield to Maturity as a decimal
+        face_value: Face value (par value) of the bond
+        coupon_rate: Annual coupon rate as a decimal
+        years_to_maturity: Years until bond maturity
+        yield_change: Change in yield in decimal (scalar or array)
+        frequency: Coupon payment frequency per year
+
+    Returns:
+        Percent price change (float for a scalar yield change)
+    """
+    prices = reprice_yield_shifts(
+        ytm, np.append(0.0, yield_change), face_value, coupon_rate, years_to_maturity, frequency
+    )[:, 0]
+    impact = (prices[1:] / prices[0] - 1) * 100
+    return float(impact[0]) if np.ndim(yield_change) == 0 else impact
@@ -0,0 +1,167 @@
+import numpy as np
+from scipy import sparse
+from typing import Dict, Optional, Tuple, Union
+
+from lru_cache import LRUCache
+
+# Payment times are rounded to this many decimals (in years) so that the same
+# date computed for different bonds lands on the same grid point
+_TIME_DECIMALS = 10
+
+# Discount factors per (curve, time grid), shared by all schedules in the process
+_discount_factor_cache = LRUCache(maxsize=256)
+
+def get_discount_factor_cache_stats() -> Dict[str, Union[int, float]]:
+    """
+    Get size, hit, miss and eviction counters of the discount-factor cache
+    """
+    return _discount_factor_cache.stats()
+
+def clear_discount_factor_cache() -> None:
+    """
+    Drop all cached discount-factor vectors
+    """
+    _discount_factor_cache.invalidate()
+
+class CashFlowSchedule:
+    """
+    Cash flows of a whole set of bonds as a sparse bonds x payment-times matrix
+
+    Payment dates are generated backwards from maturity in steps of 1/frequency, so a
+    fractional maturity such as 2.25 years with annual coupons yields payments at
+    0.25, 1.25 and 2.25 years: the stub is the (short) period until the first coupon,
+    which is paid in full. The columns of the matrix are the union of all payment
+    times of the book, so pricing against any discount curve is a single sparse
+    matrix-vector product.
+    """
+
+    def __init__(self, face_value: np.ndarray, coupon_rate: np.ndarray,
+                 years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1):
+        """
+        Args:
+            face_value: Face values (par values) of the bonds
+            coupon_rate: Annual coupon rates as decimals
+            years_to_maturity: Years until bond maturity
+            frequency: Coupon payment frequencies per year
+        """
+        face_value, coupon_rate, years_to_maturity, frequency = (
+            a.ravel() for a in np.broadcast_arrays(
+                np.asarray(face_value, dtype=float),
+                np.asarray(coupon_rate, dtype=float),
+                np.asarray(years_to_maturity, dtype=float),
+                np.asarray(frequency, dtype=float)
+            )
+        )
+        n_bonds = face_value.size
+
+        # Number of payment dates T - k/f > 0, k = 0, 1, ...; the small offset keeps
+        # maturities that are whole periods from gaining a payment at t = 0
+        n_payments = np.ceil(np.round(years_to_maturity * frequency, _TIME_DECIMALS)).astype(int)
+        n_payments = np.maximum(n_payments, 1)
+
+        rows = np.repeat(np.arange(n_bonds), n_payments)
+        starts = np.repeat(np.cumsum(n_payments) - n_payments, n_payments)
+        k = np.arange(rows.size) - starts
+
+        times = np.round(years_to_maturity[rows] - k / frequency[rows], _TIME_DECIMALS)
+        amounts = face_value[rows] * coupon_rate[rows] / frequency[rows]
+        amounts[k == 0] += face_value
+
+        self.times, columns = np.unique(times, return_inverse=True)
+        self.amounts = sparse.csr_matrix((amounts, (rows, columns)), shape=(n_bonds, self.times.size))
+        self.frequency = frequency
+        self.years_to_maturity = years_to_maturity
+        self.grid_key = hash(self.times.tobytes())
+
+        # Row index and time of every stored cash flow, for per-bond discounting
+        self._rows = np.repeat(np.arange(n_bonds), np.diff(self.amounts.indptr))
+        self._flow_times = self.times[self.amounts.indices]
+
+    @classmethod
+    def from_book(cls, book) -> "CashFlowSchedule":
+        """
+        Build the schedule for all bonds of a BondBook
+
+        Args:
+            book: BondBook (coupon in percent, as stored in the book)
+
+        Returns:
+            New CashFlowSchedule with rows in the book's maturity order
+        """
+        return cls(book["face_value"], book["coupon"] / 100, book["maturity"], book["frequency"])
+
+    def __len__(self) -> int:
+        return self.amounts.shape[0]
+
+    def cash_flows(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the payment times and amounts of one bond
+
+        Args:
+            index: Row of the bond
+
+        Returns:
+            Tuple (times in years, amounts)
+        """
+        row = self.amounts.getrow(index)
+        return self.times[row.indices], row.data
+
+    def discount_factors(self, curve) -> np.ndarray:
+        """
+        Discount factors of a curve on this schedule's time grid
+
+        Vectors are cached per (curve, time grid) when the curve has a cache_key
+        attribute identifying its parameters.
+
+        Args:
+            curve: Object with a discount_factors(times) method
+
+        Returns:
+            Discount factor for every column of the schedule
+        """
+        curve_key = getattr(curve, "cache_key", None)
+        if curve_key is None:
+            return np.asarray(curve.discount_factors(self.times), dtype=float)
+
+        key = (curve_key, self.grid_key, self.times.size)
+        factors = _discount_factor_cache.get(key)
+        if factors is None:
+            factors = np.asarray(curve.discount_factors(self.times), dtype=float)
+            factors.flags.writeable = False
+            _discount_factor_cache.put(key, factors)
+        return factors
+
+    def price(self, curve_or_factors) -> np.ndarray:
+        """
+        Price every bond off a discount curve with one sparse matrix-vector product
+
+        Args:
+            curve_or_factors: Curve object (see discount_factors) or a discount-factor
+                vector on the schedule's time grid
+
+        Returns:
+            Dirty price of every bond
+        """
+        if hasattr(curve_or_factors, "discount_factors"):
+            factors = self.discount_factors(curve_or_factors)
+        else:
+            factors = np.asarray(curve_or_factors, dtype=float)
+        return self.amounts @ factors
+
+    def price_at_yields(self, ytm: np.ndarray, frequency: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Price every bond at its own yield to maturity
+
+        Args:
+            ytm: Yield to Maturity per bond as a decimal
+            frequency: Compounding frequency per bond (default: the coupon frequency)
+
+        Returns:
+            Dirty price of every bond
+        """
+        if frequency is None:
+            frequency = self.frequency
+        ytm, frequency = np.broadcast_arrays(np.asarray(ytm, dtype=float), np.asarray(frequency, dtype=float))
+        periods = frequency[self._rows] * self._flow_times
+        present_values = self.amounts.data * np.exp(-periods * np.log1p(ytm[self._rows] / frequency[self._rows]))
+        return np.bincount(self._rows, weights=present_values, minlength=len(self))
@@ -0,0 +1,438 @@
+import numpy as np
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from scipy import optimize
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from bonds import calculate_ytm_batch
+from bond_book import BondBook
+from cashflows import CashFlowSchedule
+
+class Curve(ABC):
+    """
+    Base class for zero curves defined by a continuously compounded zero_rate(t)
+
+    Subclasses implement zero_rate and set cache_key to a hashable value that
+    identifies their parameters (used by the discount-factor cache in cashflows).
+    """
+
+    cache_key: Tuple = ()
+    name: str = ""
+
+    @abstractmethod
+    def zero_rate(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Continuously compounded zero rates at arbitrary times
+
+        Args:
+            times: Times in years
+
+        Returns:
+            Zero rates as decimals
+        """
+
+    def discount_factors(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Discount factors exp(-z(t) * t) at arbitrary times
+
+        Args:
+            times: Times in years
+
+        Returns:
+            Discount factors
+        """
+        times = np.asarray(times, dtype=float)
+        return np.exp(-self.zero_rate(times) * times)
+
+    def forward_rate(self, start: Union[float, np.ndarray], end: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Continuously compounded forward rates between two times
+
+        Args:
+            start: Start times in years
+            end: End times in years (greater than start)
+
+        Returns:
+            Forward rates as decimals
+        """
+        start = np.asarray(start, dtype=float)
+        end = np.asarray(end, dtype=float)
+        return (self.zero_rate(end) * end - self.zero_rate(start) * start) / (end - start)
+
+class ZeroCurve(Curve):
+    """
+    Zero-coupon curve with continuously compounded zero rates at knot times
+
+    Zero rates are interpolated linearly between knots and extrapolated flat.
+    Instances are immutable; cache_key identifies the curve for the discount-factor
+    cache in cashflows.
+    """
+
+    def __init__(self, times: np.ndarray, zero_rates: np.ndarray, name: str = ""):
+        """
+        Args:
+            times: Knot times in years, strictly increasing
+            zero_rates: Continuously compounded zero rates at the knots as decimals
+            name: Optional label, e.g. the country code
+        """
+        self.times = np.array(times, dtype=float)
+        self.zero_rates = np.array(zero_rates, dtype=float)
+        self.times.flags.writeable = False
+        self.zero_rates.flags.writeable = False
+        self.name = name
+        self.cache_key = ("zero", self.times.tobytes(), self.zero_rates.tobytes())
+
+    def zero_rate(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Continuously compounded zero rates at arbitrary times
+
+        Args:
+            times: Times in years
+
+        Returns:
+            Zero rates as decimals
+        """
+        return np.interp(times, self.times, self.zero_rates)
+
+    def shifted(self, shift: float) -> "ZeroCurve":
+        """
+        Parallel-shifted copy of the curve
+
+        Args:
+            shift: Shift of all zero rates as a decimal (e.g., 0.0001 for 1 bp)
+
+        Returns:
+            New ZeroCurve
+        """
+        return ZeroCurve(self.times, self.zero_rates + shift, self.name)
+
+    def __repr__(self) -> str:
+        return f"ZeroCurve({self.name!r}, {self.times.size} knots)"
+
+def _interpolation_weights(times: np.ndarray, knots: np.ndarray) -> np.ndarray:
+    """
+    Matrix W with W @ z = np.interp(times, knots, z) for any knot values z
+    """
+    weights = np.zeros((times.size, knots.size))
+    rows = np.arange(times.size)
+    if knots.size == 1:
+        weights[:, 0] = 1.0
+        return weights
+
+    clipped = np.clip(times, knots[0], knots[-1])
+    right = np.clip(np.searchsorted(knots, clipped, side="right"), 1, knots.size - 1)
+    left = right - 1
+    fraction = (clipped - knots[left]) / (knots[right] - knots[left])
+    weights[rows, left] = 1 - fraction
+    weights[rows, right] += fraction
+    return weights
+
+def bootstrap_zero_curve(price: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                         years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1,
+                         name: str = "", tol: float = 1e-12, maxiter: int = 20) -> ZeroCurve:
+    """
+    Bootstrap a zero curve that reprices a set of bonds
+
+    One zero rate is solved per distinct maturity. Rather than stepping through the
+    maturities one at a time, all knots are solved together with Newton's method on
+    the whole set: prices are one sparse matrix-vector product over the bonds' cash
+    flows and the Jacobian follows analytically from the interpolation weights.
+    Several bonds with the same maturity are fitted in the least-squares sense.
+
+    Args:
+        price: Dirty market prices of the bonds
+        face_value: Face values (par values) of the bonds
+        coupon_rate: Annual coupon rates as decimals
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequencies per year
+        name: Label for the curve
+        tol: Convergence tolerance on the zero rates
+        maxiter: Maximum number of Newton iterations
+
+    Returns:
+        ZeroCurve with knots at the bonds' maturities
+
+    Raises:
+        ValueError: If no bonds are given or the bootstrap does not converge
+    """
+    price, face_value, coupon_rate, years_to_maturity, frequency = (
+        a.ravel() for a in np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (price, face_value, coupon_rate, years_to_maturity, frequency))
+        )
+    )
+    if price.size == 0:
+        raise ValueError("Cannot bootstrap a curve without bonds")
+
+    schedule = CashFlowSchedule(face_value, coupon_rate, years_to_maturity, frequency)
+    knots, knot_index = np.unique(years_to_maturity, return_inverse=True)
+    weights = _interpolation_weights(schedule.times, knots)
+    times = schedule.times
+
+    # Start from each bond's yield, converted to continuous compounding
+    ytm, _ = calculate_ytm_batch(price, face_value, coupon_rate, years_to_maturity, frequency)
+    continuous = frequency * np.log1p(ytm / frequency)
+    zero_rates = np.bincount(knot_index, weights=continuous) / np.bincount(knot_index)
+
+    for _ in range(maxiter):
+        factors = np.exp(-(weights @ zero_rates) * times)
+        residual = price - schedule.price(factors)
+
+        # dP/dz_k = sum_j A_ij * (-t_j * DF_j) * W_jk
+        jacobian = schedule.amounts.multiply(-times * factors).tocsr() @ weights
+        step = np.linalg.lstsq(jacobian, residual, rcond=None)[0]
+        zero_rates = zero_rates + step
+
+        if not np.all(np.isfinite(zero_rates)):
+            break
+        if np.max(np.abs(step)) < tol:
+            return ZeroCurve(knots, zero_rates, name)
+
+    raise ValueError(f"Zero curve bootstrap for {name or 'bond set'} did not converge")
+
+def bootstrap_book(book: BondBook, name: str = "") -> ZeroCurve:
+    """
+    Bootstrap a nominal zero curve from the nominal bonds of a BondBook
+
+    Inflation-linked bonds are quoted in real terms and are left out.
+
+    Args:
+        book: BondBook with prices, coupons (in percent) and maturities
+        name: Label for the curve
+
+    Returns:
+        ZeroCurve
+    """
+    nominal = ~book.is_linker
+    return bootstrap_zero_curve(
+        book["price"][nominal], book["face_value"][nominal], book["coupon"][nominal] / 100,
+        book["maturity"][nominal], book["frequency"][nominal], name
+    )
+
+def bootstrap_country_curves(predefined_bonds: Dict[str, Dict[str, Any]]) -> Dict[str, ZeroCurve]:
+    """
+    Bootstrap one zero curve per country from data in the predefined_bonds.json format
+
+    Args:
+        predefined_bonds: Dictionary with country codes as keys and 'bonds' lists
+
+    Returns:
+        Dictionary with country codes as keys and ZeroCurve values; countries without
+        bonds or whose bootstrap fails are left out
+    """
+    curves = {}
+    for country, country_data in predefined_bonds.items():
+        bonds = country_data.get("bonds", [])
+        if not bonds:
+            continue
+        try:
+            curves[country] = bootstrap_book(BondBook.from_market_data(bonds), name=country)
+        except ValueError:
+            continue
+    return curves
+
+def _nss_loadings(times: np.ndarray, tau1: float, tau2: float) -> Tuple[np.ndarray, ...]:
+    """
+    Nelson-Siegel-Svensson factor loadings and their derivatives with respect to tau
+
+    Returns:
+        Tuple (slope, curvature1, curvature2, d slope/d tau1, d curvature1/d tau1,
+        d curvature2/d tau2) evaluated at times
+    """
+    loadings = []
+    for tau in (tau1, tau2):
+        x = np.maximum(times, 1e-12) / tau
+        decay = np.exp(-x)
+        level = -np.expm1(-x) / x
+        # dL/dx = (e^-x (1 + x) - 1) / x^2 and dx/dtau = -x / tau
+        d_level = (decay * (1 + x) - 1) / x ** 2 * (-x / tau)
+        loadings.append((level, level - decay, d_level, d_level - decay * x / tau))
+
+    (level1, hump1, d_level1, d_hump1), (_, hump2, _, d_hump2) = loadings
+    return level1, hump1, hump2, d_level1, d_hump1, d_hump2
+
+class NelsonSiegelSvenssonCurve(Curve):
+    """
+    Parametric Nelson-Siegel-Svensson zero curve
+
+    z(t) = b0 + b1 * L1(t) + b2 * (L1(t) - exp(-t/tau1)) + b3 * (L2(t) - exp(-t/tau2))
+    with L(t) = (1 - exp(-t/tau)) / (t/tau), continuously compounded.
+    """
+
+    def __init__(self, params: Sequence[float], name: str = ""):
+        """
+        Args:
+            params: (b0, b1, b2, b3, tau1, tau2)
+            name: Optional label, e.g. the country code
+        """
+        self.params = tuple(float(p) for p in params)
+        self.name = name
+        self.cache_key = ("nss",) + self.params
+
+    def zero_rate(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Continuously compounded zero rates at arbitrary times
+
+        Args:
+            times: Times in years
+
+        Returns:
+            Zero rates as decimals
+        """
+        b0, b1, b2, b3, tau1, tau2 = self.params
+        level1, hump1, hump2 = _nss_loadings(np.asarray(times, dtype=float), tau1, tau2)[:3]
+        return b0 + b1 * level1 + b2 * hump1 + b3 * hump2
+
+    def __repr__(self) -> str:
+        return f"NelsonSiegelSvenssonCurve({self.name!r}, params={self.params})"
+
+def _nss_jacobian(params: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    Analytic Jacobian of the NSS zero rates with respect to (b0, b1, b2, b3, tau1, tau2)
+    """
+    _, b1, b2, b3, tau1, tau2 = params
+    level1, hump1, hump2, d_level1, d_hump1, d_hump2 = _nss_loadings(times, tau1, tau2)
+    return np.column_stack([
+        np.ones_like(times),
+        level1,
+        hump1,
+        hump2,
+        b1 * d_level1 + b2 * d_hump1,
+        b3 * d_hump2
+    ])
+
+class NSSFit(NamedTuple):
+    """
+    Result of fitting a Nelson-Siegel-Svensson curve
+
+    Attributes:
+        curve: Fitted curve
+        rmse: Root mean squared yield error as a decimal
+        success: Whether the optimizer reported convergence
+        evaluations: Number of residual evaluations
+        fit_time: Wall-clock time of the fit in seconds
+    """
+    curve: NelsonSiegelSvenssonCurve
+    rmse: float
+    success: bool
+    evaluations: int
+    fit_time: float
+
+# Bounds for (b0, b1, b2, b3, tau1, tau2); the decay times are kept apart so the
+# two humps stay identifiable
+_NSS_LOWER = np.array([-0.2, -0.5, -1.0, -1.0, 0.05, 2.0])
+_NSS_UPPER = np.array([0.5, 0.5, 1.0, 1.0, 5.0, 30.0])
+
+def _nss_initial_guess(maturities: np.ndarray, yields: np.ndarray) -> np.ndarray:
+    """
+    Heuristic starting point: level from the longest and slope from the shortest yield
+    """
+    order = np.argsort(maturities)
+    long_rate, short_rate = yields[order[-1]], yields[order[0]]
+    return np.array([long_rate, short_rate - long_rate, 0.0, 0.0, 1.5, 10.0])
+
+def fit_nss(maturities: np.ndarray, yields: np.ndarray, initial: Optional[Sequence[float]] = None,
+            name: str = "") -> NSSFit:
+    """
+    Fit a Nelson-Siegel-Svensson curve to observed zero rates or yields
+
+    Uses scipy.optimize.least_squares with the analytic Jacobian of the NSS rates.
+
+    Args:
+        maturities: Times in years
+        yields: Continuously compounded yields as decimals
+        initial: Starting parameters, e.g. the previous date's fit (default: heuristic)
+        name: Label for the curve
+
+    Returns:
+        NSSFit with the curve, fit quality and fit time
+    """
+    maturities = np.asarray(maturities, dtype=float)
+    yields = np.asarray(yields, dtype=float)
+    start_time = time.perf_counter()
+
+    if initial is None:
+        initial = _nss_initial_guess(maturities, yields)
+    initial = np.clip(np.asarray(initial, dtype=float), _NSS_LOWER, _NSS_UPPER)
+
+    def residuals(params):
+        return NelsonSiegelSvenssonCurve(params).zero_rate(maturities) - yields
+
+    result = optimize.least_squares(
+        residuals, initial, jac=lambda params: _nss_jacobian(params, maturities),
+        bounds=(_NSS_LOWER, _NSS_UPPER), method="trf", x_scale="jac"
+    )
+
+    return NSSFit(
+        curve=NelsonSiegelSvenssonCurve(result.x, name),
+        rmse=float(np.sqrt(np.mean(result.fun ** 2))),
+        success=bool(result.success),
+        evaluations=int(result.nfev),
+        fit_time=time.perf_counter() - start_time
+    )
+
+def nss_inputs_from_book(book: BondBook) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Maturities and continuously compounded yields of a BondBook for fit_nss
+
+    Uses the book's YTM column where it is filled and solves the rest.
+
+    Args:
+        book: BondBook
+
+    Returns:
+        Tuple (maturities, yields)
+    """
+    frequency = book["frequency"]
+    ytm = book["ytm"] / 100
+    missing = np.isnan(ytm)
+    if missing.any():
+        solved, _ = calculate_ytm_batch(
+            book["price"], book["face_value"], book["coupon"] / 100, book["maturity"], frequency
+        )
+        ytm = np.where(missing, solved, ytm)
+    return np.array(book["maturity"]), frequency * np.log1p(ytm / frequency)
+
+def _fit_nss_sequence(snapshots: Sequence[Tuple[np.ndarray, np.ndarray]],
+                      initial: Optional[Sequence[float]]) -> List[NSSFit]:
+    """
+    Fit snapshots in order, warm-starting each fit from the previous parameters
+    """
+    fits = []
+    for maturities, yields in snapshots:
+        fit = fit_nss(maturities, yields, initial)
+        fits.append(fit)
+        if fit.success:
+            initial = fit.curve.params
+    return fits
+
+def fit_nss_history(snapshots: Sequence[Tuple[np.ndarray, np.ndarray]],
+                    initial: Optional[Sequence[float]] = None,
+                    max_workers: Optional[int] = None) -> List[NSSFit]:
+    """
+    Fit one Nelson-Siegel-Svensson curve per snapshot (e.g. per historical date)
+
+    Snapshots are fitted in order and each fit starts from the previous date's
+    parameters. With max_workers > 1 the dates are split into contiguous chunks that
+    are fitted in a process pool; warm starts then run within each chunk.
+
+    Args:
+        snapshots: Sequence of (maturities, continuously compounded yields) per date
+        initial: Starting parameters for the first date (default: heuristic)
+        max_workers: Number of worker processes (default: fit in this process)
+
+    Returns:
+        List of NSSFit in snapshot order, each with its own fit_time
+    """
+    snapshots = list(snapshots)
+    if not max_workers or max_workers <= 1 or len(snapshots) < 2:
+        return _fit_nss_sequence(snapshots, initial)
+
+    max_workers = min(max_workers, len(snapshots), os.cpu_count() or 1)
+    bounds = np.linspace(0, len(snapshots), max_workers + 1).astype(int)
+    chunks = [snapshots[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_fit_nss_sequence, chunks, [initial] * len(chunks))
+        return [fit for chunk_fits in results for fit in chunk_fits]
@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+class CacheEntry(NamedTuple):
+    """
+    One cached snapshot of a data source
+
+    Attributes:
+        data: Cached payload (JSON-serializable)
+        timestamp: Time the snapshot was fetched or last revalidated (time.time())
+        validators: HTTP validators of the response ("etag", "last_modified")
+    """
+    data: Any
+    timestamp: float
+    validators: Dict[str, str]
+
+    def age(self, now: Optional[float] = None) -> float:
+        """
+        Seconds since the snapshot was fetched or revalidated
+        """
+        return (time.time() if now is None else now) - self.timestamp
+
+class MarketDataCache:
+    """
+    Two-tier cache for fetched market data: an in-process LRU in front of JSON files
+
+    Each source (e.g. "us_treasury_data") maps to one file in the cache directory.
+    Lookups hit the memory tier first and only read and parse the file on a memory
+    miss. Writes go to a temporary file that is renamed over the old one, so a
+    crash or a concurrent reader never sees a partial file. Missing, empty or
+    corrupt files count as misses. Every source has its own time to live.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 3600, memory_size: int = 32):
+        """
+        Args:
+            directory: Directory of the cache files (created if missing)
+            ttls: Time to live in seconds per source
+            default_ttl: Time to live of sources without an entry in ttls
+            memory_size: Maximum number of entries in the memory tier
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._memory = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.corrupt = 0
+        self.writes = 0
+        self.write_errors = 0
+        # Snapshot time of every source loaded or stored in this process
+        self._timestamps: Dict[str, float] = {}
+
+    def path(self, source: str) -> Path:
+        """
+        File of a source in the cache directory
+        """
+        return self.directory / f"{source}.json"
+
+    def ttl(self, source: str) -> float:
+        """
+        Time to live of a source in seconds
+        """
+        return self.ttls.get(source, self.default_ttl)
+
+    def is_fresh(self, source: str, entry: Optional[CacheEntry]) -> bool:
+        """
+        Check whether an entry of a source is younger than the source's time to live
+        """
+        return entry is not None and entry.age() < self.ttl(source)
+
+    def _read(self, source: str) -> Optional[CacheEntry]:
+        """
+        Load an entry from disk; missing, empty or malformed files give None
+        """
+        path = self.path(source)
+        try:
+            with open(path, "r") as f:
+                raw = json.load(f)
+            return CacheEntry(
+                data=raw["data"],
+                timestamp=float(raw["timestamp"]),
+                validators={key: raw[key] for key in ("etag", "last_modified") if raw.get(key)}
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.corrupt += 1
+            logger.warning(f"Ignoring unreadable cache file {path.name}: {e}")
+            return None
+
+    def get(self, source: str) -> Optional[CacheEntry]:
+        """
+        Latest snapshot of a source, however old
+
+        Args:
+            source: Source name
+
+        Returns:
+            CacheEntry, or None if nothing usable is cached
+        """
+        entry = self._memory.get((source,))
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._read(source)
+            if entry is None:
+                self.disk_misses += 1
+                return None
+            self.disk_hits += 1
+            self._timestamps[source] = entry.timestamp
+        self._memory.put((source,), entry)
+        return entry
+
+    def get_fresh(self, source: str) -> Optional[CacheEntry]:
+        """
+        Snapshot of a source if it is within the source's time to live
+
+        Args:
+            source: Source name
+
+        Returns:
+            CacheEntry, or None if nothing or only an expired snapshot is cached
+        """
+        entry = self.get(source)
+        return entry if self.is_fresh(source, entry) else None
+
+    def put(self, source: str, data: Any, validators: Optional[Dict[str, str]] = None,
+            timestamp: Optional[float] = None) -> CacheEntry:
+        """
+        Store a snapshot in memory and on disk
+
+        A failed disk write is logged and counted; the snapshot stays in memory.
+
+        Args:
+            source: Source name
+            data: JSON-serializable payload
+            validators: HTTP validators of the response ("etag", "last_modified")
+            timestamp: Fetch time (default: now)
+
+        Returns:
+            The stored CacheEntry
+        """
+        entry = CacheEntry(data=data, timestamp=time.time() if timestamp is None else timestamp,
+                           validators=dict(validators or {}))
+        self._memory.put((source,), entry)
+
+        with self._lock:
+            self._timestamps[source] = entry.timestamp
+            temp_name = None
+            try:
+                with tempfile.NamedTemporaryFile("w", dir=self.directory, prefix=f".{source}.",
+                                                 suffix=".tmp", delete=False) as f:
+                    temp_name = f.name
+                    json.dump({"timestamp": entry.timestamp, "data": entry.data, **entry.validators}, f)
+                os.replace(temp_name, self.path(source))
+                self.writes += 1
+            except (OSError, TypeError, ValueError) as e:
+                self.write_errors += 1
+                logger.error(f"Error writing cache file {self.path(source).name}: {e}")
+                if temp_name is not None and os.path.exists(temp_name):
+                    os.unlink(temp_name)
+        return entry
+
+    def touch(self, source: str) -> Optional[CacheEntry]:
+        """
+        Restart the time to live of a snapshot (e.g. after an HTTP 304)
+
+        Args:
+            source: Source name
+
+        Returns:
+            The revalidated CacheEntry, or None if nothing is cached
+        """
+        entry = self.get(source)
+        if entry is None:
+            return None
+        return self.put(source, entry.data, entry.validators)
+
+    def invalidate(self, source: Optional[str] = None) -> None:
+        """
+        Drop one source, or all sources if none is given, from both tiers
+
+        Args:
+            source: Source name (default: every cache file in the directory)
+        """
+        with self._lock:
+            paths = [self.path(source)] if source is not None else list(self.directory.glob("*.json"))
+            self._memory.invalidate(None if source is None else (source,))
+            if source is None:
+                self._timestamps.clear()
+            else:
+                self._timestamps.pop(source, None)
+            for path in paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit, miss and write counters of both tiers and the age of every cached source
+
+        Returns:
+            Dictionary with "memory" (LRU counters), disk counters and "ages"
+            (source -> seconds since fetch, for sources loaded or stored in this process)
+        """
+        now = time.time()
+        with self._lock:
+            ages = {source: now - timestamp for source, timestamp in sorted(self._timestamps.items())}
+        return {
+            "memory": self._memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "corrupt": self.corrupt,
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "ages": ages
+        }
+
+    def __repr__(self) -> str:
+        return f"MarketDataCache({self.directory}, {self._memory.stats()['size']} in memory)"
@@ -0,0 +1,368 @@
+import datetime
+import os
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from bond_book import BondBook
+
+# Column -> dtype of the history files; one raw binary file per column and country
+HISTORY_COLUMNS = {
+    "date": np.dtype("datetime64[D]"),
+    "tenor": np.dtype("f8"),
+    "linker": np.dtype("?"),
+    "ytm": np.dtype("f8"),
+    "real_yield": np.dtype("f8"),
+    "breakeven": np.dtype("f8"),
+    "price": np.dtype("f8"),
+    "coupon": np.dtype("f8"),
+}
+
+# Tenors closer than this (in years) are the same tenor in queries
+_TENOR_TOLERANCE = 1e-6
+
+DateLike = Union[str, datetime.date, np.datetime64]
+
+class YieldHistory(NamedTuple):
+    """
+    Observations of one country, sorted by date, linker flag and tenor
+
+    Attributes:
+        date: Observation dates (datetime64[D])
+        tenor: Years to maturity of the bond
+        linker: True for inflation-linked bonds
+        ytm: Yield to maturity in percent
+        real_yield: Real yield in percent
+        breakeven: Breakeven inflation in percent
+        price: Market price
+        coupon: Coupon in percent
+    """
+    date: np.ndarray
+    tenor: np.ndarray
+    linker: np.ndarray
+    ytm: np.ndarray
+    real_yield: np.ndarray
+    breakeven: np.ndarray
+    price: np.ndarray
+    coupon: np.ndarray
+
+def _as_date(value: Optional[DateLike]) -> Optional[np.datetime64]:
+    """
+    Day-precision datetime64 of a date, ISO string or datetime64 (None stays None)
+    """
+    return None if value is None else np.datetime64(value, "D")
+
+class HistoryStore:
+    """
+    Append-only columnar store of fetched yield curves, keyed by country and date
+
+    Each country has a directory with one raw binary file per column
+    (HISTORY_COLUMNS). Rows are only ever appended, in non-decreasing date order,
+    so a date range is located by binary search on the memory-mapped date column
+    and only the rows inside it are read; years of daily curves across many
+    tenors stay cheap to query. A country may be recorded several times a day;
+    queries return the latest observation per date and bond, and a curve
+    identical to the latest one of the same day is not written again.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Args:
+            directory: Root directory of the history files (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _column_path(self, country: str, column: str) -> Path:
+        """
+        File of one column of a country
+        """
+        if not country.isalnum():
+            raise ValueError(f"Invalid country code: {country!r}")
+        return self.directory / country / f"{column}.bin"
+
+    def _lengths(self, country: str) -> Dict[str, int]:
+        """
+        Number of complete rows in every column file of a country
+        """
+        lengths = {}
+        for column, dtype in HISTORY_COLUMNS.items():
+            path = self._column_path(country, column)
+            lengths[column] = path.stat().st_size // dtype.itemsize if path.exists() else 0
+        return lengths
+
+    def countries(self) -> List[str]:
+        """
+        Country codes with recorded history
+        """
+        return sorted(path.name for path in self.directory.iterdir() if path.is_dir() and self.count(path.name))
+
+    def count(self, country: str) -> int:
+        """
+        Number of stored rows of a country (including superseded same-day rows)
+        """
+        # An append interrupted between two column files leaves them uneven; the
+        # rows present in every column are the valid ones
+        return min(self._lengths(country).values())
+
+    def _column(self, country: str, column: str, length: int) -> np.ndarray:
+        """
+        Read-only memory map of the first `length` rows of a column
+        """
+        dtype = HISTORY_COLUMNS[column]
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._column_path(country, column), dtype=dtype, mode="r", shape=(length,))
+
+    def append(self, country: str, date: DateLike, tenor: np.ndarray, ytm: np.ndarray,
+               real_yield: np.ndarray, breakeven: Optional[np.ndarray] = None,
+               price: Optional[np.ndarray] = None, coupon: Optional[np.ndarray] = None,
+               linker: Optional[np.ndarray] = None) -> int:
+        """
+        Append the curve of one country observed on one date
+
+        Args:
+            country: Country code
+            date: Observation date; must not be before the country's last recorded date
+            tenor: Years to maturity per bond
+            ytm: Yields to maturity in percent
+            real_yield: Real yields in percent
+            breakeven: Breakeven inflation in percent (default: NaN)
+            price: Market prices (default: NaN)
+            coupon: Coupons in percent (default: NaN)
+            linker: Inflation-linked flags (default: all False)
+
+        Returns:
+            Number of rows written (0 if the curve equals the latest one of that date)
+
+        Raises:
+            ValueError: If the date lies before the last recorded date of the country
+        """
+        date = _as_date(date)
+        tenor = np.atleast_1d(np.asarray(tenor, dtype=float))
+        n_rows = tenor.size
+        values = {
+            "tenor": tenor,
+            "linker": np.zeros(n_rows, dtype=bool) if linker is None else linker,
+            "ytm": ytm,
+            "real_yield": real_yield,
+            "breakeven": np.nan if breakeven is None else breakeven,
+            "price": np.nan if price is None else price,
+            "coupon": np.nan if coupon is None else coupon,
+        }
+        rows = {
+            column: np.broadcast_to(np.asarray(value, dtype=HISTORY_COLUMNS[column]), n_rows)
+            for column, value in values.items()
+        }
+        rows["date"] = np.full(n_rows, date, dtype=HISTORY_COLUMNS["date"])
+        if n_rows == 0:
+            return 0
+
+        with self._lock:
+            length = self.count(country)
+            if length:
+                last_date = self._column(country, "date", length)[-1]
+                if date < last_date:
+                    raise ValueError(f"History of {country} is append-only: {date} is before {last_date}")
+                if date == last_date and self._is_latest_curve(country, date, rows, length):
+                    return 0
+
+            self._column_path(country, "date").parent.mkdir(parents=True, exist_ok=True)
+            for column, dtype in HISTORY_COLUMNS.items():
+                path = self._column_path(country, column)
+                with open(path, "ab") as f:
+                    # Drop a partial row left by an interrupted append
+                    f.truncate(length * dtype.itemsize)
+                    f.write(np.ascontiguousarray(rows[column]).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+        return n_rows
+
+    def _is_latest_curve(self, country: str, date: np.datetime64, rows: Dict[str, np.ndarray],
+                         length: int) -> bool:
+        """
+        Check whether rows equal the last rows stored for the country on that date
+
+        The raw rows are compared rather than a query, which keeps only one bond per
+        tenor, so curves with several bonds of the same maturity are matched too.
+        """
+        n_rows = len(rows["date"])
+        if length < n_rows:
+            return False
+        stored = {
+            column: np.array(self._column(country, column, length)[length - n_rows:])
+            for column in HISTORY_COLUMNS
+        }
+        if not (stored["date"] == date).all():
+            return False
+
+        # Compare in a canonical row order that does not depend on the input order
+        def canonical(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+            order = np.lexsort([columns[column] for column in reversed(HISTORY_COLUMNS)])
+            return {column: values[order] for column, values in columns.items()}
+
+        stored, rows = canonical(stored), canonical(rows)
+        return all(
+            np.array_equal(stored[column], rows[column], equal_nan=column not in ("date", "linker"))
+            for column in HISTORY_COLUMNS
+        )
+
+    def record(self, country: str, bonds: List[Dict[str, Any]], date: Optional[DateLike] = None) -> int:
+        """
+        Append fetched market data (bond dictionaries as in predefined_bonds.json)
+
+        Yields, real yields and breakevens are computed with BondBook.analyze.
+
+        Args:
+            country: Country code
+            bonds: Bond dictionaries with keys like "years_to_maturity" and "price"
+            date: Observation date (default: today)
+
+        Returns:
+            Number of rows written
+        """
+        book = BondBook.from_market_data(bonds).analyze()
+        return self.append(
+            country,
+            datetime.date.today() if date is None else date,
+            tenor=book["maturity"],
+            ytm=book["ytm"],
+            real_yield=book["real_yield"],
+            breakeven=book["breakeven"],
+            price=book["price"],
+            coupon=book["coupon"],
+            linker=book.is_linker
+        )
+
+    def query(self, country: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+              tenors: Optional[Sequence[float]] = None, linker: Optional[bool] = None) -> YieldHistory:
+        """
+        Observations of a country in a date range
+
+        Only the rows between start and end are read from the memory maps. Of
+        several observations of the same bond on the same date, the latest wins.
+
+        Args:
+            country: Country code
+            start: First date (inclusive, default: first recorded date)
+            end: Last date (inclusive, default: last recorded date)
+            tenors: Years to maturity to return (default: all)
+            linker: Only linkers (True) or only nominal bonds (False) (default: both)
+
+        Returns:
+            YieldHistory sorted by date, linker flag and tenor
+        """
+        length = self.count(country)
+        dates = self._column(country, "date", length)
+        lo = 0 if start is None else int(np.searchsorted(dates, _as_date(start), side="left"))
+        hi = length if end is None else int(np.searchsorted(dates, _as_date(end), side="right"))
+        hi = max(lo, hi)
+        columns = {column: np.array(self._column(country, column, length)[lo:hi]) for column in HISTORY_COLUMNS}
+
+        mask = np.ones(hi - lo, dtype=bool)
+        if tenors is not None:
+            tenors = np.asarray(tenors, dtype=float).ravel()
+            mask &= (np.abs(columns["tenor"][:, None] - tenors[None, :]) <= _TENOR_TOLERANCE).any(axis=1)
+        if linker is not None:
+            mask &= columns["linker"] == linker
+        columns = {column: values[mask] for column, values in columns.items()}
+
+        # Sort by (date, linker, tenor, row) and keep the last row of every group
+        n_rows = mask.sum()
+        order = np.lexsort((np.arange(n_rows), columns["tenor"], columns["linker"], columns["date"]))
+        columns = {column: values[order] for column, values in columns.items()}
+        keep = np.ones(n_rows, dtype=bool)
+        keep[:-1] = (
+            (columns["date"][1:] != columns["date"][:-1])
+            | (columns["linker"][1:] != columns["linker"][:-1])
+            | (np.abs(columns["tenor"][1:] - columns["tenor"][:-1]) > _TENOR_TOLERANCE)
+        )
+        return YieldHistory(**{column: values[keep] for column, values in columns.items()})
+
+    def tenors(self, country: str, linker: bool = False) -> np.ndarray:
+        """
+        Distinct tenors recorded for a country
+
+        Args:
+            country: Country code
+            linker: Tenors of linkers instead of nominal bonds
+
+        Returns:
+            Sorted tenors in years
+        """
+        length = self.count(country)
+        tenor = np.array(self._column(country, "tenor", length))
+        tenor = np.sort(tenor[self._column(country, "linker", length) == linker])
+        if tenor.size == 0:
+            return tenor
+        return tenor[np.r_[True, np.diff(tenor) > _TENOR_TOLERANCE]]
+
+    def historical_yields(self, countries: Sequence[str], tenor: Optional[float] = None,
+                          start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+                          metric: str = "ytm") -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Yield histories in the format of plots.plot_historical_yields
+
+        Args:
+            countries: Country codes
+            tenor: Years to maturity to return (default: all)
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            metric: Column plotted as "yield" ("ytm", "real_yield" or "breakeven")
+
+        Returns:
+            Dictionary country code -> list of {"date", "name" (e.g. "10-Year"), "yield"}
+            of the nominal bonds
+        """
+        historical_data = {}
+        for country in countries:
+            history = self.query(country, start, end, None if tenor is None else [tenor], linker=False)
+            dates = np.datetime_as_string(history.date)
+            values = getattr(history, metric)
+            historical_data[country] = [
+                {"date": str(date), "name": f"{years:g}-Year", "yield": float(value)}
+                for date, years, value in zip(dates, history.tenor, values)
+            ]
+        return historical_data
+
+    def curves_over_time(self, country: str, start: Optional[DateLike] = None,
+                         end: Optional[DateLike] = None, max_curves: Optional[int] = 12) -> List[Dict[str, Any]]:
+        """
+        Nominal yield curves in the format of plots.plot_yield_curve_3d
+
+        Args:
+            country: Country code
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            max_curves: Number of dates to return, evenly spaced over the range
+                including its first and last date (default: 12, None for all)
+
+        Returns:
+            List of {"date", "bonds": [{"Laufzeit", "YTM", "Realzins"}]} in date order
+        """
+        history = self.query(country, start, end, linker=False)
+        dates, first = np.unique(history.date, return_index=True)
+        bounds = np.r_[first, len(history.date)]
+        selected = np.arange(dates.size)
+        if max_curves is not None and dates.size > max_curves:
+            selected = np.unique(np.linspace(0, dates.size - 1, max_curves).round().astype(int))
+
+        return [
+            {
+                "date": str(dates[i]),
+                "bonds": [
+                    {"Laufzeit": float(t), "YTM": float(y), "Realzins": float(r)}
+                    for t, y, r in zip(
+                        history.tenor[bounds[i]:bounds[i + 1]],
+                        history.ytm[bounds[i]:bounds[i + 1]],
+                        history.real_yield[bounds[i]:bounds[i + 1]]
+                    )
+                ]
+            }
+            for i in selected
+        ]
+
+    def __repr__(self) -> str:
+        return f"HistoryStore({self.directory}, {len(self.countries())} countries)"
@@ -0,0 +1,193 @@
+import numpy as np
+from typing import NamedTuple, Optional, Sequence, Union
+
+from cashflows import CashFlowSchedule
+from curves import Curve
+
+class HoLeeLattice:
+    """
+    Recombining binomial Ho-Lee short-rate lattice calibrated to a zero curve
+
+    The rate at step i and node j (j = 0..i up-moves) is
+    r(i, j) = theta_i + sigma * sqrt(dt) * (2j - i), with probability 1/2 for each
+    move. The drifts theta_i are fitted by forward induction of Arrow-Debreu prices,
+    so the lattice reprices the curve's discount factors at every step exactly.
+    """
+
+    def __init__(self, curve: Curve, horizon: float, sigma: float = 0.01, steps_per_year: int = 12):
+        """
+        Args:
+            curve: Zero curve to calibrate to
+            horizon: Last time in years the lattice has to cover
+            sigma: Absolute short-rate volatility per sqrt(year)
+            steps_per_year: Time steps per year; a multiple of all coupon
+                frequencies puts every coupon date on a lattice step
+        """
+        self.curve = curve
+        self.sigma = float(sigma)
+        self.steps_per_year = int(steps_per_year)
+        self.dt = 1 / self.steps_per_year
+        self.n_steps = max(1, int(np.ceil(round(horizon * self.steps_per_year, 10))))
+
+        targets = curve.discount_factors(np.arange(1, self.n_steps + 1) * self.dt)
+        spread = self.sigma * np.sqrt(self.dt)
+
+        # Forward induction: theta_i makes sum_j Q(i, j) exp(-r(i, j) dt) = P(0, (i+1) dt)
+        self.theta = np.empty(self.n_steps)
+        arrow_debreu = np.ones(1)
+        for i in range(self.n_steps):
+            offsets = spread * (2 * np.arange(i + 1) - i)
+            discounted = arrow_debreu * np.exp(-offsets * self.dt)
+            self.theta[i] = -np.log(targets[i] / discounted.sum()) / self.dt
+
+            discounted *= np.exp(-self.theta[i] * self.dt) / 2
+            arrow_debreu = np.zeros(i + 2)
+            arrow_debreu[:-1] += discounted
+            arrow_debreu[1:] += discounted
+
+    def rates(self, step: int) -> np.ndarray:
+        """
+        Short rates at all nodes of a time step
+
+        Args:
+            step: Time step i (0 <= i < n_steps)
+
+        Returns:
+            Rates of the i + 1 nodes as decimals
+        """
+        return self.theta[step] + self.sigma * np.sqrt(self.dt) * (2 * np.arange(step + 1) - step)
+
+    def __repr__(self) -> str:
+        return f"HoLeeLattice({self.n_steps} steps, dt={self.dt:.4f}, sigma={self.sigma})"
+
+def _option_mask(flow_steps: np.ndarray, rows: np.ndarray, n_bonds: int, n_steps: int,
+                 strike: np.ndarray, start_step: np.ndarray) -> np.ndarray:
+    """
+    Exercise dates per (step, bond): coupon dates on or after the first exercise date
+    """
+    mask = np.zeros((n_steps + 1, n_bonds), dtype=bool)
+    eligible = ~np.isnan(strike[rows]) & (flow_steps >= start_step[rows]) & (flow_steps > 0)
+    mask[flow_steps[eligible], rows[eligible]] = True
+    return mask
+
+def lattice_prices(lattice: HoLeeLattice, schedule: CashFlowSchedule,
+                   call_price: Optional[np.ndarray] = None, call_start: Optional[np.ndarray] = None,
+                   put_price: Optional[np.ndarray] = None, put_start: Optional[np.ndarray] = None,
+                   rate_shifts: Sequence[float] = (0.0,)) -> np.ndarray:
+    """
+    Price many bonds with embedded options together on one lattice
+
+    Backward induction runs over the time steps once; each step updates all nodes,
+    bonds and rate shifts as one array. Cash flows are placed on the nearest lattice
+    step. Calls and puts are Bermudan on the coupon dates from their start date: the
+    value after the coupon is capped at the call price or floored at the put price.
+
+    Args:
+        lattice: Calibrated lattice covering the longest maturity
+        schedule: Cash-flow schedule of the bonds
+        call_price: Clean call price per bond (NaN = not callable)
+        call_start: First call date per bond in years
+        put_price: Clean put price per bond (NaN = not putable)
+        put_start: First put date per bond in years
+        rate_shifts: Parallel shifts added to every lattice rate (e.g., for
+            effective duration); rates are continuously compounded, so a shift moves
+            all zero rates of the calibrated curve by the same amount
+
+    Returns:
+        Prices of shape (shifts, bonds)
+    """
+    n_bonds = len(schedule)
+    n_steps = lattice.n_steps
+    rows = np.repeat(np.arange(n_bonds), np.diff(schedule.amounts.indptr))
+    flow_steps = np.rint(schedule.times[schedule.amounts.indices] * lattice.steps_per_year).astype(int)
+    flow_steps = np.clip(flow_steps, 1, None)
+    if flow_steps.size and flow_steps.max() > n_steps:
+        raise ValueError("Lattice horizon is shorter than the longest maturity")
+
+    # Cash flow per (step, bond)
+    cash_flows = np.zeros((n_steps + 1, n_bonds))
+    np.add.at(cash_flows, (flow_steps, rows), schedule.amounts.data)
+
+    def option_arrays(strike, start):
+        strike = np.full(n_bonds, np.nan) if strike is None else np.broadcast_to(np.asarray(strike, dtype=float), n_bonds)
+        start = np.zeros(n_bonds) if start is None else np.broadcast_to(np.asarray(start, dtype=float), n_bonds)
+        start_step = np.ceil(np.round(start * lattice.steps_per_year, 10)).astype(int)
+        return strike, _option_mask(flow_steps, rows, n_bonds, n_steps, strike, start_step)
+
+    call_price, callable_at = option_arrays(call_price, call_start)
+    put_price, putable_at = option_arrays(put_price, put_start)
+
+    shifts = np.asarray(rate_shifts, dtype=float).reshape(-1, 1, 1)
+
+    # Values of shape (shifts, bonds, nodes), starting at the last step
+    values = np.broadcast_to(cash_flows[n_steps][None, :, None], (shifts.shape[0], n_bonds, n_steps + 1)).copy()
+    for i in range(n_steps - 1, -1, -1):
+        discount = np.exp(-(lattice.rates(i)[None, None, :] + shifts) * lattice.dt)
+        values = discount * 0.5 * (values[..., :-1] + values[..., 1:])
+
+        if callable_at[i].any():
+            capped = np.minimum(values, call_price[None, :, None])
+            values = np.where(callable_at[i][None, :, None], capped, values)
+        if putable_at[i].any():
+            floored = np.maximum(values, put_price[None, :, None])
+            values = np.where(putable_at[i][None, :, None], floored, values)
+
+        values += cash_flows[i][None, :, None]
+
+    return values[..., 0]
+
+class OptionAdjustedAnalytics(NamedTuple):
+    """
+    Lattice analytics of bonds with embedded options
+
+    Attributes:
+        price: Option-adjusted dirty price
+        effective_duration: -(P(+dy) - P(-dy)) / (2 P dy)
+        effective_convexity: (P(+dy) + P(-dy) - 2 P) / (P dy^2)
+    """
+    price: np.ndarray
+    effective_duration: np.ndarray
+    effective_convexity: np.ndarray
+
+def price_callable_bonds(curve: Curve, face_value: np.ndarray, coupon_rate: np.ndarray,
+                         years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1,
+                         call_price: Optional[np.ndarray] = None, call_start: Optional[np.ndarray] = None,
+                         put_price: Optional[np.ndarray] = None, put_start: Optional[np.ndarray] = None,
+                         sigma: float = 0.01, steps_per_year: int = 12,
+                         bump: float = 0.0001) -> OptionAdjustedAnalytics:
+    """
+    Option-adjusted price, effective duration and effective convexity of callable
+    and putable bonds
+
+    All bonds share one Ho-Lee lattice calibrated to the curve. The base and the
+    up/down-shifted curves are priced in the same backward induction.
+
+    Args:
+        curve: Zero curve (e.g., from curves.bootstrap_book)
+        face_value: Face values of the bonds
+        coupon_rate: Annual coupon rates as decimals
+        years_to_maturity: Years until maturity
+        frequency: Coupon payment frequencies per year
+        call_price: Clean call price per bond (NaN = not callable)
+        call_start: First call date per bond in years
+        put_price: Clean put price per bond (NaN = not putable)
+        put_start: First put date per bond in years
+        sigma: Absolute short-rate volatility per sqrt(year)
+        steps_per_year: Lattice time steps per year
+        bump: Parallel shift of the curve for the effective measures as a decimal
+
+    Returns:
+        OptionAdjustedAnalytics with one entry per bond
+    """
+    schedule = CashFlowSchedule(face_value, coupon_rate, years_to_maturity, frequency)
+    lattice = HoLeeLattice(curve, float(np.max(schedule.years_to_maturity)), sigma, steps_per_year)
+
+    base, up, down = lattice_prices(
+        lattice, schedule, call_price, call_start, put_price, put_start, rate_shifts=(0.0, bump, -bump)
+    )
+
+    return OptionAdjustedAnalytics(
+        price=base,
+        effective_duration=(down - up) / (2 * base * bump),
+        effective_convexity=(up + down - 2 * base) / (base * bump ** 2)
+    )
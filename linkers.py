@@ -0,0 +1,91 @@
+import numpy as np
+from typing import Optional
+
+from bond_book import BondBook
+from cashflows import CashFlowSchedule
+from curves import Curve, bootstrap_book
+from spreads import z_spreads
+
+def invoice_prices(price: np.ndarray, index_ratio: np.ndarray) -> np.ndarray:
+    """
+    Inflation-adjusted (invoice) prices of linkers quoted in real terms
+
+    Args:
+        price: Real (quoted) prices
+        index_ratio: Index ratio per bond
+
+    Returns:
+        Nominal amount paid per bond
+    """
+    return np.asarray(price, dtype=float) * np.asarray(index_ratio, dtype=float)
+
+def breakeven_inflation(schedule: CashFlowSchedule, price: np.ndarray, nominal_curve: Curve) -> np.ndarray:
+    """
+    Curve-consistent breakeven inflation of linkers
+
+    The breakeven is the constant inflation rate pi at which the projected nominal
+    cash flows, discounted on the nominal curve, cost the invoice price:
+    sum_j CF_j * IR * (1 + pi)^t_j * DF(t_j) = price * IR. The index ratio cancels,
+    so with g = ln(1 + pi) this is the Z-spread equation of the real cash flows at
+    the real price with spread -g, and all bonds are solved in one batch.
+
+    Args:
+        schedule: Cash-flow schedule of the linkers in real terms
+        price: Real (quoted) dirty prices
+        nominal_curve: Nominal zero curve
+
+    Returns:
+        Annually compounded breakeven inflation as decimals (NaN where unsolved)
+    """
+    spread, _ = z_spreads(schedule, price, nominal_curve)
+    return np.expm1(-spread)
+
+def book_breakevens(book: BondBook, nominal_curve: Curve) -> np.ndarray:
+    """
+    Curve-consistent breakeven inflation of the linkers of a BondBook
+
+    Args:
+        book: BondBook with index ratios for its linkers
+        nominal_curve: Nominal zero curve (e.g., curves.bootstrap_book of the same book)
+
+    Returns:
+        Breakevens in percent, rows in the book's maturity order (NaN for nominal bonds)
+    """
+    linkers = book.is_linker
+    breakeven = np.full(len(book), np.nan)
+    if linkers.any():
+        schedule = CashFlowSchedule(
+            book["face_value"][linkers], book["coupon"][linkers] / 100,
+            book["maturity"][linkers], book["frequency"][linkers]
+        )
+        breakeven[linkers] = breakeven_inflation(schedule, book["price"][linkers], nominal_curve) * 100
+    return breakeven
+
+def update_book_breakevens(book: BondBook, nominal_curve: Optional[Curve] = None) -> BondBook:
+    """
+    Fill a book's breakevens and real yields with curve-consistent linker breakevens
+
+    The linkers' breakevens are solved against the nominal zero curve (see
+    breakeven_inflation) instead of the Fisher spread to an interpolated nominal
+    yield; nominal bonds then take their real yields from those breakevens. Books
+    without linkers, or whose nominal curve cannot be bootstrapped, keep the
+    breakevens of BondBook.update_real_yields.
+
+    Args:
+        book: Analyzed BondBook (YTMs filled)
+        nominal_curve: Nominal zero curve (default: curves.bootstrap_book of the book)
+
+    Returns:
+        The book itself, for chaining
+    """
+    linkers = book.is_linker
+    if not linkers.any():
+        return book.update_real_yields()
+    if nominal_curve is None:
+        if linkers.all():
+            return book.update_real_yields()
+        try:
+            nominal_curve = bootstrap_book(book)
+        except ValueError:
+            return book.update_real_yields()
+    return book.update_real_yields(book_breakevens(book, nominal_curve))
@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded mapping with least-recently-used eviction
+    
+    Keeps hit, miss and eviction counters so callers can monitor how effective
+    the cache is.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: Maximum number of entries; 0 disables caching
+        """
+        self._data: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple, default: object = None) -> object:
+        """
+        Look up a key and mark it as most recently used
+        
+        Args:
+            key: Hashable cache key
+            default: Value returned on a miss
+            
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Tuple, value: object) -> None:
+        """
+        Store a value, evicting the least recently used entries beyond maxsize
+        
+        Args:
+            key: Hashable cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+    
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the size limit, evicting entries if the cache is now too large
+        
+        Args:
+            maxsize: New maximum number of entries
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+    
+    def invalidate(self, key: Optional[Tuple] = None) -> None:
+        """
+        Drop one entry, or all entries if no key is given
+        
+        Args:
+            key: Cache key to drop (default: clear the whole cache)
+        """
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+    
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get the cache counters
+        
+        Returns:
+            Dictionary with size, maxsize, hits, misses, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+    
+    def _evict(self) -> None:
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -1,11 +1,22 @@
 import requests
+import numpy as np
 import pandas as pd
 import json
+import os
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple
 import logging
 import random  # For demo fallback data
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+from bonds import price_from_yield
+from data_cache import MarketDataCache
+from history import HistoryStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -17,218 +28,388 @@ ECB_API_URL = "https://data-api.ecb.europa.eu/service/data/YC/B.U2.EUR.4F.G_N_A.
 BOJ_API_URL = "https://www.boj.or.jp/en/statistics/market/long_term_market/data/jgbcm_en.csv"  # Japanese government bonds
 BOE_API_URL = "https://www.bankofengland.co.uk/boeapps/database/fromshowcolumns.asp?csv.x=yes&Datefrom=01/Jan/2020&Dateto=now&SeriesCodes=IUMAADNB&UsingCodes=Y&CSVF=TN&VPD=Y"  # Bank of England
 
+# HTTP client settings shared by all fetchers
+REQUEST_TIMEOUT = 10  # seconds per request attempt
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.5  # retries wait 0.5 s, 1 s, 2 s, ...
+HTTP_BACKOFF_MAX = 2  # longest backoff between two attempts, in seconds
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 # Cache directory for storing fetched data
 CACHE_DIR = Path(__file__).parent / "data" / "cache"
 CACHE_EXPIRY = 3600  # 1 hour in seconds
 
-# Ensure cache directory exists
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Cache source (file name) per country and its time to live in seconds
+CACHE_SOURCES = {
+    "US": "us_treasury_data",
+    "DE": "german_bond_data",
+    "JP": "japanese_bond_data",
+    "UK": "uk_bond_data",
+}
+CACHE_TTLS = {source: CACHE_EXPIRY for source in CACHE_SOURCES.values()}
 
-def fetch_us_treasury_data() -> Dict[str, Any]:
+# Countries refreshed by update_predefined_bonds_with_market_data
+COUNTRY_CODES = ("US", "DE", "JP", "UK")
+
+# Total time a concurrent sync of all countries may take, in seconds
+SYNC_DEADLINE = 12
+
+PREDEFINED_BONDS_PATH = Path(__file__).parent / "data" / "predefined_bonds.json"
+
+# "source" of synthetic data from get_fallback_data, which is never recorded as history
+FALLBACK_SOURCE = "fallback"
+
+# Append-only yield history, one curve per country and fetch date
+HISTORY_DIR = Path(__file__).parent / "data" / "history"
+
+# Memory + disk cache shared by all fetchers (creates CACHE_DIR)
+market_cache = MarketDataCache(CACHE_DIR, CACHE_TTLS, default_ttl=CACHE_EXPIRY)
+
+def get_market_cache_stats() -> Dict[str, Any]:
     """
-    Fetch US Treasury yield data from the Treasury API
+    Get hit, miss, write and age metrics of the market data cache
+    """
+    return market_cache.stats()
+
+history_store = HistoryStore(HISTORY_DIR)
+
+def _record_history(country_code: str, bond_data: Dict[str, Any]) -> None:
     """
-    cache_file = CACHE_DIR / "us_treasury_data.json"
+    Append fetched bonds to the yield history; failures are logged, never raised
     
-    # Check if we have cached data that's not expired
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            cached_data = json.load(f)
-            if time.time() - cached_data["timestamp"] < CACHE_EXPIRY:
-                logger.info("Using cached US Treasury data")
-                return cached_data["data"]
+    Synthetic fallback data (source FALLBACK_SOURCE) is not an observation and is skipped.
+    """
+    if bond_data.get("source") == FALLBACK_SOURCE:
+        logger.info(f"Not recording {country_code} fallback data as yield history")
+        return
+    try:
+        history_store.record(country_code, bond_data.get("bonds", []))
+    except Exception as e:
+        logger.error(f"Error recording {country_code} yield history: {e}")
+
+# Minimum time between two background refreshes of the same source, in seconds
+REFRESH_RETRY_INTERVAL = 60
+
+# Background refreshes of stale snapshots (see refresh_in_background)
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refreshes: Dict[str, Future] = {}
+_refresh_started: Dict[str, float] = {}
+_refresh_lock = threading.Lock()
+
+# Worker threads of the concurrent syncs (see iter_market_data). They live as long
+# as the process, so their thread-local sessions keep connections alive between
+# syncs; two per country leave room for a sync that starts while fetches of the
+# previous one are still finishing after its deadline.
+_sync_executor: Optional[ThreadPoolExecutor] = None
+_sync_lock = threading.Lock()
+
+def _get_sync_executor() -> ThreadPoolExecutor:
+    """
+    Shared thread pool of iter_market_data, created on first use
+    """
+    global _sync_executor
+    with _sync_lock:
+        if _sync_executor is None:
+            _sync_executor = ThreadPoolExecutor(max_workers=2 * len(COUNTRY_CODES), thread_name_prefix="market-data")
+        return _sync_executor
+
+class _DeadlineRetry(Retry):
+    """
+    urllib3 Retry that never starts a retry it cannot finish before a deadline
+
+    A retry is only made if its wait (Retry-After or the capped backoff) plus one
+    full attempt ends before the deadline; otherwise the retries count as
+    exhausted and the last response or error is returned to the caller. A large
+    Retry-After therefore ends the fetch instead of blocking the thread.
+    """
+
+    def __init__(self, *args, deadline: float = float("inf"), attempt_timeout: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+
+    def new(self, **kwargs) -> "_DeadlineRetry":
+        retry = super().new(**kwargs)
+        retry.deadline = self.deadline
+        retry.attempt_timeout = self.attempt_timeout
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None) -> "_DeadlineRetry":
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        wait = self.get_retry_after(response) if response is not None and self.respect_retry_after_header else None
+        if wait is None:
+            wait = retry.get_backoff_time()
+        if time.monotonic() + wait + self.attempt_timeout > self.deadline:
+            reason = error or ResponseError(f"retry after {wait:.1f}s would end after the fetch deadline")
+            raise MaxRetryError(_pool, url, reason) from reason
+        return retry
+
+_thread_state = threading.local()
+
+def get_session() -> requests.Session:
+    """
+    HTTP session of the calling thread
     
-    logger.info("Fetching live US Treasury data")
+    requests.Session is not documented as thread-safe (its cookie jar and adapter
+    settings are shared state), so every thread gets its own session. Connections
+    are kept alive and pooled per host within a thread; the sync and background
+    refresh threads live as long as the process, so they reuse their connections.
+    Retries are configured per request in http_get.
+    """
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        adapter = HTTPAdapter(pool_connections=len(COUNTRY_CODES), pool_maxsize=1)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _thread_state.session = session
+    return session
+
+def http_get(url: str, params: Optional[Dict[str, Any]] = None,
+             validators: Optional[Dict[str, str]] = None,
+             budget: float = SYNC_DEADLINE) -> requests.Response:
+    """
+    Conditional GET through the thread's session, with retries within a time budget
     
-    try:
-        params = {
-            "filter": "security_desc:eq:Treasury Bonds,Treasury Notes",
-            "sort": "-record_date",
-            "format": "json",
-            "page[size]": 10
-        }
-        
-        response = requests.get(TREASURY_API_URL, params=params, timeout=10)
-        response.raise_for_status()
+    If the validators of an earlier response are given, they are sent as
+    If-None-Match / If-Modified-Since, so an unchanged resource costs a 304
+    round trip instead of the full download.
+    
+    Connection errors and the statuses in HTTP_RETRY_STATUSES are retried up to
+    HTTP_RETRIES times with exponential backoff (at most HTTP_BACKOFF_MAX) or the
+    server's Retry-After, but only while the wait and another attempt fit in the
+    budget, so a fetch never outlives the SYNC_DEADLINE of a concurrent sync.
+    
+    Args:
+        url: Resource URL
+        params: Query parameters
+        validators: Optional "etag" and "last_modified" of the cached response
+        budget: Total time for all attempts and waits, in seconds
         
-        data = response.json()
+    Returns:
+        Response with status 304 (cached data still valid) or 2xx
         
-        # Process the data to extract yields for different maturities
-        bond_data = {
-            "name": "United States Treasury",
-            "currency": "USD",
-            "bonds": []
-        }
+    Raises:
+        requests.RequestException: On connection errors or error statuses after all retries
+    """
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    
+    deadline = time.monotonic() + budget
+    timeout = min(REQUEST_TIMEOUT, budget)
+    session = get_session()
+    session.get_adapter(url).max_retries = _DeadlineRetry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        backoff_max=HTTP_BACKOFF_MAX,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        deadline=deadline,
+        attempt_timeout=timeout
+    )
+    
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+def http_validators(response: requests.Response) -> Dict[str, str]:
+    """
+    ETag and Last-Modified of a response, as stored in cache entries
+    """
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    return validators
+
+def _fetch_cached(country_code: str, label: str, url: str, parse: Callable[[requests.Response], Optional[Dict[str, Any]]],
+                  params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fetch a source through the cache: fresh snapshot, conditional GET, then fallback
+    
+    Args:
+        country_code: Country code ('US', 'DE', 'JP', 'UK')
+        label: Source name for log messages
+        url: Resource URL
+        parse: Turns a 2xx response into bond data (None if it had no usable data)
+        params: Query parameters
         
-        # Map data to our bond format
-        for entry in data.get("data", []):
-            if entry.get("security_desc") == "Treasury Notes" and entry.get("avg_interest_rate_amt"):
-                # Extract maturity from description
-                maturity_text = entry.get("security_type_desc", "")
-                years = None
-                
-                if "2-Year" in maturity_text:
-                    years = 2
-                elif "5-Year" in maturity_text:
-                    years = 5
-                elif "10-Year" in maturity_text:
-                    years = 10
-                
-                if years:
-                    rate = float(entry.get("avg_interest_rate_amt", 0))
-                    bond_data["bonds"].append({
-                        "name": f"{years}-Year Treasury",
-                        "years_to_maturity": years,
-                        "face_value": 1000,
-                        "coupon_rate": rate,
-                        "price": calculate_approximate_price(1000, rate/100, years, rate/100),
-                        "inflation": 2.5  # Use latest CPI data in a real implementation
-                    })
+    Returns:
+        Dictionary with bond market data
+    """
+    source = CACHE_SOURCES[country_code]
+    
+    # Check if we have cached data that's not expired
+    cached = market_cache.get(source)
+    if market_cache.is_fresh(source, cached):
+        logger.info(f"Using cached {label} data")
+        return cached.data
+    
+    logger.info(f"Fetching live {label} data")
+    
+    try:
+        response = http_get(url, params=params, validators=cached.validators if cached else None)
+        if response.status_code == 304:
+            logger.info(f"{label} data unchanged since last fetch")
+            bond_data = market_cache.touch(source).data
+            _record_history(country_code, bond_data)
+            return bond_data
         
-        # If we couldn't get proper data, add fallback data
-        if not bond_data["bonds"]:
-            bond_data = get_fallback_data("US")
+        bond_data = parse(response)
         
-        # Cache the result
-        with open(cache_file, "w") as f:
-            json.dump({"timestamp": time.time(), "data": bond_data}, f)
+        # If we couldn't get proper data, use fallback data (cached without
+        # validators, so a 304 cannot pin the fallback in the cache)
+        if bond_data is None:
+            bond_data = get_fallback_data(country_code)
+            market_cache.put(source, bond_data)
+        else:
+            market_cache.put(source, bond_data, http_validators(response))
+            _record_history(country_code, bond_data)
         
         return bond_data
         
     except Exception as e:
-        logger.error(f"Error fetching US Treasury data: {e}")
-        return get_fallback_data("US")
+        logger.error(f"Error fetching {label} data: {e}")
+        return get_fallback_data(country_code)
 
-def fetch_german_bond_data() -> Dict[str, Any]:
+def _parse_us_treasury(response: requests.Response) -> Optional[Dict[str, Any]]:
     """
-    Fetch German Bund yield data from ECB API
+    Bond data from a Treasury average-interest-rates response
     """
-    cache_file = CACHE_DIR / "german_bond_data.json"
+    data = response.json()
     
-    # Check if we have cached data that's not expired
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            cached_data = json.load(f)
-            if time.time() - cached_data["timestamp"] < CACHE_EXPIRY:
-                logger.info("Using cached German bond data")
-                return cached_data["data"]
+    # Process the data to extract yields for different maturities
+    bond_data = {
+        "name": "United States Treasury",
+        "currency": "USD",
+        "bonds": []
+    }
     
-    logger.info("Fetching live German bond data")
+    # Map data to our bond format
+    maturities = []
+    rates = []
+    for entry in data.get("data", []):
+        if entry.get("security_desc") == "Treasury Notes" and entry.get("avg_interest_rate_amt"):
+            # Extract maturity from description
+            maturity_text = entry.get("security_type_desc", "")
+            years = None
+            
+            if "2-Year" in maturity_text:
+                years = 2
+            elif "5-Year" in maturity_text:
+                years = 5
+            elif "10-Year" in maturity_text:
+                years = 10
+            
+            if years:
+                maturities.append(years)
+                rates.append(float(entry.get("avg_interest_rate_amt", 0)))
     
-    try:
-        # For ECB API, we need to structure the request properly
-        params = {
-            "format": "jsondata",
-            "lastNObservations": 1
-        }
-        
-        response = requests.get(ECB_API_URL, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Process ECB data format
-        # This is a simplified example, you'd need to adjust based on actual API response
-        bond_data = {
-            "name": "German Federal Bonds (Bunds)",
-            "currency": "EUR",
-            "bonds": []
-        }
+    # Price all notes in one call (coupon equal to the average rate)
+    decimal_rates = np.array(rates) / 100
+    prices = price_from_yield(decimal_rates, 1000, decimal_rates, np.array(maturities, dtype=float))
+    
+    for years, rate, price in zip(maturities, rates, np.atleast_1d(prices)):
+        bond_data["bonds"].append({
+            "name": f"{years}-Year Treasury",
+            "years_to_maturity": years,
+            "face_value": 1000,
+            "coupon_rate": rate,
+            "price": float(price),
+            "inflation": 2.5  # Use latest CPI data in a real implementation
+        })
+    
+    return bond_data if bond_data["bonds"] else None
+
+def fetch_us_treasury_data() -> Dict[str, Any]:
+    """
+    Fetch US Treasury yield data from the Treasury API
+    """
+    params = {
+        "filter": "security_desc:eq:Treasury Bonds,Treasury Notes",
+        "sort": "-record_date",
+        "format": "json",
+        "page[size]": 10
+    }
+    return _fetch_cached("US", "US Treasury", TREASURY_API_URL, _parse_us_treasury, params)
+
+def fetch_german_bond_data() -> Dict[str, Any]:
+    """
+    Fetch German Bund yield data from ECB API
+    """
+    def parse(response: requests.Response) -> Optional[Dict[str, Any]]:
+        response.json()
         
         # In a real implementation, parse the ECB data correctly
         # For now, use fallback data with a slight random variation
-        bond_data = get_fallback_data("DE")
-        
-        # Cache the result
-        with open(cache_file, "w") as f:
-            json.dump({"timestamp": time.time(), "data": bond_data}, f)
-        
-        return bond_data
-        
-    except Exception as e:
-        logger.error(f"Error fetching German bond data: {e}")
         return get_fallback_data("DE")
+    
+    # For ECB API, we need to structure the request properly
+    params = {
+        "format": "jsondata",
+        "lastNObservations": 1
+    }
+    return _fetch_cached("DE", "German bond", ECB_API_URL, parse, params)
 
 def fetch_japanese_bond_data() -> Dict[str, Any]:
     """
     Fetch Japanese Government Bond data
     """
-    cache_file = CACHE_DIR / "japanese_bond_data.json"
-    
-    # Check if we have cached data that's not expired
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            cached_data = json.load(f)
-            if time.time() - cached_data["timestamp"] < CACHE_EXPIRY:
-                logger.info("Using cached Japanese bond data")
-                return cached_data["data"]
-    
-    logger.info("Fetching live Japanese bond data")
-    
-    try:
-        response = requests.get(BOJ_API_URL, timeout=10)
-        response.raise_for_status()
-        
-        # Parse CSV data
+    def parse(response: requests.Response) -> Optional[Dict[str, Any]]:
         # In a real implementation, parse the BOJ CSV correctly
         # For now, use fallback data with a slight random variation
-        bond_data = get_fallback_data("JP")
-        
-        # Cache the result
-        with open(cache_file, "w") as f:
-            json.dump({"timestamp": time.time(), "data": bond_data}, f)
-        
-        return bond_data
-        
-    except Exception as e:
-        logger.error(f"Error fetching Japanese bond data: {e}")
         return get_fallback_data("JP")
+    
+    return _fetch_cached("JP", "Japanese bond", BOJ_API_URL, parse)
 
 def fetch_uk_bond_data() -> Dict[str, Any]:
     """
     Fetch UK Gilt data
     """
-    cache_file = CACHE_DIR / "uk_bond_data.json"
-    
-    # Check if we have cached data that's not expired
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            cached_data = json.load(f)
-            if time.time() - cached_data["timestamp"] < CACHE_EXPIRY:
-                logger.info("Using cached UK bond data")
-                return cached_data["data"]
-    
-    logger.info("Fetching live UK bond data")
-    
-    try:
-        response = requests.get(BOE_API_URL, timeout=10)
-        response.raise_for_status()
-        
-        # Parse CSV data from Bank of England
+    def parse(response: requests.Response) -> Optional[Dict[str, Any]]:
         # In a real implementation, parse the BOE CSV correctly
         # For now, use fallback data with a slight random variation
-        bond_data = get_fallback_data("UK")
-        
-        # Cache the result
-        with open(cache_file, "w") as f:
-            json.dump({"timestamp": time.time(), "data": bond_data}, f)
-        
-        return bond_data
-        
-    except Exception as e:
-        logger.error(f"Error fetching UK bond data: {e}")
         return get_fallback_data("UK")
+    
+    return _fetch_cached("UK", "UK bond", BOE_API_URL, parse)
 
-def fetch_market_data(country_code: str) -> Dict[str, Any]:
+def fetch_market_data(country_code: str, stale_while_revalidate: bool = False) -> Dict[str, Any]:
     """
     Main function to fetch market data for a specific country
     
+    In stale-while-revalidate mode an expired snapshot is returned at once and a
+    background refresh of the source is started instead (see refresh_in_background);
+    only a source with no snapshot at all is fetched while the caller waits.
+    
     Args:
         country_code: Country code ('US', 'DE', 'JP', 'UK')
+        stale_while_revalidate: Serve expired snapshots and refresh them in the background
         
     Returns:
         Dictionary with bond market data
     """
+    if stale_while_revalidate and country_code in CACHE_SOURCES:
+        source = CACHE_SOURCES[country_code]
+        cached = market_cache.get(source)
+        if cached is not None:
+            if not market_cache.is_fresh(source, cached):
+                refresh_in_background(country_code)
+            return cached.data
+    
+    return _fetch_live(country_code)
+
+def _fetch_live(country_code: str) -> Dict[str, Any]:
+    """
+    Dispatch to the fetcher of a country (which still serves fresh cache entries)
+    """
     if country_code == "US":
         return fetch_us_treasury_data()
     elif country_code == "DE":
@@ -241,15 +422,77 @@ def fetch_market_data(country_code: str) -> Dict[str, Any]:
         logger.error(f"Unknown country code: {country_code}")
         return get_fallback_data(country_code)
 
+def refresh_in_background(country_code: str) -> Optional[Future]:
+    """
+    Start a background refresh of a source unless one is already running
+    
+    Refreshes are deduplicated per source across all callers in the process (e.g.
+    all Streamlit sessions), so an expired snapshot triggers a single upstream
+    request. After a refresh has started, the source is not refreshed again for
+    REFRESH_RETRY_INTERVAL seconds, which keeps a failing API from being hit on
+    every request while it serves fallback data.
+    
+    Args:
+        country_code: Country code ('US', 'DE', 'JP', 'UK')
+        
+    Returns:
+        Future of the running refresh, or None if a refresh started too recently
+    """
+    global _refresh_executor
+    
+    with _refresh_lock:
+        running = _refreshes.get(country_code)
+        if running is not None and not running.done():
+            return running
+        
+        now = time.monotonic()
+        if now - _refresh_started.get(country_code, float("-inf")) < REFRESH_RETRY_INTERVAL:
+            return None
+        
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=len(COUNTRY_CODES), thread_name_prefix="market-refresh")
+        logger.info(f"Refreshing {country_code} market data in the background")
+        future = _refresh_executor.submit(_fetch_live, country_code)
+        _refreshes[country_code] = future
+        _refresh_started[country_code] = now
+        return future
+
+def get_snapshot_status(countries: Sequence[str] = COUNTRY_CODES) -> Dict[str, Dict[str, Any]]:
+    """
+    Age of the cached snapshot of each source and whether it is being refreshed
+    
+    Args:
+        countries: Country codes
+        
+    Returns:
+        Dictionary country code -> {"age": seconds since fetch (None if nothing is
+        cached), "stale": older than its time to live, "refreshing": background
+        refresh running}
+    """
+    status = {}
+    for country in countries:
+        source = CACHE_SOURCES.get(country)
+        cached = market_cache.get(source) if source else None
+        with _refresh_lock:
+            running = _refreshes.get(country)
+        status[country] = {
+            "age": cached.age() if cached is not None else None,
+            "stale": cached is not None and not market_cache.is_fresh(source, cached),
+            "refreshing": running is not None and not running.done()
+        }
+    return status
+
 def get_fallback_data(country_code: str) -> Dict[str, Any]:
     """
     Get fallback data from predefined_bonds.json with slight random variations
     to simulate market movement
+    
+    The data is marked with "source": FALLBACK_SOURCE so it is never mistaken for
+    observed market data (e.g. by the yield history).
     """
     # Load predefined bonds
-    predefined_path = Path(__file__).parent / "data" / "predefined_bonds.json"
     try:
-        with open(predefined_path, "r") as f:
+        with open(PREDEFINED_BONDS_PATH, "r") as f:
             predefined_bonds = json.load(f)
             
         # Get country data
@@ -270,6 +513,8 @@ def get_fallback_data(country_code: str) -> Dict[str, Any]:
                 inflation_variation = random.uniform(-0.1, 0.1)
                 bond["inflation"] = max(0.1, bond["inflation"] + inflation_variation)
         
+        if country_data:
+            country_data["source"] = FALLBACK_SOURCE
         return country_data
         
     except Exception as e:
@@ -278,55 +523,141 @@ def get_fallback_data(country_code: str) -> Dict[str, Any]:
         return {
             "name": f"Unknown Country {country_code}",
             "currency": "USD",
-            "bonds": []
+            "bonds": [],
+            "source": FALLBACK_SOURCE
         }
 
 def calculate_approximate_price(face_value: float, coupon_rate: float, 
-                             years_to_maturity: float, market_yield: float) -> float:
+                             years_to_maturity: float, market_yield: float,
+                             frequency: int = 1) -> float:
     """
     Calculate approximate bond price based on yield
     
+    Thin wrapper around bonds.price_from_yield, which also accepts arrays.
+    
     Args:
         face_value: Face value of the bond
         coupon_rate: Annual coupon rate as a decimal
         years_to_maturity: Years until bond maturity
-        market_yield: Market yield as a decimal
+        market_yield: Market yield as a decimal (may be negative)
+        frequency: Coupon payment frequency per year
         
     Returns:
         Approximate bond price
     """
-    if market_yield == 0:
-        return face_value * (1 + coupon_rate * years_to_maturity)
+    return price_from_yield(market_yield, face_value, coupon_rate, years_to_maturity, frequency)
+
+def iter_market_data(countries: Sequence[str] = COUNTRY_CODES, deadline: float = SYNC_DEADLINE,
+                     stale_while_revalidate: bool = False) -> Iterator[Tuple[str, Dict[str, Any], bool]]:
+    """
+    Fetch several countries concurrently and yield each result as soon as it arrives
     
-    # Present value of coupon payments
-    pv_coupon = face_value * coupon_rate * (1 - (1 + market_yield) ** (-years_to_maturity)) / market_yield
+    All fetches share one total deadline. A country whose fetch raises is yielded
+    with get_fallback_data right away; countries still unfinished at the deadline
+    are yielded last with get_fallback_data. Fetches still running keep going in
+    the background and fill the cache for the next call.
     
-    # Present value of principal
-    pv_principal = face_value / (1 + market_yield) ** years_to_maturity
+    Args:
+        countries: Country codes to fetch
+        deadline: Total time allowed for all fetches, in seconds
+        stale_while_revalidate: Serve expired snapshots at once (see fetch_market_data)
+        
+    Yields:
+        Tuples (country code, market data, fetched in time)
+    """
+    executor = _get_sync_executor()
+    futures = {executor.submit(fetch_market_data, country, stale_while_revalidate): country for country in countries}
+    pending = set(countries)
+    
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            country = futures[future]
+            pending.discard(country)
+            try:
+                market_data = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching {country} market data: {e}")
+                yield country, get_fallback_data(country), False
+                continue
+            yield country, market_data, True
+    except FutureTimeoutError:
+        logger.warning(f"Market data sync deadline of {deadline}s exceeded for {', '.join(sorted(pending))}")
+    finally:
+        # Do not wait for stragglers; fetches that have not started yet are dropped
+        for future in futures:
+            future.cancel()
     
-    return pv_coupon + pv_principal
+    for country in countries:
+        if country in pending:
+            yield country, get_fallback_data(country), False
 
-def update_predefined_bonds_with_market_data():
+def fetch_all_market_data(countries: Sequence[str] = COUNTRY_CODES,
+                          deadline: float = SYNC_DEADLINE) -> Dict[str, Dict[str, Any]]:
     """
-    Update the predefined_bonds.json file with fresh market data
+    Fetch several countries concurrently within one total deadline
+    
+    Args:
+        countries: Country codes to fetch
+        deadline: Total time allowed for all fetches, in seconds
+        
+    Returns:
+        Dictionary country code -> market data, in the order of countries
+    """
+    results = {country: market_data for country, market_data, _ in iter_market_data(countries, deadline)}
+    return {country: results[country] for country in countries if results.get(country)}
+
+def save_predefined_bonds(data: Dict[str, Dict[str, Any]]) -> bool:
     """
-    countries = ["US", "DE", "JP", "UK"]
-    updated_data = {}
+    Write market data to predefined_bonds.json
     
-    for country in countries:
-        market_data = fetch_market_data(country)
-        if market_data:
-            updated_data[country] = market_data
+    The file is written to a temporary file first and then renamed, so readers
+    (e.g. get_fallback_data in a still running fetch) never see a partial file.
+    The internal "source" marker of fallback data is not written.
+    
+    Args:
+        data: Dictionary country code -> market data
+        
+    Returns:
+        True if the file was written
+    """
+    data = {
+        country: {key: value for key, value in country_data.items() if key != "source"}
+        for country, country_data in data.items()
+    }
+    temp_path = PREDEFINED_BONDS_PATH.with_suffix(".json.tmp")
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, PREDEFINED_BONDS_PATH)
+        logger.info(f"Updated predefined_bonds.json with fresh market data")
+        return True
+    except Exception as e:
+        logger.error(f"Error updating predefined_bonds.json: {e}")
+        return False
+
+def update_predefined_bonds_with_market_data(concurrent: bool = True, deadline: float = SYNC_DEADLINE) -> bool:
+    """
+    Update the predefined_bonds.json file with fresh market data
+    
+    Args:
+        concurrent: Fetch all countries at once within the deadline (otherwise one
+            after another, each with its own request timeout)
+        deadline: Total time allowed for a concurrent update, in seconds
+        
+    Returns:
+        True if the file was updated
+    """
+    if concurrent:
+        updated_data = fetch_all_market_data(COUNTRY_CODES, deadline)
+    else:
+        updated_data = {}
+        for country in COUNTRY_CODES:
+            market_data = fetch_market_data(country)
+            if market_data:
+                updated_data[country] = market_data
     
     if updated_data:
-        output_path = Path(__file__).parent / "data" / "predefined_bonds.json"
-        try:
-            with open(output_path, "w") as f:
-                json.dump(updated_data, f, indent=2)
-            logger.info(f"Updated predefined_bonds.json with fresh market data")
-            return True
-        except Exception as e:
-            logger.error(f"Error updating predefined_bonds.json: {e}")
+        return save_predefined_bonds(updated_data)
     
     return False
 
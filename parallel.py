@@ -0,0 +1,191 @@
+import numpy as np
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from bonds import BondAnalytics, _batch_dtype, analyze_bonds, price_from_yield
+
+# Below this many bonds the pool start-up costs more than it saves
+_PARALLEL_THRESHOLD = 50_000
+
+# Smallest chunk handed to a worker; each worker gets several chunks for load balancing
+_MIN_CHUNK_SIZE = 16_384
+_CHUNKS_PER_WORKER = 4
+
+# (shared memory block name, array shape, dtype string) identifying an array for the workers
+SharedSpec = Tuple[str, Tuple[int, ...], str]
+
+def _analytics_kernel(inputs: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """
+    analyze_bonds on rows (price, face value, coupon, maturity, frequency, inflation)
+    """
+    return np.stack(analyze_bonds(*inputs, dtype=dtype))
+
+def _price_kernel(inputs: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """
+    price_from_yield on rows (ytm, face value, coupon, maturity, frequency)
+    """
+    return np.atleast_2d(price_from_yield(*inputs, dtype=dtype))
+
+# Kernel name -> (function on an (inputs, bonds) block, number of output rows)
+_KERNELS: Dict[str, Tuple[Callable[[np.ndarray, np.dtype], np.ndarray], int]] = {
+    "analytics": (_analytics_kernel, len(BondAnalytics._fields)),
+    "price": (_price_kernel, 1),
+}
+
+def _attach(spec: SharedSpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Open an existing shared memory block and view it as an array
+    """
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _evaluate_chunk(kernel: str, inputs: SharedSpec, outputs: SharedSpec, start: int, end: int) -> int:
+    """
+    Worker: evaluate one slice of bonds, reading and writing shared memory in place
+
+    Returns:
+        Number of bonds evaluated
+    """
+    input_block, input_array = _attach(inputs)
+    output_block, output_array = _attach(outputs)
+    try:
+        function, _ = _KERNELS[kernel]
+        output_array[:, start:end] = function(input_array[:, start:end], input_array.dtype)
+    finally:
+        # Drop the views before closing, the buffers must not be exported on close
+        del input_array, output_array
+        input_block.close()
+        output_block.close()
+    return end - start
+
+def evaluate_parallel(kernel: str, inputs: np.ndarray, max_workers: Optional[int] = None,
+                      chunk_size: Optional[int] = None, executor: Optional[Executor] = None) -> np.ndarray:
+    """
+    Evaluate a batch kernel over a bond universe in a process pool
+
+    The (inputs, bonds) array is copied once into a shared memory block and the
+    workers write their results straight into a shared output block, so bond
+    arrays are never pickled; only the block names and slice bounds are sent to
+    the workers. Each chunk fills its own columns of the output, so the results
+    are in input order however the chunks finish.
+
+    Args:
+        kernel: Name of the kernel ("analytics" or "price")
+        inputs: Array of shape (kernel inputs, bonds); its dtype (float32 or
+            float64) is the dtype of the computation
+        max_workers: Number of worker processes (default: one per CPU)
+        chunk_size: Bonds per task (default: about four tasks per worker)
+        executor: Existing process pool to reuse (default: a pool is started for
+            this call); max_workers then only sizes the chunks
+
+    Returns:
+        Array of shape (kernel outputs, bonds)
+    """
+    function, n_outputs = _KERNELS[kernel]
+    inputs = np.ascontiguousarray(inputs)
+    dtype = _batch_dtype(inputs.dtype)
+    n_bonds = inputs.shape[1]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if executor is None and (max_workers <= 1 or n_bonds < _PARALLEL_THRESHOLD):
+        return function(inputs, dtype)
+
+    if chunk_size is None:
+        chunk_size = max(_MIN_CHUNK_SIZE, -(-n_bonds // (max_workers * _CHUNKS_PER_WORKER)))
+    starts = list(range(0, n_bonds, chunk_size))
+    ends = [min(start + chunk_size, n_bonds) for start in starts]
+
+    input_block = shared_memory.SharedMemory(create=True, size=max(inputs.nbytes, 1))
+    output_block = shared_memory.SharedMemory(create=True, size=max(n_outputs * n_bonds * dtype.itemsize, 1))
+    try:
+        np.ndarray(inputs.shape, dtype=dtype, buffer=input_block.buf)[:] = inputs
+        input_spec = (input_block.name, inputs.shape, dtype.str)
+        output_spec = (output_block.name, (n_outputs, n_bonds), dtype.str)
+
+        args = ([kernel] * len(starts), [input_spec] * len(starts), [output_spec] * len(starts), starts, ends)
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(starts))) as pool:
+                done = sum(pool.map(_evaluate_chunk, *args))
+        else:
+            done = sum(executor.map(_evaluate_chunk, *args))
+        if done != n_bonds:
+            raise RuntimeError(f"Parallel evaluation covered {done} of {n_bonds} bonds")
+
+        # Copy out before the block goes away
+        results = np.ndarray((n_outputs, n_bonds), dtype=dtype, buffer=output_block.buf).copy()
+    finally:
+        input_block.close()
+        input_block.unlink()
+        output_block.close()
+        output_block.unlink()
+    return results
+
+def _stack_inputs(arrays: List[Union[float, np.ndarray]], dtype: np.dtype) -> Tuple[np.ndarray, Tuple[int, ...]]:
+    """
+    Broadcast kernel inputs against each other into one (inputs, bonds) array
+    """
+    broadcast = np.broadcast_arrays(*(np.asarray(a, dtype=dtype) for a in arrays))
+    shape = broadcast[0].shape
+    return np.stack([a.ravel() for a in broadcast]), shape
+
+def analyze_bonds_parallel(price: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                           years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1,
+                           inflation_rate: Union[float, np.ndarray] = 0.0,
+                           max_workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                           dtype: Union[str, type, np.dtype] = np.float64,
+                           executor: Optional[Executor] = None) -> BondAnalytics:
+    """
+    bonds.analyze_bonds split across a process pool
+
+    Gives the same results as analyze_bonds; universes below a few ten thousand
+    bonds are evaluated in this process. Solver statistics of the workers are not
+    added to bonds.get_solver_stats().
+
+    Args:
+        price: Current market prices of the bonds
+        face_value: Face values (par values) of the bonds
+        coupon_rate: Annual coupon rates as decimals
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequencies per year
+        inflation_rate: Inflation rates as decimals
+        max_workers: Number of worker processes (default: one per CPU)
+        chunk_size: Bonds per task (see evaluate_parallel)
+        dtype: Floating-point type of the computation, float64 or float32
+        executor: Existing process pool to reuse
+
+    Returns:
+        BondAnalytics record whose fields are arrays in the broadcast shape of the inputs
+    """
+    inputs, shape = _stack_inputs(
+        [price, face_value, coupon_rate, years_to_maturity, frequency, inflation_rate], _batch_dtype(dtype)
+    )
+    results = evaluate_parallel("analytics", inputs, max_workers, chunk_size, executor)
+    return BondAnalytics(*(row.reshape(shape) for row in results))
+
+def price_from_yield_parallel(ytm: np.ndarray, face_value: np.ndarray, coupon_rate: np.ndarray,
+                              years_to_maturity: np.ndarray, frequency: Union[int, np.ndarray] = 1,
+                              max_workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                              dtype: Union[str, type, np.dtype] = np.float64,
+                              executor: Optional[Executor] = None) -> np.ndarray:
+    """
+    bonds.price_from_yield split across a process pool
+
+    Args:
+        ytm: Yields to maturity as decimals
+        face_value: Face values (par values) of the bonds
+        coupon_rate: Annual coupon rates as decimals
+        years_to_maturity: Years until bond maturity
+        frequency: Coupon payment frequencies per year
+        max_workers: Number of worker processes (default: one per CPU)
+        chunk_size: Bonds per task (see evaluate_parallel)
+        dtype: Floating-point type of the computation, float64 or float32
+        executor: Existing process pool to reuse
+
+    Returns:
+        Prices in the broadcast shape of the inputs
+    """
+    inputs, shape = _stack_inputs([ytm, face_value, coupon_rate, years_to_maturity, frequency], _batch_dtype(dtype))
+    return evaluate_parallel("price", inputs, max_workers, chunk_size, executor)[0].reshape(shape)
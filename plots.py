@@ -2,37 +2,43 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Union
 from scipy.interpolate import make_interp_spline, PchipInterpolator
 
-def plot_yield_curve(bonds: List[Dict[str, Any]], 
+from bond_book import BondBook, as_book
+from bonds import get_exact_price_impact
+from curves import ZeroCurve
+
+def plot_yield_curve(bonds: Union[BondBook, List[Dict[str, Any]]], 
                     title: str = "Yield Curve",
-                    show_real_yield: bool = False) -> go.Figure:
+                    show_real_yield: bool = False,
+                    zero_curve: Optional[ZeroCurve] = None) -> go.Figure:
     """
     Plot yield curve from bond data with smooth curves
     
     Args:
-        bonds: List of bond dictionaries with keys 'Laufzeit', 'YTM', and optionally 'Realzins'
+        bonds: BondBook or list of bond dictionaries with keys 'Laufzeit', 'YTM', and optionally 'Realzins'
         title: Title of the plot
         show_real_yield: Whether to plot real yield
+        zero_curve: Bootstrapped zero curve to overlay as spot and forward curves
         
     Returns:
         Plotly figure object
     """
-    # Sort bonds by maturity
-    sorted_bonds = sorted(bonds, key=lambda x: x["Laufzeit"])
+    # A BondBook is already sorted by maturity
+    book = as_book(bonds)
     
     # Extract x and y values
-    x_years = [b["Laufzeit"] for b in sorted_bonds]
-    y_ytm = [b["YTM"] for b in sorted_bonds]
+    x_years = book["Laufzeit"]
+    y_ytm = book["YTM"]
     
     # Create figure
     fig = go.Figure()
     
     # If we have enough points, generate a smooth curve
-    if len(sorted_bonds) >= 3:
+    if len(book) >= 3:
         # Generate smooth curve with more points for interpolation
-        x_smooth = np.linspace(min(x_years), max(x_years), 100)
+        x_smooth = np.linspace(x_years[0], x_years[-1], 100)
         
         # Use PCHIP interpolation which preserves monotonicity and is better for economic data
         pch = PchipInterpolator(x_years, y_ytm)
@@ -68,10 +74,10 @@ def plot_yield_curve(bonds: List[Dict[str, Any]],
         ))
     
     # Add real yield curve if requested
-    if show_real_yield and all("Realzins" in b for b in sorted_bonds):
-        y_real = [b["Realzins"] for b in sorted_bonds]
+    if show_real_yield and book.has_values("Realzins"):
+        y_real = book["Realzins"]
         
-        if len(sorted_bonds) >= 3:
+        if len(book) >= 3:
             # Generate smooth curve for real yield
             pch_real = PchipInterpolator(x_years, y_real)
             y_real_smooth = pch_real(x_smooth)
@@ -104,6 +110,26 @@ def plot_yield_curve(bonds: List[Dict[str, Any]],
                 marker=dict(size=10, symbol='square')
             ))
     
+    # Add spot and instantaneous forward curves from the bootstrapped zero curve
+    if zero_curve is not None and len(book) > 0:
+        t_curve = np.linspace(min(x_years[0], zero_curve.times[0]), max(x_years[-1], zero_curve.times[-1]), 200)
+        
+        fig.add_trace(go.Scatter(
+            x=t_curve,
+            y=zero_curve.zero_rate(t_curve) * 100,
+            mode="lines",
+            name="Spot Rate (Zero)",
+            line=dict(color='orange', width=2)
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=t_curve,
+            y=zero_curve.forward_rate(t_curve, t_curve + 1e-4) * 100,
+            mode="lines",
+            name="Forward Rate",
+            line=dict(color='purple', width=2, dash='dot')
+        ))
+    
     # Add shaded area for recession indicator (illustration only)
     fig.add_vrect(
         x0=0, x1=2,
@@ -150,8 +176,12 @@ def plot_price_sensitivity(bond_data: Dict[str, Any]) -> go.Figure:
     """
     Plot bond price sensitivity to yield changes with enhanced visuals
     
+    The duration and duration + convexity approximations are shown together with the
+    exact price change from full revaluation, which needs 'Kupon' in the bond data.
+    
     Args:
-        bond_data: Dictionary with bond information
+        bond_data: Dictionary with bond information ('Laufzeit', 'YTM', 'Mod. Duration',
+            'Convexity', 'Kupon' and optionally 'Frequenz' and 'Nennwert')
         
     Returns:
         Plotly figure object
@@ -159,8 +189,9 @@ def plot_price_sensitivity(bond_data: Dict[str, Any]) -> go.Figure:
     # Extract bond info
     years_to_maturity = bond_data.get("Laufzeit", 10)
     ytm = bond_data.get("YTM", 5) / 100
-    duration = bond_data.get("Duration", 8)
+    duration = bond_data.get("Mod. Duration", bond_data.get("Duration", 8))
     convexity = bond_data.get("Convexity", 80)
+    coupon = bond_data.get("Kupon")
     
     # Create yield change range
     yield_changes = np.linspace(-0.02, 0.02, 200)  # -2% to +2% in smaller steps for smoother curves
@@ -176,6 +207,17 @@ def plot_price_sensitivity(bond_data: Dict[str, Any]) -> go.Figure:
         'Duration + Convexity': price_changes_with_convexity
     })
     
+    # Reprice the bond exactly at every yield on the grid
+    if coupon is not None:
+        df['Exact'] = get_exact_price_impact(
+            ytm,
+            bond_data.get("Nennwert", 1000),
+            coupon / 100,
+            years_to_maturity,
+            yield_changes,
+            bond_data.get("Frequenz", 1)
+        )
+    
     # Create plot
     fig = go.Figure()
     
@@ -195,9 +237,21 @@ def plot_price_sensitivity(bond_data: Dict[str, Any]) -> go.Figure:
         line=dict(color='red', width=3, shape='spline', smoothing=1.3)
     ))
     
+    if 'Exact' in df:
+        fig.add_trace(go.Scatter(
+            x=df['Yield Change (bps)'],
+            y=df['Exact'],
+            mode='lines',
+            name='Exact (Full Revaluation)',
+            line=dict(color='black', width=2, dash='dash')
+        ))
+    
+    # Range of all plotted curves
+    curves = df.drop(columns='Yield Change (bps)')
+    
     # Add shaded areas to highlight potential profit/loss zones
     fig.add_hrect(
-        y0=0, y1=max(df['Duration + Convexity'].max(), df['Duration Only'].max()) + 1,
+        y0=0, y1=curves.max().max() + 1,
         fillcolor="lightgreen", opacity=0.2,
         layer="below", line_width=0,
         annotation_text="Profit Zone",
@@ -205,7 +259,7 @@ def plot_price_sensitivity(bond_data: Dict[str, Any]) -> go.Figure:
     )
     
     fig.add_hrect(
-        y0=min(df['Duration + Convexity'].min(), df['Duration Only'].min()) - 1, y1=0,
+        y0=curves.min().min() - 1, y1=0,
         fillcolor="lightcoral", opacity=0.2,
         layer="below", line_width=0,
         annotation_text="Loss Zone",
@@ -227,49 +281,52 @@ def plot_price_sensitivity(bond_data: Dict[str, Any]) -> go.Figure:
     
     return fig
 
-def plot_comparison_chart(bonds: List[Dict[str, Any]], 
+def plot_comparison_chart(bonds: Union[BondBook, List[Dict[str, Any]]], 
                          metric: str = "YTM",
                          title: Optional[str] = None) -> go.Figure:
     """
     Create a bar chart comparing different bonds by a specific metric
     
     Args:
-        bonds: List of bond dictionaries
+        bonds: BondBook or list of bond dictionaries
         metric: Metric to compare ('YTM', 'Realzins', 'Duration', 'Convexity')
         title: Custom title for the chart
         
     Returns:
         Plotly figure object
     """
+    # Bonds are presented in maturity order for consistency
+    book = as_book(bonds)
+    
     # Ensure all bonds have the metric
-    if not all(metric in bond for bond in bonds):
+    if not book.has_values(metric):
         raise ValueError(f"Not all bonds have the metric '{metric}'")
     
-    # Sort bonds by maturity for consistent presentation
-    sorted_bonds = sorted(bonds, key=lambda x: x.get("Laufzeit", 0))
+    values = book[metric]
+    n_bonds = len(book)
     
     # Create labels
-    labels = [f"{bond.get('Name', f'{bond.get('Laufzeit', 'N/A')}y')}" for bond in sorted_bonds]
+    labels = [name or f"{maturity:g}y" for name, maturity in zip(book["Name"], book["Laufzeit"])]
     
     # Set colors based on metric
     if metric == "YTM" or metric == "Realzins":
         colors = px.colors.sequential.Blues
-        color_scale = [colors[min(len(colors)-1, int(i * len(colors) / len(sorted_bonds)))] for i in range(len(sorted_bonds))]
+        color_scale = [colors[min(len(colors)-1, int(i * len(colors) / n_bonds))] for i in range(n_bonds)]
     elif metric == "Duration":
         colors = px.colors.sequential.Oranges
-        color_scale = [colors[min(len(colors)-1, int(i * len(colors) / len(sorted_bonds)))] for i in range(len(sorted_bonds))]
+        color_scale = [colors[min(len(colors)-1, int(i * len(colors) / n_bonds))] for i in range(n_bonds)]
     else:
         colors = px.colors.sequential.Greens
-        color_scale = [colors[min(len(colors)-1, int(i * len(colors) / len(sorted_bonds)))] for i in range(len(sorted_bonds))]
+        color_scale = [colors[min(len(colors)-1, int(i * len(colors) / n_bonds))] for i in range(n_bonds)]
     
     # Create bar chart
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
         x=labels,
-        y=[bond[metric] for bond in sorted_bonds],
+        y=values,
         marker_color=color_scale,
-        text=[f"{bond[metric]:.2f}" for bond in sorted_bonds],
+        text=[f"{value:.2f}" for value in values],
         textposition='auto',
         hovertemplate="%{x}: %{y:.2f}"
     ))
@@ -438,40 +495,37 @@ def plot_historical_yields(historical_data: Dict[str, List[Dict[str, Any]]],
     
     return fig
 
-def plot_yield_vs_inflation(bonds: List[Dict[str, Any]], 
+def plot_yield_vs_inflation(bonds: Union[BondBook, List[Dict[str, Any]]], 
                            country_name: str = "",
                            title: Optional[str] = None) -> go.Figure:
     """
     Plot yield vs inflation for bonds of different maturities
     
     Args:
-        bonds: List of bond dictionaries
+        bonds: BondBook or list of bond dictionaries
         country_name: Name of the country for the title
         title: Custom title
         
     Returns:
         Plotly figure object
     """
-    # Extract data
-    maturities = []
-    yields = []
-    real_yields = []
-    inflation_rates = []
-    
-    for bond in bonds:
-        if "Laufzeit" in bond and "YTM" in bond and "Inflation" in bond:
-            maturities.append(bond["Laufzeit"])
-            yields.append(bond["YTM"])
-            inflation_rates.append(bond["Inflation"])
-            
-            # Calculate real yield if not provided
-            if "Realzins" in bond:
-                real_yields.append(bond["Realzins"])
-            else:
-                nominal = bond["YTM"] / 100
-                inflation = bond["Inflation"] / 100
-                real = ((1 + nominal) / (1 + inflation) - 1) * 100
-                real_yields.append(real)
+    book = as_book(bonds)
+    
+    # Extract data for bonds with a maturity and a yield
+    valid = ~(np.isnan(book["Laufzeit"]) | np.isnan(book["YTM"]))
+    maturities = book["Laufzeit"][valid]
+    yields = book["YTM"][valid]
+    
+    # Market-implied breakeven inflation where the book provides it
+    inflation_rates = np.where(np.isnan(book["Breakeven"][valid]), book["Inflation"][valid], book["Breakeven"][valid])
+    
+    # Calculate real yield where it is not provided
+    fisher = ((1 + yields / 100) / (1 + inflation_rates / 100) - 1) * 100
+    real_yields = np.where(np.isnan(book["Realzins"][valid]), fisher, book["Realzins"][valid])
+    
+    # Linkers are quoted in real terms: show their nominal-equivalent yield
+    is_linker = ~np.isnan(book["Indexfaktor"][valid])
+    yields = np.where(is_linker, ((1 + real_yields / 100) * (1 + inflation_rates / 100) - 1) * 100, yields)
     
     # Create figure
     fig = go.Figure()
@@ -526,40 +580,33 @@ def plot_yield_vs_inflation(bonds: List[Dict[str, Any]],
     
     return fig
 
-def plot_bond_risk_return(bonds: List[Dict[str, Any]], 
+def plot_bond_risk_return(bonds: Union[BondBook, List[Dict[str, Any]]], 
                          title: str = "Bond Risk-Return Profile") -> go.Figure:
     """
     Create a risk-return scatter plot for bonds
     
     Args:
-        bonds: List of bond dictionaries
+        bonds: BondBook or list of bond dictionaries
         title: Chart title
         
     Returns:
         Plotly figure object
     """
-    fig = go.Figure()
+    book = as_book(bonds)
     
-    # Extract data
-    names = []
-    yields = []
-    durations = []
-    maturities = []
-    real_yields = []
-    
-    for bond in bonds:
-        if "Name" in bond and "YTM" in bond and "Mod. Duration" in bond:
-            names.append(bond["Name"])
-            yields.append(bond["YTM"])
-            durations.append(bond["Mod. Duration"])
-            maturities.append(bond.get("Laufzeit", 0))
-            real_yields.append(bond.get("Realzins", 0))
+    # Extract data for bonds with a yield and a duration
+    valid = ~(np.isnan(book["YTM"]) | np.isnan(book["Mod. Duration"]))
+    names = book["Name"][valid]
+    yields = book["YTM"][valid]
+    durations = book["Mod. Duration"][valid]
+    maturities = np.nan_to_num(book["Laufzeit"][valid])
+    real_yields = np.nan_to_num(book["Realzins"][valid])
     
     # Create bubble chart
     fig = go.Figure()
     
     # Bubble size based on maturity
-    sizes = [max(10, m * 5) for m in maturities]
+    sizes = np.maximum(10, maturities * 5)
     
     # Color based on real yield
     colorscale = [[0, 'red'], [0.5, 'yellow'], [1.0, 'green']]
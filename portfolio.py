@@ -0,0 +1,205 @@
+import numpy as np
+from typing import NamedTuple, Optional, Sequence
+
+from bonds import analyze_bonds
+from bond_book import BondBook
+from cashflows import CashFlowSchedule
+from curves import Curve
+from risk import KEY_RATE_TENORS, key_rate_durations
+
+class PortfolioRisk(NamedTuple):
+    """
+    Aggregated risk figures of a portfolio
+
+    Attributes:
+        market_value: Total market value of all positions
+        dv01: Total price change for a 1 bp fall in all yields
+        duration: Market-value-weighted Macaulay duration
+        modified_duration: Market-value-weighted modified duration
+        convexity: Market-value-weighted convexity
+        key_rate_tenors: Key-rate tenors in years (empty without a curve)
+        key_rate_dv01: Total DV01 per key rate
+        key_rate_durations: Key-rate durations of the portfolio
+    """
+    market_value: float
+    dv01: float
+    duration: float
+    modified_duration: float
+    convexity: float
+    key_rate_tenors: np.ndarray
+    key_rate_dv01: np.ndarray
+    key_rate_durations: np.ndarray
+
+class Portfolio:
+    """
+    Holdings in the bonds of a BondBook with incrementally maintained risk totals
+
+    Each position holds a notional (face amount) of one bond. The portfolio keeps
+    every position's contribution to the totals (market value, DV01, market-value
+    weighted duration and convexity, key-rate DV01s), so changing one position's
+    price or notional only replaces that position's contribution instead of
+    re-aggregating the whole book.
+    """
+
+    def __init__(self, book: BondBook, notionals: Optional[Sequence[float]] = None,
+                 curve: Optional[Curve] = None, tenors: Sequence[float] = KEY_RATE_TENORS):
+        """
+        Args:
+            book: BondBook with the bonds held (positions follow its maturity order)
+            notionals: Face amount held per bond (default: one bond of each)
+            curve: Zero curve for key-rate DV01s (default: no key-rate figures)
+            tenors: Key-rate tenors in years
+        """
+        self.names = np.array(book["name"])
+        self.face_value = np.array(book["face_value"], dtype=float)
+        self.coupon_rate = np.array(book["coupon"], dtype=float) / 100
+        self.years_to_maturity = np.array(book["maturity"], dtype=float)
+        self.frequency = np.array(book["frequency"], dtype=float)
+        self.inflation_rate = np.array(book["inflation"], dtype=float) / 100
+        self.price = np.array(book["price"], dtype=float)
+        if notionals is None:
+            notionals = self.face_value
+        self.notional = np.array(notionals, dtype=float)
+
+        analytics = analyze_bonds(
+            self.price, self.face_value, self.coupon_rate, self.years_to_maturity,
+            self.frequency, self.inflation_rate
+        )
+        self.ytm = analytics.ytm
+        self.duration = analytics.duration
+        self.modified_duration = analytics.modified_duration
+        self.convexity = analytics.convexity
+        self.dv01 = analytics.dv01
+
+        # Key-rate DV01 per bond only depends on the curve, not on the bond's price
+        if curve is not None:
+            key_rates = key_rate_durations(CashFlowSchedule.from_book(book), curve, tenors)
+            self.key_rate_tenors = key_rates.tenors
+            self.key_rate_dv01 = key_rates.dv01
+        else:
+            self.key_rate_tenors = np.zeros(0)
+            self.key_rate_dv01 = np.zeros((len(self.names), 0))
+
+        self.recompute()
+
+    @property
+    def units(self) -> np.ndarray:
+        """
+        Number of bonds held per position (notional / face value)
+        """
+        return self.notional / self.face_value
+
+    def _contributions(self, index: slice) -> np.ndarray:
+        """
+        Contributions of positions to the running sums
+
+        Columns: market value, DV01, MV * duration, MV * modified duration,
+        MV * convexity, then one column per key-rate DV01.
+        """
+        units = self.notional[index] / self.face_value[index]
+        market_value = units * self.price[index]
+        return np.column_stack([
+            market_value,
+            units * self.dv01[index],
+            market_value * self.duration[index],
+            market_value * self.modified_duration[index],
+            market_value * self.convexity[index],
+            units[:, None] * self.key_rate_dv01[index]
+        ])
+
+    def recompute(self) -> None:
+        """
+        Rebuild all running sums from scratch (also clears accumulated rounding)
+        """
+        self._positions = self._contributions(slice(None))
+        self._totals = self._positions.sum(axis=0)
+
+    def _replace(self, index: int) -> None:
+        """
+        Swap one position's contribution in the running sums
+        """
+        new = self._contributions(slice(index, index + 1))[0]
+        self._totals += new - self._positions[index]
+        self._positions[index] = new
+
+    def index(self, name: str) -> int:
+        """
+        Position of a bond by name
+
+        Raises:
+            KeyError: If no position has that name
+        """
+        matches = np.flatnonzero(self.names == name)
+        if matches.size == 0:
+            raise KeyError(name)
+        return int(matches[0])
+
+    def set_notional(self, index: int, notional: float) -> PortfolioRisk:
+        """
+        Change the face amount held in one position
+
+        Args:
+            index: Position (see index())
+            notional: New face amount held
+
+        Returns:
+            Updated portfolio risk
+        """
+        self.notional[index] = notional
+        self._replace(index)
+        return self.risk()
+
+    def set_price(self, index: int, price: float) -> PortfolioRisk:
+        """
+        Change the market price of one position and reprice only that bond
+
+        Uses the same batch kernel as the constructor on a one-bond slice, so the
+        running totals match a full rebuild.
+
+        Args:
+            index: Position (see index())
+            price: New market price per bond
+
+        Returns:
+            Updated portfolio risk
+        """
+        self.price[index] = price
+        row = slice(index, index + 1)
+        analytics = analyze_bonds(
+            self.price[row], self.face_value[row], self.coupon_rate[row], self.years_to_maturity[row],
+            self.frequency[row], self.inflation_rate[row]
+        )
+        self.ytm[row] = analytics.ytm
+        self.duration[row] = analytics.duration
+        self.modified_duration[row] = analytics.modified_duration
+        self.convexity[row] = analytics.convexity
+        self.dv01[row] = analytics.dv01
+        self._replace(index)
+        return self.risk()
+
+    def risk(self) -> PortfolioRisk:
+        """
+        Current portfolio totals
+
+        Returns:
+            PortfolioRisk (weighted figures are NaN for a zero market value)
+        """
+        market_value, dv01, mv_duration, mv_modified, mv_convexity = self._totals[:5]
+        key_rate_dv01 = self._totals[5:].copy()
+        scale = 1 / market_value if market_value else np.nan
+        return PortfolioRisk(
+            market_value=float(market_value),
+            dv01=float(dv01),
+            duration=float(mv_duration * scale),
+            modified_duration=float(mv_modified * scale),
+            convexity=float(mv_convexity * scale),
+            key_rate_tenors=self.key_rate_tenors,
+            key_rate_dv01=key_rate_dv01,
+            key_rate_durations=key_rate_dv01 * 1e4 * scale
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"Portfolio({len(self)} positions, market value {self._totals[0]:.2f})"
@@ -0,0 +1,326 @@
+import numpy as np
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from bond_book import BondBook
+from cashflows import CashFlowSchedule
+from curves import Curve
+
+# Upper bound on the number of paths x payment-time discount factors held in memory per chunk
+_MAX_CHUNK_ELEMENTS = 4_000_000
+
+class ShortRateModel(ABC):
+    """
+    One-factor Gaussian short-rate model r(t) = alpha(t) + x(t)
+
+    x is an Ornstein-Uhlenbeck process with dx = -a x dt + sigma dW and x(0) = 0, so
+    it can be sampled exactly on any time grid, and zero-coupon bond prices are
+    exponential-affine in the short rate: ln P(h, T) = ln A(h, T) - B(T - h) r(h).
+    Subclasses provide alpha and ln A.
+    """
+
+    def __init__(self, mean_reversion: float, sigma: float):
+        """
+        Args:
+            mean_reversion: Mean-reversion speed a (per year, > 0)
+            sigma: Short-rate volatility (absolute, per sqrt(year))
+        """
+        if mean_reversion <= 0:
+            raise ValueError("Mean reversion must be positive")
+        self.mean_reversion = float(mean_reversion)
+        self.sigma = float(sigma)
+
+    @abstractmethod
+    def alpha(self, t: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Mean short rate alpha(t) at times t in years
+        """
+
+    @abstractmethod
+    def log_a(self, horizon: float, maturities: np.ndarray) -> np.ndarray:
+        """
+        ln A(h, T) of the bond price formula for horizon h and maturities T
+        """
+
+    def b(self, tau: np.ndarray) -> np.ndarray:
+        """
+        Loading B(tau) = (1 - exp(-a tau)) / a of bond prices on the short rate
+        """
+        return -np.expm1(-self.mean_reversion * np.asarray(tau, dtype=float)) / self.mean_reversion
+
+    def simulate_short_rates(self, times: np.ndarray, n_paths: int,
+                             rng: np.random.Generator) -> np.ndarray:
+        """
+        Sample short-rate paths with the exact Gaussian transition
+
+        Args:
+            times: Increasing simulation times in years (excluding 0)
+            n_paths: Number of paths
+            rng: NumPy random generator
+
+        Returns:
+            Array of shape (paths, times)
+        """
+        times = np.asarray(times, dtype=float)
+        steps = np.diff(times, prepend=0.0)
+        decay = np.exp(-self.mean_reversion * steps)
+        scale = self.sigma * np.sqrt(-np.expm1(-2 * self.mean_reversion * steps) / (2 * self.mean_reversion))
+
+        shocks = rng.standard_normal((n_paths, times.size)) * scale
+        x = np.empty_like(shocks)
+        state = np.zeros(n_paths)
+        for k in range(times.size):
+            state = state * decay[k] + shocks[:, k]
+            x[:, k] = state
+        return x + self.alpha(times)
+
+    def discount_factors(self, horizon: float, maturities: np.ndarray, short_rates: np.ndarray) -> np.ndarray:
+        """
+        Zero-coupon prices P(h, T) for every simulated short rate at the horizon
+
+        Args:
+            horizon: Horizon h in years
+            maturities: Payment times T > h in years
+            short_rates: Short rates r(h), one per path
+
+        Returns:
+            Array of shape (paths, maturities)
+        """
+        maturities = np.asarray(maturities, dtype=float)
+        loading = self.b(maturities - horizon)
+        return np.exp(self.log_a(horizon, maturities)[None, :] - np.outer(short_rates, loading))
+
+    def zero_rates(self, horizon: float, tenors: np.ndarray, short_rates: np.ndarray) -> np.ndarray:
+        """
+        Continuously compounded zero curves at the horizon, one per path
+
+        Args:
+            horizon: Horizon h in years
+            tenors: Tenors in years (> 0) measured from the horizon
+            short_rates: Short rates r(h), one per path
+
+        Returns:
+            Array of shape (paths, tenors)
+        """
+        tenors = np.asarray(tenors, dtype=float)
+        return -np.log(self.discount_factors(horizon, horizon + tenors, short_rates)) / tenors
+
+class VasicekModel(ShortRateModel):
+    """
+    Vasicek model dr = a (b - r) dt + sigma dW
+    """
+
+    def __init__(self, mean_reversion: float, long_term_rate: float, sigma: float, initial_rate: float):
+        """
+        Args:
+            mean_reversion: Mean-reversion speed a (per year)
+            long_term_rate: Long-term mean b as a decimal
+            sigma: Short-rate volatility
+            initial_rate: Short rate today as a decimal
+        """
+        super().__init__(mean_reversion, sigma)
+        self.long_term_rate = float(long_term_rate)
+        self.initial_rate = float(initial_rate)
+
+    def alpha(self, t: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Mean short rate b + (r0 - b) exp(-a t)
+        """
+        decay = np.exp(-self.mean_reversion * np.asarray(t, dtype=float))
+        return self.long_term_rate + (self.initial_rate - self.long_term_rate) * decay
+
+    def log_a(self, horizon: float, maturities: np.ndarray) -> np.ndarray:
+        """
+        ln A(tau) of the Vasicek bond price formula, tau = T - h
+        """
+        a, sigma = self.mean_reversion, self.sigma
+        tau = np.asarray(maturities, dtype=float) - horizon
+        loading = self.b(tau)
+        return ((loading - tau) * (a * a * self.long_term_rate - sigma * sigma / 2) / (a * a)
+                - sigma * sigma * loading * loading / (4 * a))
+
+    def __repr__(self) -> str:
+        return (f"VasicekModel(a={self.mean_reversion}, b={self.long_term_rate}, "
+                f"sigma={self.sigma}, r0={self.initial_rate})")
+
+class HullWhiteModel(ShortRateModel):
+    """
+    Hull-White model dr = (theta(t) - a r) dt + sigma dW fitted to an initial curve
+
+    theta is implied by the curve, so the model reprices today's curve exactly.
+    """
+
+    # Step used for instantaneous forward rates f(0, t)
+    _FORWARD_STEP = 1e-4
+
+    def __init__(self, mean_reversion: float, sigma: float, curve: Curve):
+        """
+        Args:
+            mean_reversion: Mean-reversion speed a (per year)
+            sigma: Short-rate volatility
+            curve: Initial zero curve
+        """
+        super().__init__(mean_reversion, sigma)
+        self.curve = curve
+
+    def _forward(self, t: Union[float, np.ndarray]) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        return self.curve.forward_rate(t, t + self._FORWARD_STEP)
+
+    def alpha(self, t: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Mean short rate f(0, t) + sigma^2 / (2 a^2) (1 - exp(-a t))^2
+        """
+        a = self.mean_reversion
+        t = np.asarray(t, dtype=float)
+        return self._forward(t) + self.sigma ** 2 / (2 * a * a) * np.expm1(-a * t) ** 2
+
+    def log_a(self, horizon: float, maturities: np.ndarray) -> np.ndarray:
+        """
+        ln A(h, T) = ln(P(0, T) / P(0, h)) + B f(0, h) - sigma^2 / (4 a) (1 - exp(-2 a h)) B^2
+        """
+        a = self.mean_reversion
+        maturities = np.asarray(maturities, dtype=float)
+        loading = self.b(maturities - horizon)
+        log_ratio = np.log(self.curve.discount_factors(maturities) / self.curve.discount_factors(horizon))
+        variance = self.sigma ** 2 / (4 * a) * -np.expm1(-2 * a * horizon)
+        return log_ratio + loading * self._forward(horizon) - variance * loading * loading
+
+    def __repr__(self) -> str:
+        return f"HullWhiteModel(a={self.mean_reversion}, sigma={self.sigma}, curve={self.curve!r})"
+
+class ScenarioResult(NamedTuple):
+    """
+    Simulated P&L distribution of a set of bond holdings
+
+    Attributes:
+        pnl: Holding-period P&L per path
+        base_value: Value of the holdings today
+        var: Value at Risk at the given confidence (positive number = loss)
+        expected_shortfall: Mean loss beyond the VaR
+        confidence: Confidence level, e.g. 0.99
+        horizon: Holding period in years
+    """
+    pnl: np.ndarray
+    base_value: float
+    var: float
+    expected_shortfall: float
+    confidence: float
+    horizon: float
+
+def value_at_risk(pnl: np.ndarray, confidence: float = 0.99) -> Tuple[float, float]:
+    """
+    Value at Risk and expected shortfall of a P&L sample
+
+    Args:
+        pnl: Simulated profits and losses
+        confidence: Confidence level, e.g. 0.99
+
+    Returns:
+        Tuple (VaR, expected shortfall), both as positive losses
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    var = -np.quantile(pnl, 1 - confidence)
+    tail = pnl[pnl <= -var]
+    return float(var), float(-tail.mean()) if tail.size else float(var)
+
+def _holdings_value(model: ShortRateModel, times: np.ndarray, cash_flows: np.ndarray,
+                    horizon: float, short_rates: np.ndarray) -> np.ndarray:
+    """
+    Value of the holdings at the horizon for each simulated short rate
+
+    Cash flows paid up to the horizon are counted at their amount (no reinvestment);
+    later ones are discounted with the simulated curve.
+    """
+    paid = times <= horizon
+    value = np.full(short_rates.size, cash_flows[paid].sum())
+    if not paid.all():
+        value += model.discount_factors(horizon, times[~paid], short_rates) @ cash_flows[~paid]
+    return value
+
+def _simulate_chunk(model: ShortRateModel, times: np.ndarray, cash_flows: np.ndarray,
+                    horizon: float, steps: int, n_paths: int,
+                    seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Simulate one chunk of paths and return the holdings value at the horizon per path
+    """
+    rng = np.random.default_rng(seed)
+    step_times = horizon * np.arange(1, steps + 1) / steps
+    short_rates = model.simulate_short_rates(step_times, n_paths, rng)[:, -1]
+    return _holdings_value(model, times, cash_flows, horizon, short_rates)
+
+def simulate_pnl(model: ShortRateModel, schedule: CashFlowSchedule,
+                 quantities: Optional[np.ndarray] = None, horizon: float = 10 / 252,
+                 n_paths: int = 10000, steps: int = 1, confidence: float = 0.99,
+                 seed: Optional[int] = None, chunk_size: Optional[int] = None,
+                 max_workers: Optional[int] = None) -> ScenarioResult:
+    """
+    Monte Carlo P&L distribution of bond holdings under a short-rate model
+
+    Args:
+        model: Short-rate model (VasicekModel or HullWhiteModel)
+        schedule: Cash-flow schedule of the bonds
+        quantities: Number of bonds held per schedule row (default: one of each)
+        horizon: Holding period in years (default: 10 trading days)
+        n_paths: Number of simulated paths
+        steps: Time steps per path up to the horizon
+        confidence: Confidence level of VaR and expected shortfall
+        seed: Seed for reproducible results
+        chunk_size: Paths per chunk (default: at most _MAX_CHUNK_ELEMENTS simulated
+            discount factors per chunk); each chunk has its own child seed
+        max_workers: Number of worker processes (default: simulate in this process);
+            does not change the result for a given seed and chunk size
+
+    Returns:
+        ScenarioResult
+    """
+    if quantities is None:
+        quantities = np.ones(len(schedule))
+    # Fold the holdings into one cash-flow vector on the schedule's payment grid, so
+    # each path is revalued with a single matrix-vector product
+    times = schedule.times
+    cash_flows = schedule.amounts.T @ np.asarray(quantities, dtype=float)
+
+    if chunk_size is None:
+        chunk_size = max(1, min(n_paths, _MAX_CHUNK_ELEMENTS // max(times.size, 1)))
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # Value today: the model at h = 0 reproduces its initial curve
+    base_value = float(_holdings_value(model, times, cash_flows, 0.0, np.atleast_1d(model.alpha(0.0)))[0])
+
+    args = [(model, times, cash_flows, horizon, steps, size, chunk_seed)
+            for size, chunk_seed in zip(sizes, seeds)]
+    if max_workers and max_workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(args), os.cpu_count() or 1)) as executor:
+            values: List[np.ndarray] = list(executor.map(_simulate_chunk, *zip(*args)))
+    else:
+        values = [_simulate_chunk(*chunk_args) for chunk_args in args]
+
+    pnl = np.concatenate(values) - base_value
+    var, expected_shortfall = value_at_risk(pnl, confidence)
+    return ScenarioResult(
+        pnl=pnl,
+        base_value=base_value,
+        var=var,
+        expected_shortfall=expected_shortfall,
+        confidence=confidence,
+        horizon=horizon
+    )
+
+def simulate_book_pnl(book: BondBook, model: ShortRateModel, **kwargs) -> ScenarioResult:
+    """
+    Monte Carlo P&L distribution of the bonds of a BondBook
+
+    Args:
+        book: BondBook
+        model: Short-rate model
+        **kwargs: Further arguments of simulate_pnl, e.g. quantities per bond in the
+            book's maturity order (default: one of each)
+
+    Returns:
+        ScenarioResult
+    """
+    return simulate_pnl(model, CashFlowSchedule.from_book(book), **kwargs)
@@ -0,0 +1,187 @@
+import math
+import numpy as np
+from numpy.polynomial import chebyshev
+from typing import Optional, Union
+
+from bonds import BondAnalytics, _analytics_from_yield, _present_value, real_yield
+
+class PriceSurrogate:
+    """
+    Per-bond Chebyshev approximation of the price-yield function for fast repricing
+
+    Each bond's exact closed-form price is sampled once at Chebyshev points of a
+    yield window around its current yield and interpolated by a polynomial. Price,
+    duration and convexity at any yield inside the window then cost one Horner
+    recurrence per bond that yields the price and its first two derivatives
+    together, with no logarithms or exponentials. With the default degree over a
+    +/-200 bp window the approximation error stays below 5e-8 bp in yield terms
+    (|price error| / DV01) for coupons of 0-10%, maturities of 0.25-50 years and
+    up to monthly coupons (see tests/test_surrogate.py), far inside a 0.01 bp budget.
+
+    Bonds whose requested yield leaves their window are refitted around that yield
+    automatically. Setting exact=True bypasses the polynomials and evaluates the
+    closed forms of bonds.py instead.
+    """
+
+    def __init__(self, face_value: np.ndarray, coupon_rate: np.ndarray, years_to_maturity: np.ndarray,
+                 frequency: Union[int, np.ndarray] = 1, ytm: Union[float, np.ndarray] = 0.03,
+                 half_width: float = 0.02, degree: int = 10, exact: bool = False):
+        """
+        Args:
+            face_value: Face values (par values) of the bonds
+            coupon_rate: Annual coupon rates as decimals
+            years_to_maturity: Years until bond maturity
+            frequency: Coupon payment frequencies per year
+            ytm: Yields as decimals the windows are centred on (one per bond or scalar)
+            half_width: Half width of each yield window as a decimal
+            degree: Degree of the Chebyshev polynomials
+            exact: Evaluate with the exact closed forms instead of the polynomials
+        """
+        self.face_value, self.coupon_rate, self.years_to_maturity, self.frequency, center = (
+            np.array(a, dtype=float).ravel() for a in np.broadcast_arrays(
+                *(np.asarray(x, dtype=float) for x in (face_value, coupon_rate, years_to_maturity, frequency, ytm))
+            )
+        )
+        self.half_width = float(half_width)
+        self.degree = int(degree)
+        self.exact = exact
+        self.refits = 0
+
+        n_bonds = self.face_value.size
+        self.lower = np.empty(n_bonds)
+        self.upper = np.empty(n_bonds)
+        self.coefficients = np.empty((self.degree + 1, n_bonds))
+
+        # Chebyshev points of the first kind and the matrix mapping samples there to
+        # monomial coefficients in x (interpolate in the Chebyshev basis, then convert)
+        self._nodes = chebyshev.chebpts1(self.degree + 1)
+        to_monomial = np.column_stack([
+            np.pad(chebyshev.cheb2poly(np.eye(self.degree + 1)[j]), (0, self.degree - j))
+            for j in range(self.degree + 1)
+        ])
+        self._fit_matrix = to_monomial @ np.linalg.inv(chebyshev.chebvander(self._nodes, self.degree))
+
+        self._fit(np.arange(n_bonds), center)
+
+    def _fit(self, index: np.ndarray, center: np.ndarray) -> None:
+        """
+        (Re)fit the polynomials of some bonds around new centre yields
+        """
+        # Keep windows clear of y <= -f, where the price has no valid discount factor
+        lower = np.maximum(center - self.half_width, -0.5 * self.frequency[index])
+        upper = np.maximum(center + self.half_width, lower + 2 * self.half_width)
+
+        yields = lower + (self._nodes[:, None] + 1) / 2 * (upper - lower)
+        prices = _present_value(
+            self.face_value[index], self.coupon_rate[index], yields,
+            self.years_to_maturity[index], self.frequency[index]
+        )
+        self.coefficients[:, index] = self._fit_matrix @ prices
+        self.lower[index] = lower
+        self.upper[index] = upper
+
+    def _ensure_window(self, ytm: np.ndarray) -> None:
+        """
+        Refit every bond whose yield lies outside its window, centred on that yield
+        """
+        outside = np.flatnonzero(~((ytm >= self.lower) & (ytm <= self.upper)) & np.isfinite(ytm))
+        if outside.size:
+            self._fit(outside, ytm[outside])
+            self.refits += outside.size
+
+    def _as_yields(self, ytm: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        One yield per bond as a float array
+        """
+        return np.broadcast_to(np.asarray(ytm, dtype=float), self.face_value.shape)
+
+    def _series(self, ytm: np.ndarray, order: int) -> np.ndarray:
+        """
+        Price and its first `order` derivatives with respect to yield, shape (order + 1, bonds)
+        """
+        self._ensure_window(ytm)
+        scale = 2 / (self.upper - self.lower)
+        x = (ytm - self.lower) * scale - 1
+
+        # Horner with derivatives: values[k] accumulates the k-th derivative / k!
+        values = np.zeros((order + 1, ytm.size))
+        values[0] = self.coefficients[-1]
+        for coefficient in self.coefficients[-2::-1]:
+            for k in range(order, 0, -1):
+                values[k] *= x
+                values[k] += values[k - 1]
+            values[0] *= x
+            values[0] += coefficient
+
+        # Back to derivatives with respect to yield
+        for k in range(2, order + 1):
+            values[k] *= math.factorial(k)
+        for k in range(1, order + 1):
+            values[k] *= scale ** k
+        return values
+
+    def price(self, ytm: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Prices of all bonds at the given yields
+
+        Args:
+            ytm: Yields as decimals (one per bond or scalar)
+
+        Returns:
+            Price of every bond
+        """
+        ytm = self._as_yields(ytm)
+        if self.exact:
+            return _present_value(self.face_value, self.coupon_rate, ytm, self.years_to_maturity, self.frequency)
+        return self._series(ytm, 0)[0]
+
+    def analytics(self, ytm: Union[float, np.ndarray],
+                  inflation_rate: Union[float, np.ndarray] = 0.0) -> BondAnalytics:
+        """
+        All analytics of all bonds at the given yields
+
+        Duration, convexity and DV01 follow from the price derivatives:
+        modified duration = -P'/P, Macaulay duration = modified * (1 + y/f),
+        convexity = P''/P and DV01 = -P' * 0.0001, matching bonds.analyze_bonds.
+
+        Args:
+            ytm: Yields as decimals (one per bond or scalar)
+            inflation_rate: Inflation rates as decimals for the real yield
+
+        Returns:
+            BondAnalytics record of arrays, one entry per bond
+        """
+        ytm = self._as_yields(ytm)
+        if self.exact:
+            return _analytics_from_yield(
+                ytm, self.face_value, self.coupon_rate, self.years_to_maturity, self.frequency,
+                np.asarray(inflation_rate, dtype=float)
+            )
+
+        price, slope, curvature = self._series(ytm, 2)
+        modified_duration = -slope / price
+        return BondAnalytics(
+            ytm=ytm,
+            real_yield=real_yield(ytm, np.asarray(inflation_rate, dtype=float)),
+            duration=modified_duration * (1 + ytm / self.frequency),
+            modified_duration=modified_duration,
+            convexity=curvature / price,
+            dv01=-slope * 1e-4
+        )
+
+    def refit(self, ytm: Optional[Union[float, np.ndarray]] = None) -> None:
+        """
+        Re-centre all windows (e.g. at the start of a trading day)
+
+        Args:
+            ytm: New centre yields (default: the centres of the current windows)
+        """
+        center = 0.5 * (self.lower + self.upper) if ytm is None else self._as_yields(ytm)
+        self._fit(np.arange(self.face_value.size), np.array(center, dtype=float))
+
+    def __len__(self) -> int:
+        return self.face_value.size
+
+    def __repr__(self) -> str:
+        mode = "exact" if self.exact else f"degree {self.degree}"
+        return f"PriceSurrogate({len(self)} bonds, {mode}, {self.refits} refits)"
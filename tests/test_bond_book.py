@@ -0,0 +1,34 @@
+import numpy as np
+
+from bond_book import BondBook, as_book
+from bonds import clear_analytics_cache, get_analytics_cache_stats
+
+def test_long_names_round_trip():
+    name = "United Kingdom Index-linked Treasury Gilt 0 1/8% 2031"
+    records = [{"Name": name, "Laufzeit": 7.0, "Kupon": 0.125, "Preis": 1080.0}]
+    book = as_book(records)
+    assert book.to_records()[0]["Name"] == name
+    assert BondBook.from_dataframe(book.to_dataframe()).record(0)["Name"] == name
+
+def test_rerun_is_served_from_the_analytics_cache():
+    records = [
+        {"Name": "A", "Laufzeit": 2.0, "Kupon": 1.5, "Preis": 990.0},
+        {"Name": "B", "Laufzeit": 10.0, "Kupon": 3.0, "Preis": 1010.0},
+    ]
+    clear_analytics_cache()
+    first = as_book(records).analyze()
+    before = get_analytics_cache_stats()
+    second = as_book(records).analyze()
+    after = get_analytics_cache_stats()
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] == before["misses"]
+    np.testing.assert_array_equal(second.column("ytm"), first.column("ytm"))
+
+def test_book_stays_sorted_by_maturity():
+    book = as_book([
+        {"Name": "Long", "Laufzeit": 30.0, "Kupon": 4.0, "Preis": 950.0},
+        {"Name": "Short", "Laufzeit": 2.0, "Kupon": 1.0, "Preis": 990.0},
+    ])
+    book.insert(as_book([{"Name": "Mid", "Laufzeit": 10.0, "Kupon": 3.0, "Preis": 1000.0}]))
+    assert [record["Name"] for record in book] == ["Short", "Mid", "Long"]
+    assert not book.column("Laufzeit").flags.writeable
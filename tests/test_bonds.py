@@ -0,0 +1,38 @@
+import numpy as np
+
+from bonds import analyze_bond, analyze_bonds, calculate_ytm, calculate_ytm_batch
+from cashflows import CashFlowSchedule
+
+def test_ytm_batch_invalid_inputs_not_converged():
+    ytm, converged = calculate_ytm_batch(
+        [950, 0, -5, np.nan, 950], [1000, 1000, 1000, 1000, np.nan], 0.04, 10, 2
+    )
+    assert converged.tolist() == [True, False, False, False, False]
+    np.testing.assert_allclose(ytm[1:], 0.04)
+    assert abs(ytm[0] - 0.0463) < 1e-4
+
+def test_stub_bond_ytm_reprices_to_schedule():
+    schedule = CashFlowSchedule(1000, 0.05, [2.25, 7.6], [1, 2])
+    for index, price in enumerate([1037.0, 990.0]):
+        frequency, years = schedule.frequency[index], schedule.years_to_maturity[index]
+        ytm = calculate_ytm(price, 1000, 0.05, years, frequency)
+        batch, converged = calculate_ytm_batch(price, 1000, 0.05, years, frequency)
+        times, amounts = schedule.cash_flows(index)
+        schedule_pv = np.sum(amounts * (1 + ytm / frequency) ** (-times * frequency))
+        assert converged
+        assert abs(batch - ytm) < 1e-6
+        assert abs(schedule_pv - price) < 1e-6
+
+def test_scalar_and_batch_yields_agree_below_zero():
+    ytm = calculate_ytm(1200, 1000, 0.0, 5, 1)
+    batch, converged = calculate_ytm_batch(1200, 1000, 0.0, 5, 1)
+    assert converged
+    assert ytm < 0
+    assert abs(batch - ytm) < 1e-6
+    assert abs(analyze_bond(1200, 1000, 0.0, 5, 1, use_cache=False).ytm - ytm) < 1e-9
+
+def test_unsolved_bonds_get_nan_analytics():
+    analytics = analyze_bonds([950, 0], 1000, 0.04, 10, 2)
+    assert np.isfinite(analytics.ytm[0])
+    assert all(np.isnan(field[1]) for field in analytics)
+    assert all(np.isnan(field) for field in analyze_bond(0, 1000, 0.04, 10, 2, use_cache=False))
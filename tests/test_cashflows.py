@@ -0,0 +1,32 @@
+import numpy as np
+
+from bonds import price_from_yield
+from cashflows import CashFlowSchedule, clear_discount_factor_cache, get_discount_factor_cache_stats
+from curves import ZeroCurve
+
+def test_stub_schedule_has_payments_back_from_maturity():
+    schedule = CashFlowSchedule(1000, 0.05, 2.25, 1)
+    times, amounts = schedule.cash_flows(0)
+    np.testing.assert_allclose(times, [0.25, 1.25, 2.25])
+    np.testing.assert_allclose(amounts, [50, 50, 1050])
+
+def test_price_at_yields_matches_closed_form():
+    years = np.array([0.5, 2.25, 7.6, 10.0, 30.0])
+    frequency = np.array([1, 2, 1, 2, 4])
+    ytm = np.array([0.01, -0.002, 0.035, 0.05, 0.042])
+    schedule = CashFlowSchedule(1000, 0.03, years, frequency)
+    np.testing.assert_allclose(
+        schedule.price_at_yields(ytm), price_from_yield(ytm, 1000, 0.03, years, frequency), rtol=1e-12
+    )
+
+def test_flat_curve_price_and_cached_discount_factors():
+    schedule = CashFlowSchedule(1000, 0.04, [3.0, 5.5], 1)
+    curve = ZeroCurve([1.0, 10.0], [0.03, 0.03])
+    clear_discount_factor_cache()
+    first = schedule.price(curve)
+    hits = get_discount_factor_cache_stats()["hits"]
+    second = schedule.price(curve)
+    # Annual compounding at e^0.03 - 1 is the same discounting as a flat continuous 3%
+    np.testing.assert_allclose(first, price_from_yield(np.expm1(0.03), 1000, 0.04, [3.0, 5.5], 1), rtol=1e-12)
+    np.testing.assert_array_equal(first, second)
+    assert get_discount_factor_cache_stats()["hits"] == hits + 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from cashflows import CashFlowSchedule
+from curves import (
+    NelsonSiegelSvenssonCurve, ZeroCurve, _nss_jacobian, bootstrap_zero_curve, fit_nss, fit_nss_history
+)
+
+YEARS = np.array([0.5, 1.0, 2.0, 5.0, 7.5, 10.0, 30.0])
+COUPONS = np.array([0.0, 0.01, 0.02, 0.025, 0.03, 0.035, 0.04])
+FREQUENCY = np.array([1, 1, 2, 2, 1, 2, 2])
+
+def test_bootstrap_reprices_its_input_bonds():
+    prices = np.array([990.0, 985.0, 975.0, 960.0, 955.0, 965.0, 900.0])
+    curve = bootstrap_zero_curve(prices, 1000, COUPONS, YEARS, FREQUENCY)
+    schedule = CashFlowSchedule(1000, COUPONS, YEARS, FREQUENCY)
+    np.testing.assert_allclose(curve.times, YEARS)
+    np.testing.assert_allclose(schedule.price(curve), prices, atol=1e-8)
+
+def test_bootstrap_recovers_the_pricing_curve():
+    true_curve = ZeroCurve(YEARS, [0.030, 0.031, 0.032, 0.034, 0.036, 0.037, 0.040])
+    prices = CashFlowSchedule(1000, COUPONS, YEARS, FREQUENCY).price(true_curve)
+    curve = bootstrap_zero_curve(prices, 1000, COUPONS, YEARS, FREQUENCY)
+    np.testing.assert_allclose(curve.zero_rates, true_curve.zero_rates, atol=1e-10)
+
+def test_bootstrap_without_bonds_raises():
+    with pytest.raises(ValueError):
+        bootstrap_zero_curve([], 1000, [], [], 1)
+
+NSS_PARAMS = (0.04, -0.015, 0.01, -0.005, 1.8, 12.0)
+NSS_TIMES = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+
+def test_nss_jacobian_matches_finite_differences():
+    params = np.array(NSS_PARAMS)
+    analytic = _nss_jacobian(params, NSS_TIMES)
+    for k in range(params.size):
+        bump = np.zeros_like(params)
+        bump[k] = 1e-6
+        numeric = (
+            NelsonSiegelSvenssonCurve(params + bump).zero_rate(NSS_TIMES)
+            - NelsonSiegelSvenssonCurve(params - bump).zero_rate(NSS_TIMES)
+        ) / 2e-6
+        np.testing.assert_allclose(analytic[:, k], numeric, atol=1e-8)
+
+def test_nss_fit_reproduces_a_nss_curve():
+    yields = NelsonSiegelSvenssonCurve(NSS_PARAMS).zero_rate(NSS_TIMES)
+    fit = fit_nss(NSS_TIMES, yields)
+    assert fit.success
+    assert fit.rmse < 1e-6
+
+def test_warm_started_history_fits_every_date():
+    curve = NelsonSiegelSvenssonCurve(NSS_PARAMS)
+    snapshots = [(NSS_TIMES, curve.zero_rate(NSS_TIMES) + shift) for shift in (0.0, 0.001, 0.002)]
+    fits = fit_nss_history(snapshots)
+    assert len(fits) == 3
+    assert all(fit.rmse < 1e-6 for fit in fits)
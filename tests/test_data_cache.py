@@ -0,0 +1,40 @@
+import json
+import time
+
+from data_cache import MarketDataCache
+
+def test_put_writes_atomically_and_survives_a_restart(tmp_path):
+    cache = MarketDataCache(tmp_path)
+    cache.put("us", {"bonds": [1, 2]}, {"etag": '"abc"'})
+    assert [path.name for path in tmp_path.iterdir()] == ["us.json"]
+
+    entry = MarketDataCache(tmp_path).get("us")
+    assert entry.data == {"bonds": [1, 2]}
+    assert entry.validators == {"etag": '"abc"'}
+
+def test_corrupt_and_empty_files_are_misses(tmp_path):
+    (tmp_path / "de.json").write_text('{"timestamp": 1, "data": ')
+    (tmp_path / "jp.json").write_text("")
+    cache = MarketDataCache(tmp_path)
+    assert cache.get("de") is None
+    assert cache.get("jp") is None
+    assert cache.get("uk") is None
+    stats = cache.stats()
+    assert stats["corrupt"] == 2
+    assert stats["disk_misses"] == 3
+
+def test_expired_snapshot_is_kept_but_not_fresh(tmp_path):
+    cache = MarketDataCache(tmp_path, ttls={"us": 60})
+    cache.put("us", {"bonds": []}, timestamp=time.time() - 120)
+    assert cache.get_fresh("us") is None
+    assert cache.get("us").data == {"bonds": []}
+    assert cache.touch("us") is not None
+    assert cache.get_fresh("us") is not None
+
+def test_memory_tier_serves_repeated_reads(tmp_path):
+    (tmp_path / "uk.json").write_text(json.dumps({"timestamp": time.time(), "data": {"bonds": []}}))
+    cache = MarketDataCache(tmp_path)
+    cache.get("uk")
+    cache.get("uk")
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["memory"]["hits"] == 1
@@ -0,0 +1,27 @@
+import numpy as np
+
+from bonds import _coupon_periods, analyze_bonds, price_from_yield
+
+def test_float32_analytics_stay_within_documented_bounds():
+    rng = np.random.default_rng(0)
+    n_bonds = 200_000
+    coupon = rng.uniform(0, 0.10, n_bonds)
+    ytm = rng.uniform(-0.01, 0.15, n_bonds)
+    frequency = rng.choice([1, 2, 4, 12], n_bonds).astype(float)
+    years = rng.uniform(0.25, 50, n_bonds)
+    years[:n_bonds // 2] = np.maximum(np.round(years[:n_bonds // 2] * 365) / 365, 0.25)
+
+    # Maturities that round to a different number of coupons in float32 are not covered
+    single_periods = years.astype(np.float32) * frequency.astype(np.float32)
+    same_coupons = _coupon_periods(years * frequency)[0] == _coupon_periods(single_periods)[0]
+    coupon, ytm, frequency, years = (a[same_coupons] for a in (coupon, ytm, frequency, years))
+
+    price = price_from_yield(ytm, 1000, coupon, years, frequency)
+    double = analyze_bonds(price, 1000, coupon, years, frequency)
+    single = analyze_bonds(price, 1000, coupon, years, frequency, dtype=np.float32)
+
+    assert all(field.dtype == np.float32 for field in single)
+    assert np.max(np.abs(single.ytm - double.ytm)) < 7e-7
+    for name, bound in (("duration", 1.8e-6), ("modified_duration", 1.8e-6), ("dv01", 1.8e-6),
+                        ("convexity", 1.1e-5)):
+        assert np.max(np.abs(getattr(single, name) / getattr(double, name) - 1)) < bound
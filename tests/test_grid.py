@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from bonds import analyze_bond, get_exact_price_impact, get_price_impact, price_from_yield, reprice_yield_shifts
+from curves import Curve
+
+YTM = np.array([0.01, 0.035, -0.002, 0.05])
+COUPON = np.array([0.0, 0.03, 0.01, 0.06])
+YEARS = np.array([2.0, 7.6, 10.0, 30.0])
+FREQUENCY = np.array([1, 2, 1, 4])
+
+def test_grid_matches_pricing_at_shifted_yields():
+    shifts = np.linspace(-0.02, 0.02, 9)
+    grid = reprice_yield_shifts(YTM, shifts, 1000, COUPON, YEARS, FREQUENCY)
+    expected = price_from_yield(YTM + shifts[:, None], 1000, COUPON, YEARS, FREQUENCY)
+    assert grid.shape == (shifts.size, YTM.size)
+    np.testing.assert_allclose(grid, expected, rtol=1e-12)
+
+def test_float32_grid_stays_close_to_float64():
+    shifts = np.linspace(-0.01, 0.01, 5)
+    double = reprice_yield_shifts(YTM, shifts, 1000, COUPON, YEARS, FREQUENCY)
+    single = reprice_yield_shifts(YTM, shifts, 1000, COUPON, YEARS, FREQUENCY, dtype=np.float32)
+    assert single.dtype == np.float32
+    np.testing.assert_allclose(single, double, rtol=1e-5)
+
+def test_exact_impact_agrees_with_taylor_for_small_shifts():
+    analytics = analyze_bond(1000, 1000, 0.04, 10, 2, use_cache=False)
+    for shift in (-0.0005, 0.0005):
+        exact = get_exact_price_impact(analytics.ytm, 1000, 0.04, 10, shift, 2)
+        taylor = get_price_impact(analytics.modified_duration, analytics.convexity, shift)
+        assert abs(exact - taylor) < 1e-5
+
+def test_curve_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        Curve()
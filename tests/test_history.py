@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from history import HistoryStore
+
+def test_same_day_curve_is_written_once_even_with_duplicate_tenors(tmp_path):
+    store = HistoryStore(tmp_path)
+    curve = dict(tenor=[2.0, 10.0, 10.0], ytm=[1.0, 3.0, 3.1], real_yield=[0.0, 1.0, 1.1])
+    assert store.append("US", "2026-01-02", **curve) == 3
+    assert store.append("US", "2026-01-02", **curve) == 0
+    assert store.append("US", "2026-01-02", tenor=[10.0, 2.0, 10.0], ytm=[3.1, 1.0, 3.0],
+                        real_yield=[1.1, 0.0, 1.0]) == 0
+    assert store.append("US", "2026-01-02", tenor=[2.0, 10.0, 10.0], ytm=[1.0, 3.0, 3.2],
+                        real_yield=[0.0, 1.0, 1.1]) == 3
+    assert store.count("US") == 6
+
+def test_query_returns_latest_observation_per_date_and_tenor(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append("DE", "2026-01-01", tenor=[2.0, 10.0], ytm=[2.0, 2.5], real_yield=[0.0, 0.5])
+    store.append("DE", "2026-01-02", tenor=[2.0, 10.0], ytm=[2.1, 2.6], real_yield=[0.1, 0.6])
+    store.append("DE", "2026-01-02", tenor=[10.0], ytm=[2.7], real_yield=[0.7])
+
+    history = store.query("DE", "2026-01-02", "2026-01-02")
+    np.testing.assert_array_equal(history.tenor, [2.0, 10.0])
+    np.testing.assert_array_equal(history.ytm, [2.1, 2.7])
+    np.testing.assert_array_equal(store.query("DE", tenors=[10.0]).ytm, [2.5, 2.7])
+    assert store.countries() == ["DE"]
+
+def test_history_is_append_only(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append("JP", "2026-01-02", tenor=[5.0], ytm=[0.5], real_yield=[-1.0])
+    with pytest.raises(ValueError):
+        store.append("JP", "2026-01-01", tenor=[5.0], ytm=[0.5], real_yield=[-1.0])
+
+def test_interrupted_append_is_ignored_and_repaired(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append("UK", "2026-01-01", tenor=[5.0], ytm=[4.0], real_yield=[1.0])
+    with open(tmp_path / "UK" / "date.bin", "ab") as f:
+        f.write(np.array(["2026-01-02"], dtype="datetime64[D]").tobytes())
+    assert store.count("UK") == 1
+    store.append("UK", "2026-01-02", tenor=[5.0], ytm=[4.1], real_yield=[1.1])
+    np.testing.assert_array_equal(store.query("UK").ytm, [4.0, 4.1])
@@ -0,0 +1,51 @@
+import numpy as np
+
+from bonds import _discounted_moments, _present_value, _reference_moments
+
+def _original_moments(face_value, coupon_rate, ytm, years_to_maturity, frequency):
+    """Frozen copy of the original coupon-by-coupon loops, valid for whole-period maturities"""
+    n_payments = years_to_maturity * frequency
+    coupon_payment = face_value * coupon_rate / frequency
+    total_pv = weighted_pv = convexity_pv = 0
+    for i in range(1, int(n_payments) + 1):
+        t = i / frequency
+        pv = coupon_payment / (1 + ytm / frequency) ** i
+        total_pv += pv
+        weighted_pv += t * pv
+        convexity_pv += t * (t + 1 / frequency) * pv
+    t_maturity = n_payments / frequency
+    pv_face = face_value / (1 + ytm / frequency) ** n_payments
+    total_pv += pv_face
+    weighted_pv += t_maturity * pv_face
+    convexity_pv += t_maturity * (t_maturity + 1 / frequency) * pv_face
+    return total_pv, weighted_pv, convexity_pv
+
+YIELDS = (-0.01, -1e-9, 0.0, 1e-7, 0.0004, 0.035, 0.12)
+COUPONS = (0.0, 0.025, 0.08)
+
+def _grid(maturities):
+    return [
+        (coupon, ytm, years, frequency)
+        for frequency in (1, 2, 4, 12)
+        for years in maturities
+        for ytm in YIELDS
+        for coupon in COUPONS
+        if years * frequency >= 1
+    ]
+
+def _assert_kernels_match(grid, oracle):
+    expected = np.array([oracle(1000, *params) for params in grid])
+    scalar = np.array([[float(x) for x in _discounted_moments(1000, *params)] for params in grid])
+    columns = [np.array(column) for column in zip(*grid)]
+    vectorized = np.column_stack(_discounted_moments(1000, *columns))
+    prices = _present_value(1000, *columns)
+
+    np.testing.assert_allclose(scalar, expected, rtol=1e-10)
+    np.testing.assert_allclose(vectorized, expected, rtol=1e-10)
+    np.testing.assert_allclose(prices, expected[:, 0], rtol=1e-10)
+
+def test_closed_form_matches_original_loop_on_whole_periods():
+    _assert_kernels_match(_grid((0.25, 0.5, 1, 2, 10, 30, 50)), _original_moments)
+
+def test_closed_form_matches_stub_loop():
+    _assert_kernels_match(_grid((0.3, 2.5, 7.75, 10.1, 29.9)), _reference_moments)
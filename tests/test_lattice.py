@@ -0,0 +1,26 @@
+import numpy as np
+
+from cashflows import CashFlowSchedule
+from curves import ZeroCurve
+from lattice import price_callable_bonds
+
+CURVE = ZeroCurve([1.0, 5.0, 10.0], [0.02, 0.03, 0.035])
+COUPON = np.array([0.03, 0.04, 0.05])
+YEARS = np.array([2.0, 5.0, 10.0])
+FREQUENCY = np.array([1, 2, 4])
+
+def test_lattice_without_options_matches_curve_price():
+    analytics = price_callable_bonds(CURVE, 1000, COUPON, YEARS, FREQUENCY)
+    expected = CashFlowSchedule(1000, COUPON, YEARS, FREQUENCY).price(CURVE)
+    np.testing.assert_allclose(analytics.price, expected, rtol=1e-8)
+
+def test_call_lowers_and_put_raises_the_price():
+    plain = price_callable_bonds(CURVE, 1000, COUPON, YEARS, FREQUENCY)
+    callable_ = price_callable_bonds(CURVE, 1000, COUPON, YEARS, FREQUENCY,
+                                     call_price=np.full(3, 1000.0), call_start=np.full(3, 1.0))
+    putable = price_callable_bonds(CURVE, 1000, COUPON, YEARS, FREQUENCY,
+                                   put_price=np.full(3, 1000.0), put_start=np.full(3, 1.0))
+    assert np.all(callable_.price <= plain.price + 1e-9)
+    assert np.all(putable.price >= plain.price - 1e-9)
+    assert callable_.price[2] < plain.price[2]
+    assert callable_.effective_duration[2] < plain.effective_duration[2]
@@ -0,0 +1,18 @@
+import numpy as np
+
+from bond_book import BondBook
+from linkers import update_book_breakevens
+
+def test_negative_real_yield_linker_not_floored():
+    records = [
+        {"Name": "5y", "Laufzeit": 5, "Kupon": 3.2, "Preis": 990},
+        {"Name": "10y", "Laufzeit": 10, "Kupon": 3.5, "Preis": 980},
+        {"Name": "10y linker", "Laufzeit": 10, "Kupon": 0.125, "Preis": 1080, "Indexfaktor": 1.2},
+        {"Name": "30y", "Laufzeit": 30, "Kupon": 4.0, "Preis": 950},
+    ]
+    book = update_book_breakevens(BondBook.from_records(records).analyze())
+    linker = np.flatnonzero(book.is_linker)[0]
+    assert abs(book["real_yield"][linker] + 0.65) < 0.01
+    # Curve-consistent breakeven stays close to the Fisher spread at 10 years
+    fisher = ((1 + book["ytm"][1] / 100) / (1 + book["real_yield"][linker] / 100) - 1) * 100
+    assert abs(book["breakeven"][linker] - fisher) < 0.1
@@ -0,0 +1,11 @@
+from lru_cache import LRUCache
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put(("a",), 1)
+    cache.put(("b",), 2)
+    assert cache.get(("a",)) == 1
+    cache.put(("c",), 3)
+    assert cache.get(("b",)) is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 1
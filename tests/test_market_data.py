@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import market_data
+from data_cache import MarketDataCache
+from history import HistoryStore
+
+@pytest.fixture
+def unavailable_server():
+    """Local server that always answers 503 with a long Retry-After"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(503)
+            self.send_header("Retry-After", "60")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+def test_retry_after_beyond_deadline_is_not_waited_for(unavailable_server):
+    start = time.monotonic()
+    with pytest.raises(requests.HTTPError):
+        market_data.http_get(unavailable_server)
+    assert time.monotonic() - start < market_data.SYNC_DEADLINE
+
+@pytest.fixture
+def json_server():
+    """Local server that answers every GET with an empty JSON object"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+def test_fallback_fetch_leaves_history_unchanged(tmp_path, monkeypatch, json_server):
+    store = HistoryStore(tmp_path / "history")
+    monkeypatch.setattr(market_data, "history_store", store)
+    monkeypatch.setattr(market_data, "market_cache", MarketDataCache(tmp_path / "cache"))
+    # The German parser still serves fallback data; the US one finds no notes in "{}"
+    monkeypatch.setattr(market_data, "ECB_API_URL", json_server)
+    monkeypatch.setattr(market_data, "TREASURY_API_URL", json_server)
+
+    for country in ("DE", "US"):
+        bond_data = market_data.fetch_market_data(country)
+        assert bond_data["source"] == market_data.FALLBACK_SOURCE
+        assert bond_data["bonds"]
+    assert store.countries() == []
+
+def test_sync_falls_back_for_slow_and_failing_countries(monkeypatch):
+    release = threading.Event()
+
+    def fake_fetch(country, stale_while_revalidate=False):
+        if country == "DE":
+            release.wait(5)
+        if country == "JP":
+            raise RuntimeError("parser broke")
+        return {"source": "live", "bonds": [{"name": country}]}
+
+    monkeypatch.setattr(market_data, "fetch_market_data", fake_fetch)
+    start = time.monotonic()
+    try:
+        results = {country: (data, fetched) for country, data, fetched
+                   in market_data.iter_market_data(("US", "DE", "JP"), deadline=0.3)}
+    finally:
+        release.set()
+    assert time.monotonic() - start < 2
+    assert results["US"] == ({"source": "live", "bonds": [{"name": "US"}]}, True)
+    for country in ("DE", "JP"):
+        data, fetched = results[country]
+        assert not fetched
+        assert data["source"] == market_data.FALLBACK_SOURCE
+
+def test_syncs_reuse_their_worker_sessions(monkeypatch):
+    def fake_fetch(country, stale_while_revalidate=False):
+        return {"source": "live", "session": market_data.get_session(), "bonds": []}
+
+    monkeypatch.setattr(market_data, "fetch_market_data", fake_fetch)
+    syncs = 10
+    sessions = [
+        data["session"] for _ in range(syncs) for _, data, _ in market_data.iter_market_data(("US", "DE"), deadline=5)
+    ]
+    # Per-sync thread pools would start 2 new sessions on every sync
+    assert len({id(session) for session in sessions}) <= 2 * len(market_data.COUNTRY_CODES) < 2 * syncs
+
+def test_stale_snapshot_is_served_while_one_refresh_runs(tmp_path, monkeypatch):
+    cache = MarketDataCache(tmp_path, ttls={market_data.CACHE_SOURCES["US"]: 60})
+    cache.put(market_data.CACHE_SOURCES["US"], {"source": "live", "bonds": []}, timestamp=time.time() - 120)
+    monkeypatch.setattr(market_data, "market_cache", cache)
+    monkeypatch.setattr(market_data, "_refreshes", {})
+    monkeypatch.setattr(market_data, "_refresh_started", {})
+
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(country):
+        calls.append(country)
+        release.wait(5)
+        return {"source": "live", "bonds": []}
+
+    monkeypatch.setattr(market_data, "_fetch_live", slow_fetch)
+    start = time.monotonic()
+    try:
+        for _ in range(5):
+            data = market_data.fetch_market_data("US", stale_while_revalidate=True)
+            assert data == {"source": "live", "bonds": []}
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+    market_data._refreshes["US"].result(timeout=5)
+    assert calls == ["US"]
+
+def test_saved_bond_list_has_no_source_marker(tmp_path, monkeypatch):
+    path = tmp_path / "predefined_bonds.json"
+    monkeypatch.setattr(market_data, "PREDEFINED_BONDS_PATH", path)
+    data = {"DE": {"name": "Deutschland", "bonds": [{"name": "Bund"}], "source": market_data.FALLBACK_SOURCE}}
+    assert market_data.save_predefined_bonds(data)
+    assert json.loads(path.read_text()) == {"DE": {"name": "Deutschland", "bonds": [{"name": "Bund"}]}}
+    assert data["DE"]["source"] == market_data.FALLBACK_SOURCE
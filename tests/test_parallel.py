@@ -0,0 +1,36 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from bonds import analyze_bonds, price_from_yield
+from parallel import analyze_bonds_parallel, price_from_yield_parallel
+
+@pytest.fixture(scope="module")
+def universe():
+    rng = np.random.default_rng(3)
+    n_bonds = 5000
+    return (
+        rng.uniform(0, 0.08, n_bonds),
+        rng.uniform(-0.005, 0.08, n_bonds),
+        rng.uniform(0.5, 30, n_bonds),
+        rng.choice([1, 2, 4], n_bonds).astype(float),
+    )
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+def test_parallel_prices_match_serial(universe, pool):
+    coupon, ytm, years, frequency = universe
+    parallel = price_from_yield_parallel(ytm, 1000, coupon, years, frequency, chunk_size=700, executor=pool)
+    np.testing.assert_array_equal(parallel, price_from_yield(ytm, 1000, coupon, years, frequency))
+
+def test_parallel_analytics_match_serial(universe, pool):
+    coupon, ytm, years, frequency = universe
+    price = price_from_yield(ytm, 1000, coupon, years, frequency)
+    serial = analyze_bonds(price, 1000, coupon, years, frequency, 0.02)
+    parallel = analyze_bonds_parallel(price, 1000, coupon, years, frequency, 0.02, chunk_size=700, executor=pool)
+    for expected, actual in zip(serial, parallel):
+        np.testing.assert_array_equal(actual, expected)
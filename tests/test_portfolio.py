@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from bond_book import BondBook
+from curves import ZeroCurve
+from portfolio import Portfolio
+
+def test_set_price_matches_rebuild_above_par():
+    data_path = Path(__file__).resolve().parent.parent / "data" / "predefined_bonds.json"
+    bonds = json.loads(data_path.read_text())["JP"]["bonds"]
+    book = BondBook.from_market_data(bonds)
+    portfolio = Portfolio(book)
+
+    # The 2-year bond well above par has a negative yield
+    index = 0
+    new_price = portfolio.price[index] + 60
+    incremental = portfolio.set_price(index, new_price)
+    assert portfolio.ytm[index] < 0
+
+    records = book.to_records()
+    records[index]["Preis"] = new_price
+    rebuilt = Portfolio(BondBook.from_records(records)).risk()
+    for field in ("market_value", "dv01", "duration", "modified_duration", "convexity"):
+        assert np.isclose(getattr(incremental, field), getattr(rebuilt, field), rtol=1e-12)
+
+def test_set_notional_updates_totals_and_key_rates():
+    book = BondBook.from_records([
+        {"Name": "A", "Laufzeit": 2.0, "Kupon": 1.0, "Preis": 990.0},
+        {"Name": "B", "Laufzeit": 10.0, "Kupon": 3.0, "Preis": 1010.0},
+    ])
+    curve = ZeroCurve([2.0, 10.0], [0.015, 0.03])
+    portfolio = Portfolio(book, curve=curve)
+    before = portfolio.risk()
+    after = portfolio.set_notional(portfolio.index("B"), 3000)
+    assert np.isclose(after.market_value - before.market_value, 2 * 1010.0)
+    assert np.isclose(after.dv01 - before.dv01, 2 * portfolio.dv01[1])
+    np.testing.assert_allclose(after.key_rate_dv01 - before.key_rate_dv01, 2 * portfolio.key_rate_dv01[1])
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from bonds import calculate_ytm_batch, price_from_yield
+
+def test_price_from_yield_inverts_the_batch_solver():
+    prices = np.array([950.0, 1100.0, 1200.0, 870.0])
+    coupon = np.array([0.04, 0.05, 0.0, 0.02])
+    years = np.array([10.0, 5.5, 5.0, 30.0])
+    frequency = np.array([2, 1, 1, 12])
+    ytm, converged = calculate_ytm_batch(prices, 1000, coupon, years, frequency, tol=1e-12)
+    assert converged.all()
+    np.testing.assert_allclose(price_from_yield(ytm, 1000, coupon, years, frequency), prices, rtol=1e-10)
+
+def test_price_from_yield_special_yields():
+    assert price_from_yield(0.0, 1000, 0.03, 10, 2) == pytest.approx(1300.0)
+    assert price_from_yield(0.05, 1000, 0.05, 10, 4) == pytest.approx(1000.0)
+    assert np.isnan(price_from_yield(-2.5, 1000, 0.03, 10, 2))
+    assert isinstance(price_from_yield(0.03, 1000, 0.03, 10), float)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from cashflows import CashFlowSchedule
+from curves import ZeroCurve
+from risk import key_rate_durations
+
+CURVE = ZeroCurve([1.0, 2.0, 5.0, 10.0, 30.0], [0.02, 0.025, 0.03, 0.035, 0.04])
+
+def test_key_rate_durations_add_up_to_parallel_duration():
+    schedule = CashFlowSchedule(1000, [0.01, 0.03, 0.045], [3.5, 10.0, 25.0], 2)
+    risk = key_rate_durations(schedule, CURVE)
+    bump = 0.0001
+    parallel = (schedule.price(CURVE.shifted(-bump)) - schedule.price(CURVE.shifted(bump))) / (2 * bump)
+    np.testing.assert_allclose(risk.durations.sum(axis=1), parallel / risk.price, rtol=1e-6)
+    np.testing.assert_allclose(risk.dv01.sum(axis=1), parallel * 1e-4, rtol=1e-6)
+
+def test_zero_coupon_bond_on_a_tenor_only_has_that_key_rate():
+    schedule = CashFlowSchedule(1000, 0.0, 5.0, 1)
+    risk = key_rate_durations(schedule, CURVE)
+    np.testing.assert_allclose(risk.durations[0], [0.0, 5.0, 0.0, 0.0], atol=1e-6)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from cashflows import CashFlowSchedule
+from curves import ZeroCurve
+from scenarios import HullWhiteModel, ShortRateModel, VasicekModel, simulate_pnl, value_at_risk
+
+CURVE = ZeroCurve([1.0, 5.0, 10.0, 30.0], [0.02, 0.028, 0.033, 0.038])
+
+def test_vasicek_paths_match_the_analytic_distribution():
+    model = VasicekModel(0.3, 0.04, 0.01, 0.02)
+    horizon = 2.0
+    rates = model.simulate_short_rates([0.5, 1.0, 2.0], 200000, np.random.default_rng(1))[:, -1]
+    std = model.sigma * np.sqrt(-np.expm1(-2 * model.mean_reversion * horizon) / (2 * model.mean_reversion))
+    assert abs(rates.mean() - model.alpha(horizon)) < 4 * std / np.sqrt(rates.size)
+    assert abs(rates.std() / std - 1) < 0.01
+
+def test_hull_white_reprices_the_initial_curve():
+    model = HullWhiteModel(0.1, 0.01, CURVE)
+    maturities = np.array([0.5, 2.0, 7.0, 20.0])
+    factors = model.discount_factors(0.0, maturities, np.atleast_1d(model.alpha(0.0)))[0]
+    np.testing.assert_allclose(factors, CURVE.discount_factors(maturities), rtol=1e-6)
+
+def test_value_at_risk_and_expected_shortfall():
+    pnl = -np.arange(1, 101, dtype=float)
+    var, expected_shortfall = value_at_risk(pnl, 0.95)
+    assert abs(var - 95.05) < 1e-9
+    assert expected_shortfall == np.mean([96, 97, 98, 99, 100])
+
+def test_simulated_pnl_is_reproducible_across_processes():
+    schedule = CashFlowSchedule(1000, [0.02, 0.04], [3.0, 12.0], 1)
+    model = HullWhiteModel(0.1, 0.01, CURVE)
+    serial = simulate_pnl(model, schedule, n_paths=4000, seed=7, chunk_size=1000)
+    pooled = simulate_pnl(model, schedule, n_paths=4000, seed=7, chunk_size=1000, max_workers=2)
+    np.testing.assert_array_equal(serial.pnl, pooled.pnl)
+    assert serial.expected_shortfall >= serial.var > 0
+
+def test_short_rate_model_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        ShortRateModel(0.1, 0.01)
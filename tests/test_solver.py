@@ -0,0 +1,24 @@
+from bonds import get_solver_stats, reset_solver_stats, solve_ytm
+
+def test_halley_converges_in_few_iterations():
+    result = solve_ytm(950, 1000, 0.04, 10, 2)
+    assert result.converged
+    assert result.method == "halley"
+    assert result.iterations <= 4
+    assert abs(result.ytm - 0.0463032) < 1e-6
+
+def test_brent_fallback_finds_the_same_root():
+    halley = solve_ytm(950, 1000, 0.04, 10, 2)
+    fallback = solve_ytm(950, 1000, 0.04, 10, 2, maxiter=1)
+    assert fallback.converged
+    assert fallback.method == "brentq"
+    assert abs(fallback.ytm - halley.ytm) < 1e-8
+
+def test_invalid_inputs_are_counted_as_failures():
+    reset_solver_stats()
+    result = solve_ytm(0, 1000, 0.04, 10, 2)
+    assert not result.converged
+    assert result.ytm == 0.04
+    stats = get_solver_stats()
+    assert stats["solves"] == 1
+    assert stats["failures"] == 1
@@ -0,0 +1,27 @@
+import numpy as np
+
+from cashflows import CashFlowSchedule
+from curves import ZeroCurve
+from spreads import z_spreads
+
+CURVE = ZeroCurve([1.0, 5.0, 10.0, 30.0], [0.02, 0.03, 0.035, 0.04])
+
+def test_bond_priced_off_the_curve_has_zero_z_spread():
+    schedule = CashFlowSchedule(1000, [0.0, 0.02, 0.045], [1.5, 7.25, 25.0], [1, 2, 2])
+    spread, converged = z_spreads(schedule, schedule.price(CURVE), CURVE)
+    assert converged.all()
+    np.testing.assert_allclose(spread, 0.0, atol=1e-12)
+
+def test_z_spread_reprices_off_the_shifted_curve():
+    schedule = CashFlowSchedule(1000, [0.0, 0.02, 0.045], [1.5, 7.25, 25.0], [1, 2, 2])
+    shift = np.array([0.01, -0.004, 0.0025])
+    prices = np.array([schedule.price(CURVE.shifted(s))[i] for i, s in enumerate(shift)])
+    spread, converged = z_spreads(schedule, prices, CURVE)
+    assert converged.all()
+    np.testing.assert_allclose(spread, shift, atol=1e-10)
+
+def test_invalid_price_is_not_solved():
+    schedule = CashFlowSchedule(1000, 0.03, [2.0, 5.0], 1)
+    spread, converged = z_spreads(schedule, [0.0, 990.0], CURVE)
+    assert converged.tolist() == [False, True]
+    assert np.isnan(spread[0])
@@ -0,0 +1,19 @@
+import numpy as np
+
+from bonds import analyze_bonds, price_from_yield
+from surrogate import PriceSurrogate
+
+def test_price_error_bound_in_bp():
+    rng = np.random.default_rng(0)
+    n_bonds = 20_000
+    coupon = rng.uniform(0, 0.10, n_bonds)
+    years = rng.uniform(0.25, 50, n_bonds)
+    frequency = rng.choice([1, 2, 4, 12], n_bonds).astype(float)
+    center = rng.uniform(-0.005, 0.10, n_bonds)
+    surrogate = PriceSurrogate(1000, coupon, years, frequency, center)
+
+    ytm = center + rng.uniform(-0.02, 0.02, n_bonds)
+    exact = price_from_yield(ytm, 1000, coupon, years, frequency)
+    dv01 = analyze_bonds(exact, 1000, coupon, years, frequency).dv01
+    assert surrogate.refits == 0
+    assert np.max(np.abs(surrogate.price(ytm) - exact) / dv01) < 5e-8